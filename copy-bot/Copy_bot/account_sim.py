@@ -0,0 +1,150 @@
+"""
+Account Simulator Module - Compounding equity curves with a daily risk cap.
+
+Each strategy trades its own account, starting from config.yaml
+``backtest.initial_balance``. Trades are taken in time order and each
+risks ``risk_per_trade`` of the current balance on its stop, so a trade
+returns
+
+    pnl = balance * risk_per_trade * pips / sl_pips
+
+(the result of sizing with FelixStrategy.calculate_position_size, without
+rounding the lot size). A trade is rejected when the risk already taken
+that UTC day plus its own would exceed ``max_daily_risk``.
+
+All strategies are simulated together: their trades are laid out as one
+(strategies x trades) array, the daily cap is a per-day cumulative sum,
+and equity is a cumulative product along each row, so there is no Python
+loop per trade or per strategy.
+
+Usage:
+    sim = AccountSimulator(config=config)
+    result = sim.run({'felix': felix_class.trades, 'keys': key_levels.trades})
+    print(result.to_dict())
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any
+
+import numpy as np
+
+from felix_strategy import FelixStrategy
+from price_store import SECONDS_PER_DAY
+from trade import PENDING, result_code
+from trade_book import to_epoch
+
+
+@dataclass
+class AccountResult:
+    """Equity curves for all simulated strategies (row per strategy)."""
+    names: List[str]
+    timestamps: np.ndarray      # (S, N) int64 trade times, padded with the last time
+    equity: np.ndarray          # (S, N + 1) balance after each trade; column 0 is the start
+    accepted: np.ndarray        # (S, N) bool, trade taken under the daily cap
+    valid: np.ndarray           # (S, N) bool, real trade (not padding)
+    max_drawdown: np.ndarray    # (S,) fraction of peak equity
+
+    @property
+    def final_balance(self) -> np.ndarray:
+        return self.equity[:, -1]
+
+    @property
+    def rejected(self) -> np.ndarray:
+        """Trades rejected by the daily risk cap, per strategy."""
+        return (self.valid & ~self.accepted).sum(axis=1)
+
+    def curve(self, name: str):
+        """(timestamps, equity after each trade) of one strategy."""
+        s = self.names.index(name)
+        n = int(self.valid[s].sum())
+        return self.timestamps[s, :n], self.equity[s, 1:n + 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        start = self.equity[:, 0]
+        return {
+            name: {
+                'trades': int(self.valid[s].sum()),
+                'accepted': int(self.accepted[s].sum()),
+                'rejected': int(self.rejected[s]),
+                'final_balance': round(float(self.final_balance[s]), 2),
+                'return': round(float(self.final_balance[s] / start[s] - 1) * 100, 2),
+                'max_drawdown': round(float(self.max_drawdown[s]) * 100, 2),
+            }
+            for s, name in enumerate(self.names)
+        }
+
+
+class AccountSimulator:
+    """
+    Args:
+        config: optional StrategyConfig (balance, risk per trade, daily cap)
+        felix: strategy giving the stop size per market condition
+        initial_balance, risk_per_trade, max_daily_risk: override the config
+    """
+
+    def __init__(self, config=None, felix: FelixStrategy = None,
+                 initial_balance: Optional[float] = None,
+                 risk_per_trade: Optional[float] = None,
+                 max_daily_risk: Optional[float] = None):
+        self.felix = felix or FelixStrategy(config=config)
+        risk = config.risk_management if config is not None else {}
+        backtest = config.backtest if config is not None else {}
+        self.initial_balance = initial_balance or backtest.get('initial_balance', 10000.0)
+        self.risk_per_trade = risk_per_trade or risk.get('risk_per_trade', self.felix.risk_per_trade)
+        self.max_daily_risk = max_daily_risk or risk.get('max_daily_risk', 0.03)
+
+    def _columns(self, trades: List):
+        """Time-ordered (timestamps, R multiples) of completed trades."""
+        rows = []
+        for trade in trades:
+            if result_code(trade.result) == PENDING:
+                continue
+            condition = getattr(trade, 'market_condition', 'unknown').lower()
+            sl_pips = self.felix.get_sl_for_market_condition(condition, trade.pair)
+            rows.append((to_epoch(getattr(trade, 'timestamp', None)), (trade.pips or 0) / sl_pips))
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def run(self, strategies) -> AccountResult:
+        """
+        Simulate ``{name: trades}`` (or a list of strategy objects with
+        ``name`` and ``trades``) side by side.
+        """
+        if not isinstance(strategies, dict):
+            strategies = {s.name: s.trades for s in strategies}
+        names = list(strategies)
+        columns = [self._columns(trades) for trades in strategies.values()]
+        S = len(names)
+        N = max((len(c) for c in columns), default=0)
+
+        timestamps = np.zeros((S, N), dtype=np.int64)
+        r_multiple = np.zeros((S, N))
+        valid = np.zeros((S, N), dtype=bool)
+        for s, rows in enumerate(columns):
+            if rows:
+                data = np.array(rows)
+                n = len(rows)
+                timestamps[s, :n] = data[:, 0]
+                timestamps[s, n:] = data[-1, 0]
+                r_multiple[s, :n] = data[:, 1]
+                valid[s, :n] = True
+
+        # Daily cap: risk used earlier the same day, per row
+        risk = np.where(valid, self.risk_per_trade, 0.0)
+        used = np.cumsum(risk, axis=1)
+        day = timestamps // SECONDS_PER_DAY
+        new_day = np.ones((S, N), dtype=bool)
+        new_day[:, 1:] = day[:, 1:] != day[:, :-1]
+        day_start = np.maximum.accumulate(np.where(new_day, np.arange(N), 0), axis=1)
+        before_day = np.take_along_axis(used - risk, day_start, axis=1)
+        accepted = valid & (used - before_day <= self.max_daily_risk + 1e-12)
+
+        # Compounding: each accepted trade scales the balance
+        growth = 1.0 + np.where(accepted, self.risk_per_trade * r_multiple, 0.0)
+        equity = np.empty((S, N + 1))
+        equity[:, 0] = self.initial_balance
+        equity[:, 1:] = self.initial_balance * np.cumprod(growth, axis=1)
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = np.max(1.0 - equity / peak, axis=1)
+        return AccountResult(names, timestamps, equity, accepted, valid, max_drawdown)
@@ -0,0 +1,173 @@
+"""
+Backtester Module - Event-driven replay of signals against price bars.
+
+Signals are processed in time order. Each one opens a trade at its entry
+price and is resolved against the following bars using FelixStrategy's
+rules:
+
+1. SL from ``get_sl_for_market_condition``, targets from ``get_tp_targets``
+2. SL before TP1 -> loss
+3. TP1 hit -> stop moves to breakeven; breakeven before TP2 -> breakeven
+4. TP2 hit -> close unless ``should_hold_for_tp3``; when holding, the stop
+   moves to TP1 and the trade runs for TP3
+5. Trades still open when the data ends stay 'pending'
+
+Bars are scanned in vectorized chunks for the first stop/target hit, so
+there is no Python loop per bar. When the stop and the target are both
+touched inside the same bar, the stop is assumed to have hit first.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple, Any
+
+from felix_strategy import FelixStrategy
+from price_bars import PriceBars
+from trade_book import TradeBook, to_epoch
+
+
+@dataclass
+class BacktestResult:
+    """Resolved trades plus the event log of the run."""
+    trades: List = field(default_factory=list)
+    # (timestamp, event, trade number, price); events: open, sl, tp1, tp2, tp3, breakeven, lock
+    events: List[Tuple[int, str, int, float]] = field(default_factory=list)
+    skipped: int = 0
+    bars_scanned: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = TradeBook.from_trades(self.trades).summary()
+        return {
+            'total_trades': stats['total_trades'],
+            'completed_trades': stats['completed_trades'],
+            'wins': stats['wins'],
+            'losses': stats['losses'],
+            'breakevens': stats['breakevens'],
+            'win_rate': round(stats['win_rate'], 2),
+            'total_pips': round(stats['total_pips'], 2),
+            'profit_factor': round(stats['profit_factor'], 2),
+            'skipped': self.skipped,
+        }
+
+
+class Backtester:
+    """
+    Replays signals against OHLC bars.
+
+    Args:
+        felix: FelixStrategy providing SL/TP sizing and hold rules
+        selector: optional strategy; only signals it accepts are traded and
+            resolved trades are added to it with ``add_trade``
+        chunk: bars examined per vectorized scan step (doubles as it goes)
+    """
+
+    def __init__(self, felix: FelixStrategy = None, selector=None, chunk: int = 2048):
+        self.felix = felix or FelixStrategy()
+        self.selector = selector
+        self.chunk = chunk
+
+    def run(self, signals: List, bars: Dict[str, PriceBars]) -> BacktestResult:
+        """Resolve every signal and return the trades and event log."""
+        result = BacktestResult()
+        ordered = sorted(signals, key=lambda t: to_epoch(getattr(t, 'timestamp', None)))
+
+        for trade in ordered:
+            series = bars.get(trade.pair)
+            if series is None or trade.entry is None:
+                result.skipped += 1
+                continue
+            if self.selector is not None and not self.selector.should_take_trade(trade):
+                continue
+            self.resolve(trade, series, len(result.trades), result)
+            result.trades.append(trade)
+            if self.selector is not None:
+                self.selector.add_trade(trade)
+
+        result.events.sort(key=lambda event: event[0])
+        return result
+
+    def resolve(self, trade, series: PriceBars, number: int = 0,
+                result: Optional[BacktestResult] = None):
+        """Walk one trade through SL/TP1/TP2/TP3 and set result and pips."""
+        felix = self.felix
+        events = result.events if result is not None else []
+        condition = getattr(trade, 'market_condition', 'unknown').lower()
+        sign = 1.0 if trade.direction == 'Buy' else -1.0
+        pip = felix.registry.pip_size(trade.pair)
+        entry = trade.entry
+
+        sl_pips = felix.get_sl_for_market_condition(condition, trade.pair)
+        targets = felix.get_tp_targets(condition)
+        stop = entry - sign * sl_pips * pip
+        tp1, tp2, tp3 = (entry + sign * targets[k] * pip for k in ('tp1', 'tp2', 'tp3'))
+
+        start = series.index_at(to_epoch(getattr(trade, 'timestamp', None)))
+        if start < len(series):
+            events.append((int(series.timestamp[start]), 'open', number, entry))
+        outcome, pips, exit_event = 'pending', 0, None
+
+        # Phase 1: original stop vs TP1
+        i_stop, i_tp1, scanned = self._race(series, sign, start, start, stop, tp1)
+        if i_stop >= 0:
+            outcome, pips, exit_event = 'loss', -sl_pips, (i_stop, 'sl', stop)
+        elif i_tp1 >= 0:
+            events.append((int(series.timestamp[i_tp1]), 'tp1', number, tp1))
+
+            # Phase 2: breakeven stop (from the next bar) vs TP2
+            i_stop, i_tp2, count = self._race(series, sign, i_tp1, i_tp1 + 1, entry, tp2)
+            scanned += count
+            if i_stop >= 0:
+                outcome, pips, exit_event = 'breakeven', 0, (i_stop, 'breakeven', entry)
+            elif i_tp2 >= 0 and not felix.should_hold_for_tp3(condition, targets['tp2']):
+                outcome, pips, exit_event = 'win', targets['tp2'], (i_tp2, 'tp2', tp2)
+            elif i_tp2 >= 0:
+                events.append((int(series.timestamp[i_tp2]), 'tp2', number, tp2))
+
+                # Phase 3: stop locked at TP1 vs TP3
+                i_stop, i_tp3, count = self._race(series, sign, i_tp2, i_tp2 + 1, tp1, tp3)
+                scanned += count
+                if i_stop >= 0:
+                    outcome, pips, exit_event = 'win', targets['tp1'], (i_stop, 'lock', tp1)
+                elif i_tp3 >= 0:
+                    outcome, pips, exit_event = 'win', targets['tp3'], (i_tp3, 'tp3', tp3)
+
+        if exit_event is not None:
+            index, event, price = exit_event
+            events.append((int(series.timestamp[index]), event, number, price))
+        trade.result = outcome
+        trade.pips = pips
+        if result is not None:
+            result.bars_scanned += scanned
+        return trade
+
+    def _race(self, series: PriceBars, sign: float, start: int, stop_from: int,
+              stop: float, target: float) -> Tuple[int, int, int]:
+        """
+        Find which of stop/target is touched first from bar ``start``.
+
+        The stop only counts from bar ``stop_from``. Returns
+        ``(stop_index, target_index, bars_scanned)`` where exactly one index
+        is set (>= 0) when something was hit, both -1 when nothing was.
+        A stop and target in the same bar resolve to the stop.
+        """
+        # Buy: adverse side is the low, favourable side the high (mirrored for sells)
+        adverse, favourable = (series.low, series.high) if sign > 0 else (series.high, series.low)
+        stop_level = sign * stop
+        target_level = sign * target
+        n = len(series)
+        size = self.chunk
+        lo = start
+        while lo < n:
+            hi = min(lo + size, n)
+            stop_hit = sign * adverse[lo:hi] <= stop_level
+            if stop_from > lo:
+                stop_hit[:min(stop_from - lo, hi - lo)] = False
+            target_hit = sign * favourable[lo:hi] >= target_level
+            i_stop = int(stop_hit.argmax()) if stop_hit.any() else -1
+            i_target = int(target_hit.argmax()) if target_hit.any() else -1
+            if i_stop >= 0 and (i_target < 0 or i_stop <= i_target):
+                return lo + i_stop, -1, hi - start
+            if i_target >= 0:
+                return -1, lo + i_target, hi - start
+            lo = hi
+            size *= 2
+        return -1, -1, n - start
@@ -0,0 +1,226 @@
+"""
+Config Loader Module - Compiles config.yaml into shared strategy tables.
+
+The YAML file is parsed and validated once, then compiled into immutable
+lookup tables (key levels, level index, flip zones, pip values, entry
+tolerances, market multipliers). Compiled configs are cached by file
+mtime/size and content hash, so every strategy instance in a parameter
+sweep shares the same tables instead of rebuilding them.
+
+Usage:
+    config = load_config()
+    felix = FelixStrategy(config=config)
+    key_levels = KeyLevelsStrategy("Key Levels", config=config)
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Optional, Any, Mapping, Tuple
+
+import yaml
+
+from level_index import LevelIndex
+from pair_registry import PairRegistry
+
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+REQUIRED_SECTIONS = (
+    'risk_management', 'tp_structure', 'market_conditions', 'key_levels',
+    'pairs', 'entry_tolerances', 'flip_zones',
+)
+DIRECTIONS = ('Buy', 'Sell')
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml is missing data or has invalid values."""
+
+
+def _freeze(value):
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class StrategyConfig:
+    """Compiled, read-only view of config.yaml shared by strategy instances."""
+    path: str
+    digest: str
+    risk_management: Mapping[str, Any]
+    tp_structure: Mapping[str, Any]
+    market_multipliers: Mapping[str, Mapping[str, float]]
+    key_levels: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    flip_levels: Mapping[str, Mapping[str, float]]
+    pairs: Mapping[str, Mapping[str, Any]]
+    pip_values: Mapping[str, float]
+    entry_tolerances: Mapping[str, float]
+    strategy_weights: Mapping[str, float]
+    backtest: Mapping[str, Any]
+    targets: Mapping[str, Any]
+    level_index: LevelIndex
+    registry: PairRegistry
+    raw: Mapping[str, Any]
+
+    def tolerance(self, pair: str, level: float = None) -> float:
+        """Entry tolerance for a pair from ``entry_tolerances``."""
+        return self.registry.tolerance(pair)
+
+
+def _require(mapping: Dict, key: str, where: str):
+    if not isinstance(mapping, dict) or key not in mapping:
+        raise ConfigError(f"Missing '{key}' in {where}")
+    return mapping[key]
+
+
+def _number(value, where: str, minimum: float = None, maximum: float = None) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ConfigError(f"{where} must be a number, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ConfigError(f"{where} must be >= {minimum}, got {value}")
+    if maximum is not None and value > maximum:
+        raise ConfigError(f"{where} must be <= {maximum}, got {value}")
+    return float(value)
+
+
+def validate_config(data: Dict[str, Any]):
+    """Check that the parsed YAML has everything the strategies need."""
+    if not isinstance(data, dict):
+        raise ConfigError("Config root must be a mapping")
+    for section in REQUIRED_SECTIONS:
+        if not isinstance(_require(data, section, 'config'), dict):
+            raise ConfigError(f"Section '{section}' must be a mapping")
+
+    risk = data['risk_management']
+    _number(_require(risk, 'risk_per_trade', 'risk_management'), 'risk_per_trade', 0, 1)
+    for key in ('default_sl_pips', 'tight_sl_pips', 'manual_cut_pips'):
+        _number(_require(risk, key, 'risk_management'), key, 0)
+
+    for tp in ('tp1', 'tp2', 'tp3'):
+        tp_info = _require(data['tp_structure'], tp, 'tp_structure')
+        low = _number(_require(tp_info, 'min_pips', f'tp_structure.{tp}'), f'{tp}.min_pips', 0)
+        high = _number(_require(tp_info, 'max_pips', f'tp_structure.{tp}'), f'{tp}.max_pips', 0)
+        if low > high:
+            raise ConfigError(f"tp_structure.{tp}: min_pips {low} > max_pips {high}")
+
+    for condition, info in data['market_conditions'].items():
+        where = f'market_conditions.{condition}'
+        _number(_require(info, 'sl_multiplier', where), f'{where}.sl_multiplier', 0)
+        _number(_require(info, 'tp3_probability', where), f'{where}.tp3_probability', 0, 1)
+
+    for pair, levels in data['key_levels'].items():
+        if not isinstance(levels, list):
+            raise ConfigError(f"key_levels.{pair} must be a list")
+        for i, level in enumerate(levels):
+            where = f'key_levels.{pair}[{i}]'
+            _number(_require(level, 'level', where), f'{where}.level', 0)
+            _number(_require(level, 'confidence', where), f'{where}.confidence', 0, 1)
+            if _require(level, 'direction', where) not in DIRECTIONS:
+                raise ConfigError(f"{where}.direction must be one of {DIRECTIONS}")
+            for key in ('wins', 'losses'):
+                if key in level:
+                    _number(level[key], f'{where}.{key}', 0)
+
+    for pair, info in data['pairs'].items():
+        _number(_require(info, 'pip_value', f'pairs.{pair}'), f'pairs.{pair}.pip_value', 0)
+
+    for key in ('XAUUSD', 'JPY_pairs', 'standard'):
+        _number(_require(data['entry_tolerances'], key, 'entry_tolerances'),
+                f'entry_tolerances.{key}', 0)
+
+    for pair, info in data['flip_zones'].items():
+        where = f'flip_zones.{pair}'
+        _number(_require(info, 'level', where), f'{where}.level', 0)
+        _number(_require(info, 'tolerance', where), f'{where}.tolerance', 0)
+
+    weights = data.get('strategy_weights') or {}
+    for name, weight in weights.items():
+        _number(weight, f'strategy_weights.{name}', 0, 1)
+    if weights and abs(sum(weights.values()) - 1.0) > 1e-6:
+        raise ConfigError(f"strategy_weights must sum to 1.0, got {sum(weights.values())}")
+
+
+def compile_config(data: Dict[str, Any], path: str = '<memory>', digest: str = '') -> StrategyConfig:
+    """Validate parsed YAML and build the shared lookup tables."""
+    validate_config(data)
+
+    market_multipliers = {
+        condition: {'tp3_rate': float(info['tp3_probability']),
+                    'sl_adjustment': float(info['sl_multiplier'])}
+        for condition, info in data['market_conditions'].items()
+    }
+    flip_levels = {
+        pair: {'level': float(info['level']), 'tolerance': float(info['tolerance'])}
+        for pair, info in data['flip_zones'].items()
+    }
+    frozen_levels = _freeze(data['key_levels'])
+    tolerances = _freeze({k: float(v) for k, v in data['entry_tolerances'].items()})
+    pip_values = _freeze({pair: float(info['pip_value']) for pair, info in data['pairs'].items()})
+    pairs = _freeze(data['pairs'])
+    registry = PairRegistry(pip_values, tolerances, pairs)
+
+    return StrategyConfig(
+        path=path,
+        digest=digest,
+        risk_management=_freeze(data['risk_management']),
+        tp_structure=_freeze(data['tp_structure']),
+        market_multipliers=_freeze(market_multipliers),
+        key_levels=frozen_levels,
+        flip_levels=_freeze(flip_levels),
+        pairs=pairs,
+        pip_values=pip_values,
+        entry_tolerances=tolerances,
+        strategy_weights=_freeze(data.get('strategy_weights') or {}),
+        backtest=_freeze(data.get('backtest') or {}),
+        targets=_freeze(data.get('targets') or {}),
+        level_index=LevelIndex(frozen_levels, lambda pair, level: registry.tolerance(pair)),
+        registry=registry,
+        raw=_freeze(data),
+    )
+
+
+_cache: Dict[str, Tuple[Tuple[int, int], StrategyConfig]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_config(path: Optional[str] = None) -> StrategyConfig:
+    """
+    Load and compile a config file, reusing the cached result while the
+    file is unchanged (same mtime/size, or same content hash).
+    """
+    path = os.path.abspath(path or DEFAULT_CONFIG_PATH)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached is not None and cached[1].digest == digest:
+            # Touched but not modified
+            _cache[path] = (stamp, cached[1])
+            return cached[1]
+
+        try:
+            data = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"Cannot parse {path}: {e}") from e
+        config = compile_config(data, path=path, digest=digest)
+        _cache[path] = (stamp, config)
+        return config
+
+
+def clear_config_cache():
+    """Drop all cached configs (mainly for tests and reload commands)."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,156 @@
+"""
+Ensemble Module - Weighted vote across all strategies.
+
+Combines the strategies from strategies.py and FelixStrategy using the
+config.yaml ``strategy_weights``:
+
+    key_levels          -> KeyLevelsStrategy
+    gold_mean_reversion -> GoldMeanReversionStrategy
+    adaptive_flip       -> FelixStrategy
+    trend_following     -> TrendFollowingStrategy
+    multi_day_hold      -> MultiDayHoldStrategy
+
+Each signal is evaluated against every member in one pass. The pair's
+level lookup is done once and shared between KeyLevels and Felix when
+they use the same level index (always the case with a config), and the
+per-pair lookups are cached. The score is the weighted share of members
+voting to take the trade.
+
+Usage:
+    ensemble = Ensemble(config=load_config())
+    vote = ensemble.vote(trade)       # EnsembleVote(score, decision, votes)
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from felix_strategy import FelixStrategy
+from signal_batch import SignalBatch
+from strategies import (KeyLevelsStrategy, GoldMeanReversionStrategy,
+                        TrendFollowingStrategy, MultiDayHoldStrategy)
+from trade_book import TradeBook, TradeStatsMixin
+
+
+DEFAULT_WEIGHTS = {
+    'key_levels': 0.30,
+    'gold_mean_reversion': 0.20,
+    'adaptive_flip': 0.15,
+    'trend_following': 0.20,
+    'multi_day_hold': 0.15,
+}
+
+# Weighted sums like 0.15 + 0.20 + 0.15 may land just below 0.5
+_EPSILON = 1e-9
+
+
+@dataclass
+class EnsembleVote:
+    """Weighted vote for one signal."""
+    score: float                    # weighted share of members voting yes (0-1)
+    decision: bool                  # score >= threshold
+    votes: Dict[str, bool] = field(default_factory=dict)
+
+
+class Ensemble(TradeStatsMixin):
+    """
+    Weighted ensemble of all strategies; usable as a backtester selector.
+
+    Args:
+        config: optional StrategyConfig (weights and shared level tables)
+        weights: override ``strategy_weights``
+        threshold: minimum score to take a trade
+    """
+
+    def __init__(self, config=None, weights: Optional[Dict[str, float]] = None,
+                 threshold: float = 0.5, name: str = "Ensemble"):
+        weights = dict(weights or (config.strategy_weights if config is not None else DEFAULT_WEIGHTS))
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown strategies in strategy_weights: {sorted(unknown)}")
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("strategy_weights must sum to a positive value")
+
+        self.name = name
+        self.description = "Weighted vote of " + ", ".join(weights)
+        self.config = config
+        self.threshold = threshold
+        self.weights = {name: weight / total for name, weight in weights.items()}
+        self.trades: List = []
+        self.book = TradeBook()
+
+        self.key_levels = KeyLevelsStrategy('key_levels', config=config)
+        self.gold = GoldMeanReversionStrategy('gold_mean_reversion')
+        self.felix = FelixStrategy(config=config)
+        self.trend = TrendFollowingStrategy('trend_following')
+        self.multi_day = MultiDayHoldStrategy('multi_day_hold')
+        self.members = {
+            'key_levels': self.key_levels,
+            'gold_mean_reversion': self.gold,
+            'adaptive_flip': self.felix,
+            'trend_following': self.trend,
+            'multi_day_hold': self.multi_day,
+        }
+        self._pairs: Dict[str, Tuple] = {}
+
+    def _pair_context(self, pair: str) -> Tuple:
+        """(key levels, shared with Felix) for a pair, cached."""
+        context = self._pairs.get(pair)
+        if context is None:
+            shared = self.key_levels.level_index is self.felix.level_index
+            context = (self.key_levels.level_index.get(pair), shared)
+            self._pairs[pair] = context
+        return context
+
+    def refresh(self):
+        """Drop cached per-pair lookups after changing a member's levels."""
+        self._pairs.clear()
+
+    def vote(self, trade) -> EnsembleVote:
+        """Evaluate one signal against every member."""
+        pair, entry, direction = trade.pair, trade.entry, trade.direction
+        votes = {}
+
+        if entry is None:
+            key_vote = felix_vote = False
+        else:
+            key_levels, shared = self._pair_context(pair)
+            hits = key_levels.within(entry) if key_levels is not None else []
+            key_vote = any(key_levels.directions[i] == direction for i in hits)
+            felix_vote = False
+            if 'adaptive_flip' in self.weights:
+                condition = getattr(trade, 'market_condition', 'unknown').lower()
+                confidence = self.felix._calculate_confidence(
+                    pair, entry, direction, condition, hits if shared else None)
+                felix_vote = confidence >= self.felix.confidence_threshold
+
+        score = 0.0
+        for name, weight in self.weights.items():
+            if name == 'key_levels':
+                taken = key_vote
+            elif name == 'adaptive_flip':
+                taken = felix_vote
+            elif name == 'multi_day_hold' and entry is None:
+                taken = pair in self.multi_day.swing_pairs
+            else:
+                taken = self.members[name].should_take_trade(trade)
+            votes[name] = taken
+            if taken:
+                score += weight
+        return EnsembleVote(score, score >= self.threshold - _EPSILON, votes)
+
+    def vote_batch(self, batch: SignalBatch) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Vectorized vote: (scores, {strategy: mask})."""
+        votes = {name: self.members[name].should_take_trades(batch) for name in self.weights}
+        scores = np.zeros(len(batch))
+        for name, weight in self.weights.items():
+            scores += weight * votes[name]
+        return scores, votes
+
+    def should_take_trade(self, trade) -> bool:
+        return self.vote(trade).decision
+
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        return self.vote_batch(batch)[0] >= self.threshold - _EPSILON
@@ -0,0 +1,232 @@
+"""
+Exit Simulator Module - Scaled exits (TP1 -> TP2 -> BE -> TP3) over price bars.
+
+The V2 plan in v1_vs_v2_analysis_2026-02-17.md closes part of a position
+at each target instead of all of it at one:
+
+1. SL before TP1 -> the whole position loses ``sl_pips``
+2. TP1 -> close ``fractions[0]``, stop moves to breakeven
+3. Breakeven before TP2 -> the rest closes at 0
+4. TP2 -> close ``fractions[1]``; the last part runs for TP3 if
+   ``should_hold_for_tp3``, otherwise it closes at TP2 too
+5. While running for TP3 the stop sits at breakeven (or TP1 with
+   ``tp2_stop='tp1'``); TP3 closes the last part
+
+A trade's pips are the fraction-weighted blend of its exits. Parts still
+open after ``max_bars`` are marked to the last close and the trade stays
+'pending'.
+
+Trades of one pair are resolved together on a (trades x bars) window: the
+running maximum of the favourable side and running minimum of the adverse
+side are monotonic, so the first bar reaching any level is a count of the
+bars still short of it. Stops that only apply after a given bar are found
+with one masked argmax. A stop and a target in the same bar resolve to
+the stop, as in the Backtester.
+
+Usage:
+    sim = ExitSimulator(felix, fractions=(0.5, 0.3, 0.2))
+    result = sim.run(trades, bars)
+    print(result.to_dict())
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Any
+
+import numpy as np
+
+from felix_strategy import FelixStrategy
+from price_bars import PriceBars
+from trade import RESULT_NAMES, PENDING, WIN, LOSS, BREAKEVEN
+from trade_book import to_epoch
+
+
+@dataclass
+class ExitResult:
+    """Per-trade outcome of the scaled exits (arrays in input order)."""
+    pips: np.ndarray            # blended pips
+    result: np.ndarray          # trade result codes (WIN / LOSS / BREAKEVEN / PENDING)
+    stage: np.ndarray           # 0: no target, 1: TP1, 2: TP2, 3: TP3 reached
+    exit_bar: np.ndarray        # bar index of the last exit (-1 when still open)
+
+    @property
+    def results(self) -> List[str]:
+        return [RESULT_NAMES[code] for code in self.result]
+
+    def to_dict(self) -> Dict[str, Any]:
+        done = self.result != PENDING
+        wins = int((self.result == WIN).sum())
+        losses = int((self.result == LOSS).sum())
+        gross_win = float(self.pips[done & (self.pips > 0)].sum())
+        gross_loss = float(-self.pips[done & (self.pips < 0)].sum())
+        if gross_loss == 0:  # Same convention as TradeBook.summary
+            profit_factor = gross_win if gross_win > 0 else 1.0
+        else:
+            profit_factor = gross_win / gross_loss
+        return {
+            'total_trades': len(self.pips),
+            'completed_trades': int(done.sum()),
+            'wins': wins,
+            'losses': losses,
+            'breakevens': int((self.result == BREAKEVEN).sum()),
+            'win_rate': round(wins / max(int(done.sum()), 1) * 100, 2),
+            'total_pips': round(float(self.pips[done].sum()), 2),
+            'profit_factor': round(profit_factor, 2),
+            'tp1_hits': int((self.stage >= 1).sum()),
+            'tp2_hits': int((self.stage >= 2).sum()),
+            'tp3_hits': int((self.stage >= 3).sum()),
+        }
+
+
+def _first(reached: np.ndarray) -> np.ndarray:
+    """First True column per row of a monotonic (False..True) mask; width when never."""
+    return reached.shape[1] - reached.sum(axis=1)
+
+
+def _first_after(hit: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """First True column strictly after ``after`` per row; width when never."""
+    hit = hit & (np.arange(hit.shape[1]) > after[:, None])
+    return np.where(hit.any(axis=1), hit.argmax(axis=1), hit.shape[1])
+
+
+class ExitSimulator:
+    """
+    Args:
+        felix: FelixStrategy providing SL/TP sizing and the TP3 hold rule
+        fractions: position parts closed at TP1, TP2 and TP3
+        tp2_stop: stop after TP2, 'breakeven' or 'tp1'
+        max_bars: bars followed per trade
+        memory_mb: rough cap on the (trades x bars) working arrays
+    """
+
+    def __init__(self, felix: FelixStrategy = None, fractions: Tuple[float, float, float] = (1 / 3, 1 / 3, 1 / 3),
+                 tp2_stop: str = 'breakeven', max_bars: int = 2880, memory_mb: int = 128):
+        if tp2_stop not in ('breakeven', 'tp1'):
+            raise ValueError(f"Unknown tp2_stop '{tp2_stop}' (use 'breakeven' or 'tp1')")
+        if abs(sum(fractions) - 1.0) > 1e-9 or min(fractions) < 0:
+            raise ValueError(f"fractions {fractions} must be non-negative and sum to 1")
+        self.felix = felix or FelixStrategy()
+        self.fractions = tuple(float(f) for f in fractions)
+        self.tp2_stop = tp2_stop
+        self.max_bars = max_bars
+        self.memory_mb = memory_mb
+
+    def _plans(self, trades: List) -> Dict[str, np.ndarray]:
+        """Per-trade sign, start time, SL/targets in pips and the TP3 hold flag."""
+        felix = self.felix
+        cache = {}
+        rows = []
+        for trade in trades:
+            condition = getattr(trade, 'market_condition', 'unknown').lower()
+            key = (condition, trade.pair)
+            plan = cache.get(key)
+            if plan is None:
+                targets = felix.get_tp_targets(condition)
+                plan = (felix.get_sl_for_market_condition(condition, trade.pair),
+                        targets['tp1'], targets['tp2'], targets['tp3'],
+                        felix.should_hold_for_tp3(condition, targets['tp2']))
+                cache[key] = plan
+            rows.append((1.0 if trade.direction == 'Buy' else -1.0,
+                         to_epoch(getattr(trade, 'timestamp', None))) + plan)
+        data = np.array(rows, dtype=np.float64).reshape(-1, 7)
+        return {
+            'sign': data[:, 0], 'time': data[:, 1].astype(np.int64),
+            'sl': data[:, 2], 'tp1': data[:, 3], 'tp2': data[:, 4], 'tp3': data[:, 5],
+            'hold': data[:, 6].astype(bool),
+        }
+
+    def run(self, trades: List, bars: Dict[str, PriceBars]) -> ExitResult:
+        """Resolve every trade that has an entry and (non-empty) bars for its pair."""
+        n = len(trades)
+        pips = np.zeros(n)
+        result = np.full(n, PENDING, dtype=np.int8)
+        stage = np.zeros(n, dtype=np.int8)
+        exit_bar = np.full(n, -1, dtype=np.int64)
+        plans = self._plans(trades)
+        entry = np.array([np.nan if t.entry is None else t.entry for t in trades], dtype=np.float64)
+
+        groups: Dict[str, List[int]] = {}
+        for i, trade in enumerate(trades):
+            # Pairs without bars (e.g. a window outside the data) stay pending
+            series = bars.get(trade.pair)
+            if series is not None and len(series) and not np.isnan(entry[i]):
+                groups.setdefault(trade.pair, []).append(i)
+
+        width = max(self.max_bars, 1)
+        chunk = max(1, (self.memory_mb << 20) // (8 * 6 * width))
+        for pair, rows in groups.items():
+            series = bars[pair]
+            pip = self.felix.registry.pip_size(pair)
+            rows = np.array(rows)
+            for lo in range(0, len(rows), chunk):
+                part = rows[lo:lo + chunk]
+                p, r, s, e = self._resolve(series, pip, entry[part],
+                                           {k: v[part] for k, v in plans.items()})
+                pips[part], result[part], stage[part], exit_bar[part] = p, r, s, e
+        return ExitResult(pips, result, stage, exit_bar)
+
+    def _resolve(self, series: PriceBars, pip: float, entry: np.ndarray,
+                 plan: Dict[str, np.ndarray]):
+        """Scaled exits for trades of one pair."""
+        n_bars = len(series)
+        sign = plan['sign']
+        start = np.searchsorted(series.timestamp, plan['time'], side='left')
+        cols = np.arange(self.max_bars)
+        index = start[:, None] + cols
+        inside = index < n_bars
+        index = np.minimum(index, max(n_bars - 1, 0))
+
+        # Sign-adjusted prices: larger is better for the trade
+        buy = (sign > 0)[:, None]
+        favourable = np.where(buy, series.high[index], -series.low[index])
+        adverse = np.where(buy, series.low[index], -series.high[index])
+        favourable[~inside] = -np.inf
+        adverse[~inside] = np.inf
+        best = np.maximum.accumulate(favourable, axis=1)
+        worst = np.minimum.accumulate(adverse, axis=1)
+
+        # Levels in the same sign-adjusted units
+        base = sign * entry
+        level = {k: base + plan[k] * pip for k in ('tp1', 'tp2', 'tp3')}
+        t_sl = _first(worst <= (base - plan['sl'] * pip)[:, None])
+        t1, t2, t3 = (_first(best >= level[k][:, None]) for k in ('tp1', 'tp2', 'tp3'))
+        t_be = _first_after(adverse <= base[:, None], t1)
+        lock = base if self.tp2_stop == 'breakeven' else level['tp1']
+        t_lock = _first_after(adverse <= lock[:, None], t2)
+        width = self.max_bars
+
+        f1, f2, f3 = self.fractions
+        hold = plan['hold']
+        lock_pips = 0.0 if self.tp2_stop == 'breakeven' else plan['tp1']
+        loss = (t_sl < width) & (t_sl <= t1)
+        got1 = ~loss & (t1 < width)
+        got2 = got1 & (t2 < t_be)
+        run3 = got2 & hold
+        got3 = run3 & (t3 < t_lock)
+
+        pips = np.where(loss, -plan['sl'], 0.0)
+        pips += got1 * f1 * plan['tp1']
+        pips += got2 * np.where(hold, f2 * plan['tp2'], (f2 + f3) * plan['tp2'])
+        pips += got3 * f3 * plan['tp3']
+        pips += (run3 & ~got3 & (t_lock < width)) * f3 * lock_pips
+
+        # Exit bar of the last open part, or width while something is still open
+        exit_at = np.full(len(entry), width)
+        exit_at = np.where(loss & (t_sl < width), t_sl, exit_at)
+        exit_at = np.where(got1 & ~got2 & (t_be < width), t_be, exit_at)
+        exit_at = np.where(got2 & ~hold, t2, exit_at)
+        exit_at = np.where(got3, t3, exit_at)
+        exit_at = np.where(run3 & ~got3 & (t_lock < width), t_lock, exit_at)
+        done = exit_at < width
+
+        # Mark open parts to the last close in the window
+        last = start + np.minimum(width, n_bars - start) - 1
+        last_close = sign * series.close[np.clip(last, 0, max(n_bars - 1, 0))]
+        open_fraction = np.where(run3, f3, np.where(got1, f2 + f3, 1.0))
+        marked = (last_close - base) / pip * open_fraction
+        pips = np.where(done | (start >= n_bars), pips, pips + marked)
+
+        result = np.where(pips > 0, WIN, np.where(pips < 0, LOSS, BREAKEVEN)).astype(np.int8)
+        result[~done] = PENDING
+        stage = got1.astype(np.int8) + got2 + got3
+        exit_bar = np.where(done, start + exit_at, -1)
+        return pips, result, stage, exit_bar
@@ -13,6 +13,13 @@ Key characteristics identified from analysis:
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from level_index import LevelIndex
+from pair_registry import default_registry
+from signal_batch import SignalBatch
+from trade_book import TradeBook, TradeStatsMixin
+
 
 @dataclass
 class FelixStrategy:
@@ -23,9 +30,32 @@ class FelixStrategy:
     name: str = "Felix Original Strategy"
     description: str = "Dynamic SL, TP scaling, and market condition detection"
     rules: Dict[str, Any] = field(default_factory=dict)
+    config: Optional[Any] = field(default=None, repr=False)  # StrategyConfig from config_loader
     
     def __post_init__(self):
         """Initialize Felix-specific parameters."""
+        # Decision thresholds (tunable, not in config.yaml)
+        self.confidence_threshold = 0.6
+        self.tp3_hold_pips = {'trending': 50, 'mixed': 70}  # Hold for TP3 from this profit
+        # Adaptive SL base by pair (FELIX_STRATEGY_V2.md), scaled by ATR and condition
+        self.adaptive_sl_base = {
+            'XAUUSD': 80, 'EURUSD': 35, 'GBPUSD': 35, 'USDJPY': 35, 'EURAUD': 80, 'GBPJPY': 60,
+        }
+        self.adaptive_sl_default = 50
+        self.indicators = None  # IndicatorCache; see use_indicators
+        self.indicator_timeframe = 'H1'
+        self.tp_targets = {
+            'trending': {'tp1': 30, 'tp2': 80, 'tp3': 180},
+            'mixed': {'tp1': 20, 'tp2': 50, 'tp3': 100},
+            'choppy': {'tp1': 15, 'tp2': 30, 'tp3': 60},  # TP3 rarely hit in choppy
+        }
+        
+        if self.config is not None:
+            self._apply_config(self.config)
+            return
+        
+        self.registry = default_registry()  # Pip sizes/values and tolerances per pair
+        
         self.risk_per_trade = 0.01  # 1% risk per trade
         self.default_sl_pips = 80
         self.tight_sl_pips = 60
@@ -90,6 +120,40 @@ class FelixStrategy:
             'EURUSD': {'level': 1.16500, 'tolerance': 0.0020},
             'USDJPY': {'level': 156.000, 'tolerance': 0.05},
         }
+        self.rebuild_level_index()
+    
+    def _apply_config(self, config):
+        """Use the shared, precompiled tables from a StrategyConfig."""
+        risk = config.risk_management
+        self.risk_per_trade = risk['risk_per_trade']
+        self.default_sl_pips = risk['default_sl_pips']
+        self.tight_sl_pips = risk['tight_sl_pips']
+        self.manual_cut_pips = risk['manual_cut_pips']
+        
+        tp = config.tp_structure
+        self.tp1_range = (tp['tp1']['min_pips'], tp['tp1']['max_pips'])
+        self.tp2_range = (tp['tp2']['min_pips'], tp['tp2']['max_pips'])
+        self.tp3_range = (tp['tp3']['min_pips'], tp['tp3']['max_pips'])
+        
+        self.registry = config.registry
+        self.market_multipliers = config.market_multipliers
+        self.key_levels = config.key_levels
+        self.flip_levels = config.flip_levels
+        self.level_index = config.level_index
+    
+    def rebuild_level_index(self):
+        """Rebuild the sorted level index after changing key_levels."""
+        self.level_index = LevelIndex(self.key_levels, self._get_tolerance)
+    
+    def use_level_store(self, store):
+        """Look up key levels in a LevelStore that learns from resolved trades."""
+        self.key_levels = store.key_levels
+        self.level_index = store
+    
+    def use_indicators(self, indicators, timeframe: str = 'H1'):
+        """Size stops with get_adaptive_sl from an IndicatorCache once its ATR is ready."""
+        self.indicators = indicators
+        self.indicator_timeframe = timeframe
     
     def should_take_trade(self, trade) -> bool:
         """
@@ -99,7 +163,7 @@ class FelixStrategy:
         pair = trade.pair
         entry = trade.entry
         direction = trade.direction
-        market_condition = trade.market_condition.lower() if hasattr(trade, 'market_condition') else 'unknown'
+        market_condition = getattr(trade, 'market_condition', 'unknown').lower()
         
         if entry is None:
             return False
@@ -107,28 +171,30 @@ class FelixStrategy:
         # Get confidence score
         confidence = self._calculate_confidence(pair, entry, direction, market_condition)
         
-        # Felix takes trades with confidence >= 0.6 (60%)
-        return confidence >= 0.6
+        # Felix takes trades with confidence >= 0.6 (60%) by default
+        return confidence >= self.confidence_threshold
     
-    def _calculate_confidence(self, pair: str, entry: float, direction: str, market_condition: str) -> float:
-        """Calculate confidence score for a trade."""
+    def _calculate_confidence(self, pair: str, entry: float, direction: str, market_condition: str,
+                              hits: Optional[List[int]] = None) -> float:
+        """
+        Calculate confidence score for a trade.
+        ``hits`` may pass in precomputed ``level_index.get(pair).within(entry)``.
+        """
         confidence = 0.5  # Base confidence
         
         # Check if entry is near a key level
-        if pair in self.key_levels:
-            for level_info in self.key_levels[pair]:
-                level = level_info['level']
-                tolerance = self._get_tolerance(pair, level)
-                
-                if abs(entry - level) <= tolerance:
-                    # Entry is at a key level
-                    if direction == level_info['direction']:
-                        # Direction matches - boost confidence
-                        win_rate = level_info['wins'] / (level_info['wins'] + level_info['losses'])
-                        confidence = max(confidence, level_info['confidence'] * win_rate)
-                    else:
-                        # Direction doesn't match - check for flip
-                        confidence = max(confidence, 0.3)  # Lower confidence for flips
+        levels = self.level_index.get(pair)
+        if levels is not None:
+            if hits is None:
+                hits = levels.within(entry)
+            for i in hits:
+                # Entry is at a key level
+                if direction == levels.directions[i]:
+                    # Direction matches - boost by confidence * win rate
+                    confidence = max(confidence, levels.score(i))
+                else:
+                    # Direction doesn't match - check for flip
+                    confidence = max(confidence, 0.3)  # Lower confidence for flips
         
         # Adjust for market condition
         if market_condition in self.market_multipliers:
@@ -144,6 +210,49 @@ class FelixStrategy:
         
         return min(confidence, 1.0)
     
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        """Vectorized should_take_trade over a SignalBatch."""
+        return self.calculate_confidences(batch) >= self.confidence_threshold
+    
+    def calculate_confidences(self, batch: SignalBatch) -> np.ndarray:
+        """
+        Vectorized _calculate_confidence over a SignalBatch.
+        Rows without an entry price get a confidence of 0.
+        """
+        entry = batch.entry
+        confidence = np.full(len(batch), 0.5)
+        groups = batch.pair_groups()
+        
+        # Key levels
+        for pair, rows in groups.items():
+            levels = self.level_index.get(pair)
+            if levels is None:
+                continue
+            entries = entry[rows]
+            directions = batch.direction[rows]
+            conf = confidence[rows]
+            for positions, hit in levels.candidates(entries):
+                match = hit & (levels.direction_array[positions] == directions)
+                conf[match] = np.maximum(conf[match], levels.scores[positions[match]])
+                conf[hit & ~match] = np.maximum(conf[hit & ~match], 0.3)
+            confidence[rows] = conf
+        
+        # Market condition
+        for condition, multiplier in self.market_multipliers.items():
+            confidence[batch.market_condition == condition] *= multiplier['tp3_rate'] * 1.5
+        
+        # Flip zones
+        for pair, flip_info in self.flip_levels.items():
+            rows = groups.get(pair)
+            if rows is None:
+                continue
+            in_zone = rows[np.abs(entry[rows] - flip_info['level']) <= flip_info['tolerance']]
+            confidence[in_zone] = np.maximum(confidence[in_zone], 0.7)
+        
+        confidence = np.minimum(confidence, 1.0)
+        confidence[np.isnan(entry)] = 0.0
+        return confidence
+    
     def calculate_position_size(self, account_balance: float, sl_pips: int, pair: str = "EURUSD") -> float:
         """
         Calculate position size based on 1-2% risk rule.
@@ -166,102 +275,87 @@ class FelixStrategy:
     
     def _get_pip_value(self, pair: str) -> float:
         """Get approximate pip value in USD for 1 standard lot."""
-        pip_values = {
-            'EURUSD': 10.0,
-            'GBPUSD': 10.0,
-            'USDJPY': 6.5,
-            'USDCHF': 11.0,
-            'AUDUSD': 10.0,
-            'USDCAD': 7.5,
-            'NZDUSD': 10.0,
-            'XAUUSD': 10.0,  # Gold
-            'EURJPY': 6.5,
-            'GBPJPY': 6.5,
-            'EURGBP': 13.0,
-            'EURAUD': 6.5,
-            'AUDCAD': 7.5,
-            'AUDJPY': 6.5,
-            'GBPCAD': 7.5,
-            'GBPAUD': 6.5,
-            'GBPNZD': 6.5,
-            'EURCAD': 7.5,
-            'EURCHF': 11.0,
-            'CADJPY': 6.5,
-            'CHFJPY': 6.5,
-            'CADCHF': 11.0,
-        }
-        return pip_values.get(pair, 10.0)
+        return self.registry.pip_value(pair)
     
     def _get_tolerance(self, pair: str, level: float) -> float:
         """Calculate entry tolerance based on pair."""
-        if pair == 'XAUUSD':
-            return 5.0  # 5 pips for gold
-        elif 'JPY' in pair:
-            return 0.05  # 5 pips for JPY pairs
-        else:
-            return 0.0005  # 5 pips for standard pairs
+        return self.registry.tolerance(pair)
     
     def get_sl_for_market_condition(self, market_condition: str, pair: str = "EURUSD") -> int:
-        """Get appropriate SL size based on market condition."""
+        """
+        Get appropriate SL size based on market condition. With an
+        IndicatorCache attached (use_indicators) whose ATR for the pair is
+        ready, the ATR-based get_adaptive_sl is used instead.
+        """
+        if self.indicators is not None:
+            state = self.indicators.get(pair, self.indicator_timeframe)
+            if state is not None and state.ready:
+                return self.get_adaptive_sl(pair, market_condition, state.atr, state.avg_atr)
+        
         base_sl = self.default_sl_pips
         
-        if market_condition == 'choppy':
-            return int(base_sl * 0.75)  # -60 pips
-        elif market_condition == 'mixed':
-            return int(base_sl * 0.875)  # -70 pips
-        else:
-            return base_sl  # -80 pips
+        # choppy 0.75 (-60 pips), mixed 0.875 (-70 pips), trending 1.0 (-80 pips)
+        multiplier = self.market_multipliers.get(market_condition)
+        if multiplier is None:
+            return base_sl
+        return int(base_sl * multiplier['sl_adjustment'])
+    
+    def get_adaptive_sl(self, pair: str, market_condition: str, atr: Optional[float] = None,
+                        average_atr: Optional[float] = None, indicators=None,
+                        timeframe: str = 'H1') -> int:
+        """
+        SL in pips from the pair's base SL, widened x1.5 when ATR(14) is
+        above 1.5x its average, tightened x0.75 below 0.7x, and widened
+        x1.2 in choppy markets. ATR values can be passed directly or read
+        from an IndicatorCache; without them only the condition applies.
+        """
+        if indicators is not None and atr is None:
+            state = indicators.get(pair, timeframe)
+            if state is not None and state.ready:
+                atr, average_atr = state.atr, state.avg_atr
+        
+        sl = self.adaptive_sl_base.get(pair, self.adaptive_sl_default)
+        if atr is not None and average_atr:
+            if atr > 1.5 * average_atr:  # High volatility
+                sl = sl * 1.5
+            elif atr < 0.7 * average_atr:  # Low volatility
+                sl = sl * 0.75
+        
+        if market_condition.lower() == 'choppy':
+            sl = sl * 1.2  # Wider SL for choppy
+        
+        return round(sl)
     
     def get_tp_targets(self, market_condition: str) -> Dict[str, int]:
-        """Get TP targets based on market condition."""
-        if market_condition == 'trending':
-            return {
-                'tp1': 30,
-                'tp2': 80,
-                'tp3': 180
-            }
-        elif market_condition == 'mixed':
-            return {
-                'tp1': 20,
-                'tp2': 50,
-                'tp3': 100
-            }
-        else:  # choppy
-            return {
-                'tp1': 15,
-                'tp2': 30,
-                'tp3': 60  # Rarely hit in choppy
-            }
+        """Get TP targets based on market condition (unknown -> choppy)."""
+        targets = self.tp_targets.get(market_condition, self.tp_targets['choppy'])
+        return dict(targets)
     
     def should_hold_for_tp3(self, market_condition: str, current_pips: float) -> bool:
         """
         Determine if should hold position for TP3.
-        Felix only holds for TP3 in trending markets.
+        Felix holds in trending markets from +50 pips and in mixed markets
+        only with strong momentum (+70 pips); never in choppy markets.
         """
-        if market_condition == 'trending':
-            return current_pips >= 50  # Hold if already +50 pips
-        elif market_condition == 'mixed':
-            return current_pips >= 70  # Only if strong momentum
-        else:
+        threshold = self.tp3_hold_pips.get(market_condition)
+        if threshold is None:
             return False  # Don't hold for TP3 in choppy markets
+        return current_pips >= threshold
     
     def should_flip_direction(self, pair: str, entry: float, direction: str) -> bool:
         """
         Determine if strategy should flip direction.
         Returns True if the level has been broken against the original direction.
         """
-        if pair not in self.key_levels:
+        levels = self.level_index.get(pair)
+        if levels is None:
             return False
         
-        for level_info in self.key_levels[pair]:
-            level = level_info['level']
-            tolerance = self._get_tolerance(pair, level)
-            
-            if abs(entry - level) <= tolerance:
-                # At a key level
-                if direction != level_info['direction']:
-                    # Trading opposite to historical direction - potential flip
-                    return True
+        for i in levels.within(entry):
+            # At a key level
+            if direction != levels.directions[i]:
+                # Trading opposite to historical direction - potential flip
+                return True
         
         return False
     
@@ -286,78 +380,24 @@ class FelixStrategy:
                 'tp3': self.tp3_range,
             },
             'key_levels_count': sum(len(levels) for levels in self.key_levels.values()),
-            'market_multipliers': self.market_multipliers,
+            'market_multipliers': {k: dict(v) for k, v in self.market_multipliers.items()},
         }
 
 
 # For compatibility with strategy runner
-class FelixStrategyClass:
+class FelixStrategyClass(TradeStatsMixin):
     """Wrapper class for compatibility with the backtester."""
     
-    def __init__(self, name: str, description: str = "", rules: Dict = None):
+    def __init__(self, name: str, description: str = "", rules: Dict = None, config=None):
         self.name = name
         self.description = description or "Dynamic SL, TP scaling, and market condition detection"
         self.rules = rules or {}
-        self.felix = FelixStrategy()
+        self.felix = FelixStrategy(config=config)
         self.trades: List = []
+        self.book = TradeBook()
     
     def should_take_trade(self, trade) -> bool:
         return self.felix.should_take_trade(trade)
     
-    def add_trade(self, trade):
-        trade.strategy = self.name
-        self.trades.append(trade)
-    
-    def calculate_winrate(self, exclude_pending: bool = True) -> float:
-        if not self.trades:
-            return 0.0
-        trades_to_count = [t for t in self.trades if t.result != 'pending'] if exclude_pending else self.trades
-        if not trades_to_count:
-            return 0.0
-        winners = len([t for t in trades_to_count if t.result == 'win'])
-        return (winners / len(trades_to_count)) * 100
-    
-    def total_pips(self) -> float:
-        return sum(t.pips for t in self.trades if t.result != 'pending')
-    
-    def total_trades(self) -> int:
-        return len(self.trades)
-    
-    def wins(self) -> int:
-        return len([t for t in self.trades if t.result == 'win'])
-    
-    def losses(self) -> int:
-        return len([t for t in self.trades if t.result == 'loss'])
-    
-    def breakevens(self) -> int:
-        return len([t for t in self.trades if t.result == 'breakeven'])
-    
-    def profit_factor(self) -> float:
-        gross_profit = sum(t.pips for t in self.trades if t.pips > 0)
-        gross_loss = abs(sum(t.pips for t in self.trades if t.pips < 0))
-        if gross_loss == 0:
-            return gross_profit if gross_profit > 0 else 1.0
-        return gross_profit / gross_loss
-    
-    def by_pair(self) -> Dict[str, List]:
-        result = {}
-        for trade in self.trades:
-            if trade.pair not in result:
-                result[trade.pair] = []
-            result[trade.pair].append(trade)
-        return result
-    
-    def to_dict(self) -> Dict:
-        completed = [t for t in self.trades if t.result != 'pending']
-        return {
-            'name': self.name,
-            'description': self.description,
-            'total_trades': self.total_trades(),
-            'completed_trades': len(completed),
-            'wins': self.wins(),
-            'losses': self.losses(),
-            'breakevens': self.breakevens(),
-            'win_rate': round(self.calculate_winrate(), 2),
-            'total_pips': round(self.total_pips(), 2),
-            'profit_factor': round(self.profit_factor(), 2),
-        }
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        return self.felix.should_take_trades(batch)
@@ -0,0 +1,228 @@
+"""
+Flip Engine Module - Stop-and-reverse at broken flip levels.
+
+FELIX_STRATEGY_V2.md flips direction when a level breaks with momentum.
+For every pair in ``FelixStrategy.flip_levels`` the engine follows the
+level bar by bar with a small state machine (zone = level +- tolerance):
+
+    idle ──(high/low pierces the zone)──> broken
+    broken ──(close beyond the zone)──> beyond
+    beyond ──(``hold_bars`` closes not back through the zone)──> flip
+    broken / beyond ──(close back through the zone, or the break stalls
+                       for ``hold_bars`` bars)──> idle (rejected)
+
+Closes inside the zone count as holding (a retest). A confirmed flip
+moves the level to the other side of price, so the next flip is a break
+back the other way.
+
+On a flip, open positions on the pair that were taken at the level
+against the break (e.g. Sells at a resistance that broke upwards) are
+closed at the bar's close and reversed: a new trade in the break
+direction opens at that close. Both legs are followed by a
+PositionMonitor and kept together as a FlipChain, whose pips are the two
+trades' pips combined.
+
+Each bar costs O(1) for the level plus the monitor's O(log n) trigger
+work, so the same engine runs live and inside backtests. Within a bar the
+monitor sees open, the nearer extreme, the other extreme, then close
+(low first on an up bar, high first on a down bar).
+
+Usage:
+    engine = FlipEngine(felix)
+    engine.open(trade)
+    events = engine.on_bar('XAUUSD', ts, o, h, l, c)
+    print(engine.summary())
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple, Any
+
+from felix_strategy import FelixStrategy
+from position_monitor import PositionMonitor
+from price_bars import PriceBars
+from trade import Trade
+from trade_book import to_epoch
+
+
+IDLE = 'idle'
+BROKEN = 'broken'
+BEYOND = 'beyond'
+
+
+@dataclass
+class FlipChain:
+    """A position closed at a flip and the trade that reversed it."""
+    pair: str
+    level: float
+    timestamp: int
+    original: object
+    reverse: Trade
+
+    @property
+    def pips(self) -> float:
+        return (self.original.pips or 0) + (self.reverse.pips or 0)
+
+    @property
+    def complete(self) -> bool:
+        return self.reverse.result != 'pending'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pair': self.pair,
+            'level': self.level,
+            'timestamp': self.timestamp,
+            'original': f"{self.original.direction} @ {self.original.entry}: {self.original.pips}",
+            'reverse': f"{self.reverse.direction} @ {self.reverse.entry}: {self.reverse.pips}",
+            'result': self.reverse.result,
+            'pips': round(self.pips, 1),
+        }
+
+
+class FlipLevel:
+    """Break / close-beyond / hold state of one flip level."""
+
+    def __init__(self, level: float, tolerance: float, hold_bars: int):
+        self.level = level
+        self.tolerance = tolerance
+        self.hold_bars = hold_bars
+        self.side = 0           # +1 price above the level, -1 below, 0 unknown yet
+        self.state = IDLE
+        self.count = 0          # bars spent in the current state
+
+    def update(self, high: float, low: float, close: float) -> Optional[str]:
+        """
+        Advance by one bar; returns 'break', 'beyond', 'flip' or 'reject'
+        when the state changes.
+        """
+        if self.side == 0:
+            if abs(close - self.level) > self.tolerance:
+                self.side = 1 if close > self.level else -1
+            return None
+
+        # Work in break-direction units: d = +1 breaking up through a level above price
+        d = -self.side
+        far = d * (self.level + d * self.tolerance)     # beyond the zone
+        near = d * (self.level - d * self.tolerance)    # back through the zone
+        extreme = d * (high if d > 0 else low)
+        close = d * close
+
+        if self.state == IDLE:
+            if extreme <= far:
+                return None
+            self.state, self.count = BROKEN, 0
+            if close <= far:
+                return 'break'
+
+        if self.state == BROKEN:
+            if close > far:
+                self.state, self.count = BEYOND, 0
+                return 'beyond'
+            self.count += 1
+            if close < near or self.count >= self.hold_bars:
+                return self._reset()
+            return None
+
+        # BEYOND: each close not back through the zone holds the break
+        if close < near:
+            return self._reset()
+        self.count += 1
+        if self.count >= self.hold_bars:
+            self.side, self.state, self.count = d, IDLE, 0
+            return 'flip'
+        return None
+
+    def _reset(self) -> str:
+        self.state, self.count = IDLE, 0
+        return 'reject'
+
+
+class FlipEngine:
+    """
+    Args:
+        felix: strategy providing flip_levels and SL/TP rules
+        hold_bars: closes beyond (or inside) the zone that confirm a break
+        reverse_all: reverse every opposing position on the pair, not only
+            those entered inside the flip zone
+    """
+
+    def __init__(self, felix: FelixStrategy = None, hold_bars: int = 2, reverse_all: bool = False):
+        self.felix = felix or FelixStrategy()
+        self.hold_bars = hold_bars
+        self.reverse_all = reverse_all
+        self.levels: Dict[str, FlipLevel] = {
+            pair: FlipLevel(info['level'], info['tolerance'], hold_bars)
+            for pair, info in self.felix.flip_levels.items()
+        }
+        self.monitor = PositionMonitor(self.felix)
+        self.chains: List[FlipChain] = []
+
+    def open(self, trade) -> int:
+        """Track a trade (opened at its entry) and return its position number."""
+        return self.monitor.open(trade)
+
+    def on_bar(self, pair: str, timestamp, open_: float, high: float, low: float,
+               close: float) -> List[Tuple[int, str, int, float]]:
+        """
+        Process one closed bar: position triggers, then the flip level.
+        Returns (timestamp, event, position number, price) events; level
+        events use position number -1.
+        """
+        now = to_epoch(timestamp)
+        events = []
+        path = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        for price in path:
+            events += self.monitor.on_tick(pair, price, now)
+
+        flip = self.levels.get(pair)
+        if flip is None:
+            return events
+        event = flip.update(high, low, close)
+        if event is not None:
+            events.append((now, event, -1, flip.level))
+        if event == 'flip':
+            events += self._reverse(pair, flip, now, close)
+        return events
+
+    def _reverse(self, pair: str, flip: FlipLevel, now: int, close: float):
+        """Close positions against the break and open the reverse trades."""
+        direction = 'Buy' if flip.side > 0 else 'Sell'
+        events = []
+        for number, position in list(self.monitor.positions.items()):
+            trade = position.trade
+            if trade.pair != pair or trade.direction == direction:
+                continue
+            if not self.reverse_all and abs(trade.entry - flip.level) > flip.tolerance:
+                continue
+            events.append(self.monitor.close(number, close, now))
+            reverse = Trade(pair, direction, entry=close,
+                            market_condition=getattr(trade, 'market_condition', 'unknown'),
+                            timestamp=now, strategy='flip')
+            events.append((now, 'reverse', self.open(reverse), close))
+            self.chains.append(FlipChain(pair, flip.level, now, trade, reverse))
+        return events
+
+    def replay(self, bars: PriceBars, trades: List) -> List[Tuple[int, str, int, float]]:
+        """Backtest one pair: open each trade at its timestamp and feed every bar."""
+        pending = sorted((t for t in trades if t.pair == bars.pair and t.entry is not None),
+                         key=lambda t: to_epoch(getattr(t, 'timestamp', None)))
+        events = []
+        k = 0
+        for ts, o, h, l, c in zip(bars.timestamp.tolist(), bars.open.tolist(), bars.high.tolist(),
+                                  bars.low.tolist(), bars.close.tolist()):
+            while k < len(pending) and to_epoch(getattr(pending[k], 'timestamp', None)) <= ts:
+                self.open(pending[k])
+                k += 1
+            events += self.on_bar(bars.pair, ts, o, h, l, c)
+        return events
+
+    def summary(self) -> Dict[str, Any]:
+        """Flip counts and chained pips."""
+        complete = [chain for chain in self.chains if chain.complete]
+        return {
+            'flips': len(self.chains),
+            'complete': len(complete),
+            'original_pips': round(sum(c.original.pips or 0 for c in complete), 1),
+            'reverse_pips': round(sum(c.reverse.pips or 0 for c in complete), 1),
+            'chained_pips': round(sum(c.pips for c in complete), 1),
+            'reverse_wins': sum(c.reverse.result == 'win' for c in complete),
+        }
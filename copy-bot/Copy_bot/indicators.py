@@ -0,0 +1,194 @@
+"""
+Indicators Module - Incremental ATR, EMA and swing-point cache.
+
+IndicatorCache keeps one IndicatorState per (pair, timeframe). Each
+closed bar updates the state in O(1):
+
+- ATR(14) with Wilder smoothing (seeded with the mean of the first 14
+  true ranges) and the average ATR over the last ``avg_atr_window`` bars
+- EMAs for the configured periods (seeded with the SMA of the first
+  ``period`` closes)
+- Swing highs/lows: a bar whose high (low) is above (below) the
+  ``swing_strength`` bars on each side; confirmed ``swing_strength`` bars
+  later
+
+All history lives in fixed-size ring buffers, so memory per pair and
+timeframe is constant however long the stream runs. Reads are plain
+attribute lookups; FelixStrategy.use_indicators sizes stops from them.
+
+Usage:
+    cache = IndicatorCache()
+    cache.update('XAUUSD', 'H1', ts, o, h, l, c)
+    state = cache.get('XAUUSD', 'H1')
+    state.atr, state.avg_atr, state.ema[50], state.last_swing_high
+"""
+
+import math
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from price_bars import PriceBars
+from ring_buffer import RingBuffer
+
+
+class IndicatorState:
+    """Indicators of one pair and timeframe."""
+
+    def __init__(self, atr_period: int, ema_periods: Tuple[int, ...], swing_strength: int,
+                 swing_history: int, avg_atr_window: int):
+        self.atr_period = atr_period
+        self.swing_strength = swing_strength
+        self.bars = 0
+        self.timestamp = 0
+        self.close = math.nan
+
+        # ATR (Wilder) and its rolling average
+        self.atr = math.nan
+        self._tr_sum = 0.0
+        self._atr_history = RingBuffer(avg_atr_window)
+        self._atr_sum = 0.0
+        self.avg_atr = math.nan
+
+        # EMAs
+        self.ema: Dict[int, float] = {period: math.nan for period in ema_periods}
+        self._ema_seed: Dict[int, float] = {period: 0.0 for period in ema_periods}
+
+        # Swing points: the last 2 * strength + 1 bars, and confirmed swings
+        window = 2 * swing_strength + 1
+        self._middle = -swing_strength - 1
+        self._sides = [i for i in range(-window, 0) if i != self._middle]
+        self._highs = RingBuffer(window)
+        self._lows = RingBuffer(window)
+        self._stamps = RingBuffer(window, dtype=np.int64)
+        self._swing_highs = RingBuffer(swing_history)
+        self._swing_high_times = RingBuffer(swing_history, dtype=np.int64)
+        self._swing_lows = RingBuffer(swing_history)
+        self._swing_low_times = RingBuffer(swing_history, dtype=np.int64)
+
+    def update(self, timestamp: int, high: float, low: float, close: float):
+        """Add one closed bar."""
+        prev_close = self.close
+        self.bars += 1
+        self.timestamp = timestamp
+        self.close = close
+
+        # True range and ATR
+        if math.isnan(prev_close):
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        n = self.atr_period
+        if self.bars < n:
+            self._tr_sum += tr
+        elif self.bars == n:
+            self.atr = (self._tr_sum + tr) / n
+        else:
+            self.atr = (self.atr * (n - 1) + tr) / n
+        if not math.isnan(self.atr):
+            history = self._atr_history
+            if history.full:
+                self._atr_sum -= history[0]
+            history.append(self.atr)
+            self._atr_sum += self.atr
+            self.avg_atr = self._atr_sum / len(history)
+
+        # EMAs
+        for period, value in self.ema.items():
+            if self.bars < period:
+                self._ema_seed[period] += close
+            elif self.bars == period:
+                self.ema[period] = (self._ema_seed[period] + close) / period
+            else:
+                alpha = 2.0 / (period + 1)
+                self.ema[period] = value + alpha * (close - value)
+
+        # Swing points: test the middle bar of the window
+        self._highs.append(high)
+        self._lows.append(low)
+        self._stamps.append(timestamp)
+        if self._highs.full:
+            highs, lows, middle = self._highs, self._lows, self._middle
+            middle_high, middle_low = highs[middle], lows[middle]
+            if all(middle_high > highs[i] for i in self._sides):
+                self._swing_highs.append(middle_high)
+                self._swing_high_times.append(self._stamps[middle])
+            if all(middle_low < lows[i] for i in self._sides):
+                self._swing_lows.append(middle_low)
+                self._swing_low_times.append(self._stamps[middle])
+
+    @property
+    def ready(self) -> bool:
+        """ATR is available."""
+        return not math.isnan(self.atr)
+
+    @property
+    def last_swing_high(self) -> Optional[float]:
+        return float(self._swing_highs[-1]) if len(self._swing_highs) else None
+
+    @property
+    def last_swing_low(self) -> Optional[float]:
+        return float(self._swing_lows[-1]) if len(self._swing_lows) else None
+
+    def swing_highs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, prices) of the held swing highs, oldest first."""
+        return self._swing_high_times.to_array(), self._swing_highs.to_array()
+
+    def swing_lows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, prices) of the held swing lows, oldest first."""
+        return self._swing_low_times.to_array(), self._swing_lows.to_array()
+
+
+class IndicatorCache:
+    """
+    IndicatorState per (pair, timeframe), created on the first bar.
+
+    Args:
+        atr_period: ATR length (Wilder)
+        ema_periods: EMA lengths to maintain
+        swing_strength: bars on each side of a swing point
+        swing_history: swing highs/lows kept per state
+        avg_atr_window: bars in the average ATR
+    """
+
+    def __init__(self, atr_period: int = 14, ema_periods: Tuple[int, ...] = (20, 50, 200),
+                 swing_strength: int = 2, swing_history: int = 20, avg_atr_window: int = 100):
+        if swing_strength < 1:
+            raise ValueError(f"Swing strength must be at least 1, got {swing_strength}")
+        self.atr_period = atr_period
+        self.ema_periods = tuple(ema_periods)
+        self.swing_strength = swing_strength
+        self.swing_history = swing_history
+        self.avg_atr_window = avg_atr_window
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+
+    def state(self, pair: str, timeframe: str) -> IndicatorState:
+        """State for (pair, timeframe), created empty if missing."""
+        key = (pair, timeframe)
+        state = self._states.get(key)
+        if state is None:
+            state = IndicatorState(self.atr_period, self.ema_periods, self.swing_strength,
+                                   self.swing_history, self.avg_atr_window)
+            self._states[key] = state
+        return state
+
+    def update(self, pair: str, timeframe: str, timestamp: int, open_: float,
+               high: float, low: float, close: float) -> IndicatorState:
+        """Add one closed bar and return the updated state."""
+        state = self.state(pair, timeframe)
+        state.update(timestamp, high, low, close)
+        return state
+
+    def update_bars(self, bars: PriceBars, timeframe: str) -> IndicatorState:
+        """Feed a whole series (e.g. history before going live)."""
+        state = self.state(bars.pair, timeframe)
+        for ts, high, low, close in zip(bars.timestamp.tolist(), bars.high.tolist(),
+                                        bars.low.tolist(), bars.close.tolist()):
+            state.update(ts, high, low, close)
+        return state
+
+    def get(self, pair: str, timeframe: str) -> Optional[IndicatorState]:
+        return self._states.get((pair, timeframe))
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._states)
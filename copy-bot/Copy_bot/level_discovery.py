@@ -0,0 +1,246 @@
+"""
+Level Discovery Module - Key levels found in price history.
+
+Finds the level types of FELIX_STRATEGY_V2.md in a pair's bars instead of
+reading them off trade analyses by hand:
+
+- Technical: swing highs/lows of hourly candles (a high/low beyond the
+  ``swing_strength`` candles on each side)
+- Historical: previous day and week highs/lows
+- Psychological: round numbers every ``round_pips`` pips inside the range
+
+Candidates are sorted and swept into clusters at most ``cluster_pips``
+wide (a cluster starts at the lowest unassigned price; unlike splitting on
+gaps, dense history cannot chain into one huge cluster). Each
+cluster becomes one level at the weighted mean of its members, scored by
+its members' weights. Levels above the last close are Sell (resistance),
+below are Buy (support); confidence is the score relative to the pair's
+best level.
+
+Everything is NumPy over whole columns: minute bars are reduced to hourly
+and daily candles with ``reduceat``, so months of M1 history from a
+memory-mapped PriceStore take well under a second per pair.
+
+Usage:
+    discovery = LevelDiscovery()
+    key_levels = discovery.discover_store(PriceStore('data/prices'), start='2026-01-01')
+    print(to_yaml(key_levels))
+
+    python level_discovery.py data/prices --start 2026-01-01 > levels.yaml
+"""
+
+import argparse
+import math
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+import yaml
+from numpy.lib.stride_tricks import sliding_window_view
+
+from pair_registry import PairRegistry, default_registry
+from price_bars import PriceBars
+from price_store import PriceStore, SECONDS_PER_DAY
+
+
+SECONDS_PER_HOUR = 3600
+
+# Candidate sources and their weight in a cluster's score
+SOURCE_WEIGHTS = {
+    'swing': 1.0,
+    'day': 1.0,
+    'week': 2.0,
+    'round': 1.0,
+}
+
+
+@dataclass
+class Level:
+    """A discovered level (one cluster of candidates)."""
+    level: float
+    direction: str
+    score: float
+    confidence: float
+    sources: Dict[str, int]
+
+    def to_dict(self, decimals: int) -> Dict[str, Any]:
+        """config.yaml key_levels entry."""
+        note = ', '.join(f'{count} {source}' for source, count in self.sources.items())
+        return {
+            'level': round(self.level, decimals),
+            'direction': self.direction,
+            'confidence': self.confidence,
+            'note': f'auto: {note}',
+            'type': 'resistance' if self.direction == 'Sell' else 'support',
+        }
+
+
+def resample(bars: PriceBars, seconds: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(period start, high, low) of ``seconds``-long candles."""
+    if not len(bars):
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty, empty
+    period = np.asarray(bars.timestamp) // seconds
+    starts = np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+    return (period[starts] * seconds,
+            np.maximum.reduceat(np.asarray(bars.high), starts),
+            np.minimum.reduceat(np.asarray(bars.low), starts))
+
+
+def swing_points(high: np.ndarray, low: np.ndarray, strength: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices of swing highs and swing lows (strictly beyond ``strength`` candles each side)."""
+    if strength < 1:
+        raise ValueError(f"Swing strength must be at least 1, got {strength}")
+    k = strength
+    if len(high) < 2 * k + 1:
+        return np.zeros(0), np.zeros(0)
+    highs = sliding_window_view(high, 2 * k + 1)
+    lows = sliding_window_view(low, 2 * k + 1)
+    mid_high, mid_low = highs[:, k], lows[:, k]
+    is_high = (mid_high > highs[:, :k].max(axis=1)) & (mid_high > highs[:, k + 1:].max(axis=1))
+    is_low = (mid_low < lows[:, :k].min(axis=1)) & (mid_low < lows[:, k + 1:].min(axis=1))
+    return mid_high[is_high], mid_low[is_low]
+
+
+def round_numbers(low: float, high: float, step: float) -> np.ndarray:
+    """Multiples of ``step`` between ``low`` and ``high``."""
+    first, last = math.ceil(low / step), math.floor(high / step)
+    return np.arange(first, last + 1) * step
+
+
+def cluster(prices: np.ndarray, width: float) -> np.ndarray:
+    """
+    Cluster label per price (prices must be sorted). Each cluster takes
+    every price within ``width`` of its lowest one; one binary search per
+    cluster, not per price.
+    """
+    labels = np.empty(len(prices), dtype=np.int64)
+    start, label = 0, 0
+    while start < len(prices):
+        end = int(np.searchsorted(prices, prices[start] + width, side='right'))
+        labels[start:end] = label
+        start, label = end, label + 1
+    return labels
+
+
+class LevelDiscovery:
+    """
+    Args:
+        swing_strength: hourly candles on each side of a swing point
+        round_pips: spacing of psychological round numbers
+        cluster_pips: widest cluster (pips)
+        min_score: weakest cluster kept (a lone round number scores 1)
+        max_levels: most levels kept per pair (highest scores)
+        registry: pair registry for pip sizes
+    """
+
+    def __init__(self, swing_strength: int = 3, round_pips: float = 100,
+                 cluster_pips: float = 10, min_score: float = 3, max_levels: int = 8,
+                 registry: Optional[PairRegistry] = None):
+        self.swing_strength = swing_strength
+        self.round_pips = round_pips
+        self.cluster_pips = cluster_pips
+        self.min_score = min_score
+        self.max_levels = max_levels
+        self.registry = registry or default_registry()
+
+    def candidates(self, bars: PriceBars) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, source codes) of every candidate level, unsorted."""
+        pip = self.registry.pip_size(bars.pair)
+        sources = list(SOURCE_WEIGHTS)
+        parts = []
+
+        _, hour_high, hour_low = resample(bars, SECONDS_PER_HOUR)
+        swing_high, swing_low = swing_points(hour_high, hour_low, self.swing_strength)
+        parts += [(swing_high, 'swing'), (swing_low, 'swing')]
+
+        # Previous day / week: every completed period in the window
+        _, day_high, day_low = resample(bars, SECONDS_PER_DAY)
+        parts += [(day_high[:-1], 'day'), (day_low[:-1], 'day')]
+        # Epoch day 0 is a Thursday; shift so weeks start on Monday
+        shifted = PriceBars(bars.pair, np.asarray(bars.timestamp) + 3 * SECONDS_PER_DAY,
+                            bars.open, bars.high, bars.low, bars.close)
+        _, week_high, week_low = resample(shifted, 7 * SECONDS_PER_DAY)
+        parts += [(week_high[:-1], 'week'), (week_low[:-1], 'week')]
+
+        if len(hour_high):
+            parts.append((round_numbers(hour_low.min(), hour_high.max(), self.round_pips * pip), 'round'))
+
+        prices = np.concatenate([p for p, _ in parts])
+        codes = np.concatenate([np.full(len(p), sources.index(s)) for p, s in parts])
+        return prices, codes
+
+    def discover(self, bars: PriceBars) -> List[Level]:
+        """Levels of one pair, sorted by price."""
+        if not len(bars):
+            return []
+        prices, codes = self.candidates(bars)
+        order = np.argsort(prices, kind='stable')
+        prices, codes = prices[order], codes[order]
+        weights = np.array(list(SOURCE_WEIGHTS.values()))[codes]
+
+        labels = cluster(prices, self.cluster_pips * self.registry.pip_size(bars.pair))
+        n = int(labels[-1]) + 1 if len(labels) else 0
+        score = np.bincount(labels, weights, minlength=n)
+        center = np.bincount(labels, weights * prices, minlength=n) / np.maximum(score, 1e-12)
+        counts = np.zeros((n, len(SOURCE_WEIGHTS)), dtype=np.int64)
+        np.add.at(counts, (labels, codes), 1)
+
+        keep = np.flatnonzero(score >= self.min_score)
+        keep = keep[np.argsort(-score[keep], kind='stable')][:self.max_levels]
+        if not len(keep):
+            return []
+        best = float(score[keep].max())
+        last_close = float(bars.close[-1])
+        levels = []
+        for c in sorted(keep, key=lambda c: center[c]):
+            levels.append(Level(
+                level=float(center[c]),
+                direction='Sell' if center[c] > last_close else 'Buy',
+                score=float(score[c]),
+                confidence=round(0.2 + 0.8 * float(score[c]) / best, 1),
+                sources={source: int(counts[c, s])
+                         for s, source in enumerate(SOURCE_WEIGHTS) if counts[c, s]},
+            ))
+        return levels
+
+    def decimals(self, pair: str) -> int:
+        """Price decimals for a pair (one more than its pip)."""
+        return max(0, round(-math.log10(self.registry.pip_size(pair)))) + 1
+
+    def key_levels(self, bars: Dict[str, PriceBars]) -> Dict[str, List[Dict[str, Any]]]:
+        """config.yaml ``key_levels`` mapping for every pair."""
+        result = {}
+        for pair, series in bars.items():
+            levels = self.discover(series)
+            if levels:
+                result[pair] = [level.to_dict(self.decimals(pair)) for level in levels]
+        return result
+
+    def discover_store(self, store: PriceStore, pairs: List[str] = None,
+                       start=None, end=None) -> Dict[str, List[Dict[str, Any]]]:
+        """``key_levels`` from a PriceStore's memory-mapped history."""
+        return self.key_levels({pair: store.window(pair, start, end)
+                                for pair in (pairs or store.pairs())})
+
+
+def to_yaml(key_levels: Dict[str, List[Dict[str, Any]]]) -> str:
+    """A ``key_levels:`` block to paste into config.yaml."""
+    return yaml.safe_dump({'key_levels': key_levels}, sort_keys=False, default_flow_style=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Discover key levels from price history')
+    parser.add_argument('prices', help='PriceStore directory')
+    parser.add_argument('--pairs', nargs='*', help='pairs (default: all in the store)')
+    parser.add_argument('--start', help='first date (UTC), e.g. 2026-01-01')
+    parser.add_argument('--end', help='end date (exclusive)')
+    parser.add_argument('--max-levels', type=int, default=8)
+    args = parser.parse_args()
+
+    discovery = LevelDiscovery(max_levels=args.max_levels)
+    print(to_yaml(discovery.discover_store(PriceStore(args.prices), args.pairs, args.start, args.end)))
+
+
+if __name__ == "__main__":
+    main()
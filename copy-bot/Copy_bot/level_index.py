@@ -0,0 +1,118 @@
+"""
+Level Index Module - Sorted per-pair key level lookup.
+
+Answers "which key levels are within tolerance of this price" with a
+binary search over the pair's sorted levels instead of scanning every
+level dict, so lookups stay O(log n + k) as the level database grows.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Callable, Any
+
+import numpy as np
+
+
+class PairLevels:
+    """Sorted level arrays for a single pair."""
+
+    def __init__(self, pair: str, levels: List[Dict[str, Any]],
+                 tolerance_fn: Callable[[str, float], float]):
+        ordered = sorted(levels, key=lambda info: info['level'])
+        self.pair = pair
+        self.levels = ordered
+        self.prices = np.array([info['level'] for info in ordered], dtype=np.float64)
+        self.tolerances = np.array([tolerance_fn(pair, info['level']) for info in ordered],
+                                   dtype=np.float64)
+        self.directions = [info['direction'] for info in ordered]
+        self.direction_array = np.array(self.directions, dtype=str)
+        self.confidence = np.array([info['confidence'] for info in ordered], dtype=np.float64)
+        self.scores = np.array([info['confidence'] * _win_rate(info) for info in ordered],
+                               dtype=np.float64)
+        # Python lists for the scalar path (bisect is cheaper than a NumPy call)
+        self._price_list = self.prices.tolist()
+        self._tol_list = self.tolerances.tolist()
+        self._score_list = self.scores.tolist()
+        self.max_tolerance = float(self.tolerances.max()) if len(ordered) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def within(self, price: float) -> List[int]:
+        """Positions of levels with ``abs(price - level) <= tolerance``."""
+        # Widen the search window slightly so float rounding in the bounds
+        # never drops a level; the exact check below decides membership.
+        window = self.max_tolerance + 1e-9 * (abs(price) + self.max_tolerance)
+        lo = bisect_left(self._price_list, price - window)
+        hi = bisect_right(self._price_list, price + window)
+        prices = self._price_list
+        tols = self._tol_list
+        return [i for i in range(lo, hi) if abs(price - prices[i]) <= tols[i]]
+
+    def candidates(self, prices: np.ndarray):
+        """
+        Vectorized ``within`` for an array of prices.
+
+        Yields ``(positions, hit)`` once per candidate slot: ``positions``
+        indexes the level arrays and ``hit`` marks prices whose level at
+        that position is within tolerance. Loops over the widest candidate
+        window (a handful of levels), never over the prices.
+        """
+        if not len(self.levels):
+            return
+        window = self.max_tolerance + 1e-9 * (np.abs(prices) + self.max_tolerance)
+        lo = np.searchsorted(self.prices, prices - window, side='left')
+        hi = np.searchsorted(self.prices, prices + window, side='right')
+        width = int((hi - lo).max()) if len(prices) else 0
+        last = len(self.levels) - 1
+        for offset in range(width):
+            positions = np.minimum(lo + offset, last)
+            hit = (lo + offset < hi) & (np.abs(prices - self.prices[positions]) <= self.tolerances[positions])
+            yield positions, hit
+
+    def score(self, i: int) -> float:
+        """Level confidence weighted by its historical win rate."""
+        return self._score_list[i]
+
+    def refresh(self, i: int):
+        """Recompute the cached score of level ``i`` after its record changed."""
+        info = self.levels[i]
+        self.confidence[i] = info['confidence']
+        self.scores[i] = self._score_list[i] = info['confidence'] * _win_rate(info)
+
+
+def _win_rate(info: Dict[str, Any]) -> float:
+    """Historical win rate of a level (1.0 when no record is kept)."""
+    if 'wins' not in info and 'losses' not in info:
+        return 1.0
+    wins = info.get('wins', 0)
+    total = wins + info.get('losses', 0)
+    return wins / total if total else 0.0
+
+
+class LevelIndex:
+    """
+    Per-pair sorted index over a ``{pair: [level dicts]}`` mapping.
+
+    ``tolerance_fn(pair, level)`` gives the entry tolerance for each level.
+    The index is a snapshot; rebuild it after changing the level mapping.
+    """
+
+    def __init__(self, key_levels: Dict[str, List[Dict[str, Any]]],
+                 tolerance_fn: Callable[[str, float], float]):
+        self.pairs: Dict[str, PairLevels] = {
+            pair: PairLevels(pair, levels, tolerance_fn)
+            for pair, levels in key_levels.items()
+        }
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self.pairs
+
+    def get(self, pair: str) -> 'PairLevels':
+        return self.pairs.get(pair)
+
+    def within(self, pair: str, price: float) -> List[Dict[str, Any]]:
+        """Level dicts for ``pair`` within tolerance of ``price``."""
+        levels = self.pairs.get(pair)
+        if levels is None:
+            return []
+        return [levels.levels[i] for i in levels.within(price)]
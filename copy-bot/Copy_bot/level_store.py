@@ -0,0 +1,205 @@
+"""
+Level Store Module - Key levels that learn from resolved trades.
+
+LevelStore holds the same ``{pair: [level dicts]}`` data as config.yaml
+``key_levels`` and answers the LevelIndex queries (``get``, ``within``),
+so FelixStrategy can use it in place of the static index. As trades
+resolve, ``record`` finds the matching level with a binary search and
+updates its wins/losses, its cached win rate and its score in place;
+confidence lookups stay O(log n) however large the database grows.
+
+Levels carry ``created`` and ``last_seen`` epoch times. Following the
+level lifespan idea in FELIX_STRATEGY_V2.md (strong levels stay active
+for a few days), ``expire`` drops levels not touched by a trade for
+``lifespan_days``. Levels without a timestamp (e.g. seeded from config)
+never expire until a trade touches them.
+
+The store persists to a compressed ``.npz`` file of column arrays.
+
+Usage:
+    store = LevelStore.from_config(config)
+    felix.use_level_store(store)
+    store.record(trade)              # after the trade resolves
+    store.expire(now)
+    store.save('levels.npz')
+"""
+
+import os
+from typing import List, Dict, Optional, Callable, Any
+
+import numpy as np
+
+from level_index import PairLevels
+from pair_registry import PairRegistry, default_registry
+from price_store import SECONDS_PER_DAY
+from trade import PENDING, WIN, LOSS, result_code
+from trade_book import to_epoch
+
+
+class LevelStore:
+    """
+    Mutable, LevelIndex-compatible key level database.
+
+    Args:
+        key_levels: initial ``{pair: [level dicts]}`` (copied)
+        tolerance_fn: ``(pair, level) -> tolerance``; defaults to the
+            registry's per-pair tolerance
+        lifespan_days: days without a trade before a level expires
+        registry: pair registry for the default tolerance
+    """
+
+    def __init__(self, key_levels: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 tolerance_fn: Optional[Callable[[str, float], float]] = None,
+                 lifespan_days: float = 7, registry: Optional[PairRegistry] = None):
+        registry = registry or default_registry()
+        self.tolerance_fn = tolerance_fn or (lambda pair, level: registry.tolerance(pair))
+        self.lifespan_days = lifespan_days
+        self.key_levels: Dict[str, List[Dict[str, Any]]] = {}
+        self._pairs: Dict[str, PairLevels] = {}
+        for pair, levels in (key_levels or {}).items():
+            self.key_levels[pair] = [
+                {'created': 0, 'last_seen': 0, **info} for info in levels
+            ]
+
+    @classmethod
+    def from_config(cls, config, lifespan_days: float = 7) -> 'LevelStore':
+        """Seed the store with a StrategyConfig's key levels."""
+        registry = config.registry
+        return cls(config.key_levels, lambda pair, level: registry.tolerance(pair),
+                   lifespan_days, registry)
+
+    # LevelIndex API
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self.key_levels
+
+    def __len__(self) -> int:
+        return sum(len(levels) for levels in self.key_levels.values())
+
+    def get(self, pair: str) -> Optional[PairLevels]:
+        """Sorted levels of ``pair``, rebuilt only after levels were added or removed."""
+        levels = self._pairs.get(pair)
+        if levels is None and pair in self.key_levels:
+            levels = PairLevels(pair, self.key_levels[pair], self.tolerance_fn)
+            self._pairs[pair] = levels
+        return levels
+
+    def within(self, pair: str, price: float) -> List[Dict[str, Any]]:
+        """Level dicts for ``pair`` within tolerance of ``price``."""
+        levels = self.get(pair)
+        if levels is None:
+            return []
+        return [levels.levels[i] for i in levels.within(price)]
+
+    # Updates
+
+    def add(self, pair: str, level: float, direction: str, confidence: float = 0.5,
+            timestamp=None) -> Dict[str, Any]:
+        """Add a new level (the pair's sorted arrays are rebuilt on next use)."""
+        now = to_epoch(timestamp)
+        info = {'level': level, 'direction': direction, 'confidence': confidence,
+                'created': now, 'last_seen': now}
+        self.key_levels.setdefault(pair, []).append(info)
+        self._pairs.pop(pair, None)
+        return info
+
+    def find(self, pair: str, price: float, direction: str) -> Optional[int]:
+        """Position of the nearest level in ``direction`` within tolerance of ``price``."""
+        levels = self.get(pair)
+        if levels is None:
+            return None
+        hits = [i for i in levels.within(price) if levels.directions[i] == direction]
+        if not hits:
+            return None
+        return min(hits, key=lambda i: abs(price - levels.prices[i]))
+
+    def record(self, trade, learn: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Count a resolved trade against the level it was taken at and
+        return that level. With ``learn`` a trade at no known level
+        starts a new one. Pending trades are ignored.
+        """
+        code = result_code(trade.result)
+        if code == PENDING or trade.entry is None:
+            return None
+        now = to_epoch(getattr(trade, 'timestamp', None))
+        i = self.find(trade.pair, trade.entry, trade.direction)
+        if i is None:
+            if not learn:
+                return None
+            self.add(trade.pair, trade.entry, trade.direction, timestamp=now)
+            i = self.find(trade.pair, trade.entry, trade.direction)
+
+        levels = self._pairs[trade.pair]
+        info = levels.levels[i]
+        if code == WIN:
+            info['wins'] = info.get('wins', 0) + 1
+        elif code == LOSS:
+            info['losses'] = info.get('losses', 0) + 1
+        info['last_seen'] = max(info['last_seen'], now)
+        levels.refresh(i)
+        return info
+
+    def record_all(self, trades: List, learn: bool = False) -> int:
+        """Record trades in time order; returns how many matched a level."""
+        ordered = sorted(trades, key=lambda t: to_epoch(getattr(t, 'timestamp', None)))
+        return sum(self.record(trade, learn) is not None for trade in ordered)
+
+    def expire(self, now) -> int:
+        """Drop levels not traded for ``lifespan_days``; returns how many."""
+        cutoff = to_epoch(now) - self.lifespan_days * SECONDS_PER_DAY
+        removed = 0
+        for pair, levels in self.key_levels.items():
+            keep = [info for info in levels if not 0 < info['last_seen'] < cutoff]
+            if len(keep) != len(levels):
+                removed += len(levels) - len(keep)
+                self.key_levels[pair] = keep
+                self._pairs.pop(pair, None)
+        return removed
+
+    # Persistence
+
+    def save(self, path: str):
+        """Write all levels as compressed column arrays (atomic replace)."""
+        rows = [(pair, info) for pair, levels in self.key_levels.items() for info in levels]
+        columns = {
+            'pair': np.array([pair for pair, _ in rows], dtype=str),
+            'direction': np.array([info['direction'] for _, info in rows], dtype=str),
+            'level': np.array([info['level'] for _, info in rows], dtype=np.float64),
+            'confidence': np.array([info['confidence'] for _, info in rows], dtype=np.float64),
+            'wins': np.array([info.get('wins', -1) for _, info in rows], dtype=np.int32),
+            'losses': np.array([info.get('losses', -1) for _, info in rows], dtype=np.int32),
+            'created': np.array([info['created'] for _, info in rows], dtype=np.int64),
+            'last_seen': np.array([info['last_seen'] for _, info in rows], dtype=np.int64),
+            'type': np.array([info.get('type', '') for _, info in rows], dtype=str),
+            'note': np.array([info.get('note', '') for _, info in rows], dtype=str),
+            'lifespan_days': np.array(self.lifespan_days, dtype=np.float64),
+        }
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, tolerance_fn: Optional[Callable[[str, float], float]] = None,
+             registry: Optional[PairRegistry] = None) -> 'LevelStore':
+        """Read a store written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files}
+        key_levels: Dict[str, List[Dict[str, Any]]] = {}
+        for k, pair in enumerate(columns['pair'].tolist()):
+            info = {
+                'level': float(columns['level'][k]),
+                'direction': str(columns['direction'][k]),
+                'confidence': float(columns['confidence'][k]),
+                'created': int(columns['created'][k]),
+                'last_seen': int(columns['last_seen'][k]),
+            }
+            for name in ('wins', 'losses'):
+                if columns[name][k] >= 0:  # -1: no record kept
+                    info[name] = int(columns[name][k])
+            for name in ('type', 'note'):
+                if columns[name][k]:
+                    info[name] = str(columns[name][k])
+            key_levels.setdefault(pair, []).append(info)
+        return cls(key_levels, tolerance_fn, float(columns['lifespan_days']), registry)
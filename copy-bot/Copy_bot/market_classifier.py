@@ -0,0 +1,241 @@
+"""
+Market Classifier Module - Trending / mixed / choppy labels from price bars.
+
+Implements the scoring classifier from FELIX_STRATEGY_V2.md on 1H OHLC
+bars. 4H and D1 candles are rolling windows of the last 4 and 24 bars
+ending at the current bar, so a label only ever uses data up to that
+bar's close (no lookahead):
+
+1. Candlesticks: strong 4H engulfing -> trending +3; D1 shooting star or
+   1H evening star -> choppy +3; small 4H body (doji) -> choppy +2
+2. Timeframe alignment (close vs ``trend_periods`` candles ago on each
+   timeframe): D1, 4H and 1H agree -> trending +3; D1 against 4H ->
+   choppy +3; otherwise mixed +2
+3. Level behaviour against the previous day's high/low: last 4 closes
+   beyond it -> trending +3; poked through and closed back inside ->
+   choppy +3; tested (within 10% of the range) -> mixed +2
+4. Recent TP3 rate (optional, from trade results): > 0.6 -> trending +2,
+   < 0.2 -> choppy +2, otherwise mixed +1
+
+The highest score wins (ties: trending, mixed, choppy); with no evidence
+at all the label is mixed. Bars before enough history exists are
+'unknown'. Labels are trade.CONDITIONS codes.
+
+``classify`` labels a whole series with NumPy; ``IncrementalClassifier``
+gives the same labels bar by bar with O(1) work per bar (ring buffers
+and rolling extremes).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from price_bars import PriceBars
+from ring_buffer import RingBuffer, RollingMax, RollingMin
+from trade import CONDITIONS
+
+
+UNKNOWN = CONDITIONS.code('unknown')
+TRENDING = CONDITIONS.code('trending')
+MIXED = CONDITIONS.code('mixed')
+CHOPPY = CONDITIONS.code('choppy')
+
+H4 = 4      # 1H bars per 4H candle
+D1 = 24     # 1H bars per D1 candle
+
+
+def _body_ratio(o, h, l, c):
+    """|close - open| / range (0 for a flat candle)."""
+    rng = h - l
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(rng > 0, np.abs(c - o) / rng, 0.0)
+
+
+def _scores(f: Dict[str, np.ndarray], tp3_rate) -> np.ndarray:
+    """(3, n) trending/mixed/choppy scores from the bar features."""
+    c = f['c']
+    trending = np.zeros(len(c))
+    mixed = np.zeros(len(c))
+    choppy = np.zeros(len(c))
+
+    with np.errstate(invalid='ignore'):
+        # 1. Candlestick patterns
+        ratio4 = _body_ratio(f['o4'], f['h4'], f['l4'], c)
+        dir4 = np.sign(c - f['o4'])
+        prev_dir4 = np.sign(f['pc4'] - f['po4'])
+        engulfing = ((dir4 != 0) & (dir4 == -prev_dir4)
+                     & (np.maximum(f['o4'], c) >= np.maximum(f['po4'], f['pc4']))
+                     & (np.minimum(f['o4'], c) <= np.minimum(f['po4'], f['pc4']))
+                     & (ratio4 >= 0.6))
+        trending += 3 * engulfing
+
+        body24 = np.abs(c - f['o24'])
+        upper24 = f['h24'] - np.maximum(f['o24'], c)
+        lower24 = np.minimum(f['o24'], c) - f['l24']
+        shooting_star = (upper24 > 0) & (upper24 >= 2 * body24) & (lower24 <= body24)
+
+        ratio_2 = _body_ratio(f['o_2'], f['h_2'], f['l_2'], f['c_2'])
+        ratio_1 = _body_ratio(f['o_1'], f['h_1'], f['l_1'], f['c_1'])
+        evening_star = ((f['c_2'] > f['o_2']) & (ratio_2 >= 0.6) & (ratio_1 < 0.3)
+                        & (c < f['o']) & (c < (f['o_2'] + f['c_2']) / 2))
+        choppy += 3 * (shooting_star | evening_star)
+        choppy += 2 * (ratio4 < 0.25)
+
+        # 2. Multi-timeframe alignment
+        d1 = np.sign(c - f['lag24'])
+        h4 = np.sign(c - f['lag4'])
+        h1 = np.sign(c - f['lag1'])
+        aligned = (d1 != 0) & (d1 == h4) & (h4 == h1)
+        conflicting = (d1 != 0) & (d1 == -h4)
+        trending += 3 * aligned
+        choppy += 3 * conflicting
+        mixed += 2 * (~aligned & ~conflicting)
+
+        # 3. Level behaviour vs the previous day's range
+        prev_high, prev_low = f['prev_high'], f['prev_low']
+        holds = (f['min_c4'] > prev_high) | (f['max_c4'] < prev_low)
+        false_break = ~holds & (((f['h4'] > prev_high) & (c <= prev_high))
+                                | ((f['l4'] < prev_low) & (c >= prev_low)))
+        zone = 0.1 * (prev_high - prev_low)
+        tested = ~holds & ~false_break & ((f['h4'] >= prev_high - zone) | (f['l4'] <= prev_low + zone))
+        trending += 3 * holds
+        choppy += 3 * false_break
+        mixed += 2 * tested
+
+        # 4. Recent TP3 rate
+        if tp3_rate is not None:
+            rate = np.broadcast_to(np.asarray(tp3_rate, dtype=np.float64), c.shape)
+            trending += 2 * (rate > 0.6)
+            choppy += 2 * (rate < 0.2)
+            mixed += 1 * ((rate >= 0.2) & (rate <= 0.6))
+
+    return np.vstack([trending, mixed, choppy])
+
+
+def _labels(scores: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    best = np.array([TRENDING, MIXED, CHOPPY], dtype=np.int8)[np.argmax(scores, axis=0)]
+    best[scores.max(axis=0) == 0] = MIXED
+    best[~valid] = UNKNOWN
+    return best
+
+
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    """x[t - k] at position t (NaN before the start)."""
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
+
+
+def _rolling(x: np.ndarray, k: int, reduce) -> np.ndarray:
+    """reduce(x[t - k + 1 .. t]) at position t (NaN before k values)."""
+    out = np.full(len(x), np.nan)
+    if k <= len(x):
+        out[k - 1:] = reduce(sliding_window_view(x, k), axis=-1)
+    return out
+
+
+class MarketClassifier:
+    """
+    Labels 1H bars. ``trend_periods`` is how many candles back each
+    timeframe's direction is measured.
+    """
+
+    def __init__(self, trend_periods: int = 3):
+        self.trend_periods = trend_periods
+
+    @property
+    def warmup(self) -> int:
+        """Bars of history needed before the first label."""
+        return max(self.trend_periods * D1, 2 * D1 - 1)
+
+    def classify(self, bars: PriceBars, tp3_rate=None) -> np.ndarray:
+        """
+        Condition code for every bar (int8 array). ``tp3_rate`` is an
+        optional scalar or per-bar array of recent TP3 hit rates.
+        """
+        o, h, l, c = bars.open, bars.high, bars.low, bars.close
+        L = self.trend_periods
+        h4, l4 = _rolling(h, H4, np.max), _rolling(l, H4, np.min)
+        h24, l24 = _rolling(h, D1, np.max), _rolling(l, D1, np.min)
+        features = {
+            'o': o, 'c': c,
+            'o_1': _shift(o, 1), 'h_1': _shift(h, 1), 'l_1': _shift(l, 1), 'c_1': _shift(c, 1),
+            'o_2': _shift(o, 2), 'h_2': _shift(h, 2), 'l_2': _shift(l, 2), 'c_2': _shift(c, 2),
+            'o4': _shift(o, H4 - 1), 'h4': h4, 'l4': l4,
+            'po4': _shift(o, 2 * H4 - 1), 'pc4': _shift(c, H4),
+            'o24': _shift(o, D1 - 1), 'h24': h24, 'l24': l24,
+            'lag1': _shift(c, L), 'lag4': _shift(c, L * H4), 'lag24': _shift(c, L * D1),
+            'prev_high': _shift(h24, D1), 'prev_low': _shift(l24, D1),
+            'min_c4': _rolling(c, H4, np.min), 'max_c4': _rolling(c, H4, np.max),
+        }
+        valid = np.arange(len(c)) >= self.warmup
+        return _labels(_scores(features, tp3_rate), valid)
+
+    def classify_all(self, bars: Dict[str, PriceBars]) -> Dict[str, np.ndarray]:
+        """Condition codes for every pair."""
+        return {pair: self.classify(series) for pair, series in bars.items()}
+
+    @staticmethod
+    def names(codes: np.ndarray) -> np.ndarray:
+        """Condition names for an array of codes."""
+        return np.array(CONDITIONS.names, dtype=object)[codes]
+
+
+class IncrementalClassifier:
+    """
+    Bar-by-bar classifier for one pair, O(1) per bar. Gives the same
+    labels as ``MarketClassifier.classify`` on the same bars.
+    """
+
+    def __init__(self, trend_periods: int = 3):
+        self.trend_periods = trend_periods
+        self.warmup = MarketClassifier(trend_periods).warmup
+        depth = max(trend_periods * D1, 2 * H4) + 1
+        self._o = RingBuffer(depth)
+        self._h = RingBuffer(3)
+        self._l = RingBuffer(3)
+        self._c = RingBuffer(depth)
+        self._h24_history = RingBuffer(D1 + 1)
+        self._l24_history = RingBuffer(D1 + 1)
+        self._h4, self._l4 = RollingMax(H4), RollingMin(H4)
+        self._h24, self._l24 = RollingMax(D1), RollingMin(D1)
+        self._max_c4, self._min_c4 = RollingMax(H4), RollingMin(H4)
+        self.bars = 0
+        self.label = UNKNOWN
+
+    def update(self, open_: float, high: float, low: float, close: float,
+               tp3_rate: Optional[float] = None) -> int:
+        """Add the next closed 1H bar and return its condition code."""
+        for buffer, value in ((self._o, open_), (self._h, high), (self._l, low), (self._c, close)):
+            buffer.append(value)
+        h4, l4 = self._h4.update(high), self._l4.update(low)
+        h24, l24 = self._h24.update(high), self._l24.update(low)
+        max_c4, min_c4 = self._max_c4.update(close), self._min_c4.update(close)
+        self._h24_history.append(h24)
+        self._l24_history.append(l24)
+        self.bars += 1
+        if self.bars <= self.warmup:
+            return UNKNOWN
+
+        o, c, L = self._o, self._c, self.trend_periods
+        f = {
+            'o': o[-1], 'c': close,
+            'o_1': o[-2], 'h_1': self._h[-2], 'l_1': self._l[-2], 'c_1': c[-2],
+            'o_2': o[-3], 'h_2': self._h[-3], 'l_2': self._l[-3], 'c_2': c[-3],
+            'o4': o[-H4], 'h4': h4, 'l4': l4,
+            'po4': o[-2 * H4], 'pc4': c[-H4 - 1],
+            'o24': o[-D1], 'h24': h24, 'l24': l24,
+            'lag1': c[-L - 1], 'lag4': c[-L * H4 - 1], 'lag24': c[-L * D1 - 1],
+            'prev_high': self._h24_history[-D1 - 1], 'prev_low': self._l24_history[-D1 - 1],
+            'min_c4': min_c4, 'max_c4': max_c4,
+        }
+        f = {k: np.array([v], dtype=np.float64) for k, v in f.items()}
+        rate = None if tp3_rate is None else [tp3_rate]
+        self.label = int(_labels(_scores(f, rate), np.ones(1, dtype=bool))[0])
+        return self.label
+
+    @property
+    def condition(self) -> str:
+        return CONDITIONS.names[self.label]
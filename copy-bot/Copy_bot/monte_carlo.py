@@ -0,0 +1,155 @@
+"""
+Monte Carlo Module - Drawdown and ruin estimates from resampled trade sequences.
+
+A strategy's completed trades are turned into per-trade account returns
+(pips x position size from FelixStrategy.calculate_position_size x pip
+value, as a fraction of the starting balance). Tens of thousands of
+alternative orderings are then generated at once as a (paths x trades)
+array:
+
+- 'bootstrap': trades drawn with replacement
+- 'shuffle':   the same trades in a random order
+
+Equity curves, running peaks and drawdowns are computed with cumulative
+NumPy operations over the whole array, chunk by chunk to bound memory.
+
+Usage:
+    mc = MonteCarlo.from_strategy(felix_class, config=config)
+    result = mc.simulate(paths=50000)
+    print(result.to_dict())
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any
+
+import numpy as np
+
+from felix_strategy import FelixStrategy
+from trade import PENDING, result_code
+
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path max drawdown (fraction of peak equity) and final return."""
+    max_drawdown: np.ndarray
+    final_return: np.ndarray
+    ruined: np.ndarray            # equity fell to or below the ruin level
+    max_drawdown_limit: float
+    method: str
+
+    @property
+    def paths(self) -> int:
+        return len(self.max_drawdown)
+
+    def drawdown_percentiles(self, percentiles=DEFAULT_PERCENTILES) -> Dict[int, float]:
+        values = np.percentile(self.max_drawdown, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def return_percentiles(self, percentiles=(5, 50, 95)) -> Dict[int, float]:
+        values = np.percentile(self.final_return, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    @property
+    def prob_exceed_limit(self) -> float:
+        """Share of paths whose max drawdown exceeds the configured limit."""
+        return float(np.mean(self.max_drawdown > self.max_drawdown_limit))
+
+    @property
+    def prob_ruin(self) -> float:
+        return float(np.mean(self.ruined))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'method': self.method,
+            'paths': self.paths,
+            'max_drawdown_percentiles': {p: round(v * 100, 2) for p, v in self.drawdown_percentiles().items()},
+            'final_return_percentiles': {p: round(v * 100, 2) for p, v in self.return_percentiles().items()},
+            'max_drawdown_limit': self.max_drawdown_limit * 100,
+            'prob_exceed_limit': round(self.prob_exceed_limit * 100, 2),
+            'prob_ruin': round(self.prob_ruin * 100, 2),
+        }
+
+
+class MonteCarlo:
+    """
+    Resamples per-trade returns (fractions of the starting balance).
+
+    Args:
+        returns: account return of each completed trade, in trade order
+        max_drawdown: drawdown limit to test against (config.yaml targets)
+        ruin_level: equity (fraction of start) counted as ruin
+        compounding: size each trade off current equity instead of the start
+    """
+
+    def __init__(self, returns, max_drawdown: float = 0.10, ruin_level: float = 0.5,
+                 compounding: bool = False):
+        self.returns = np.asarray(returns, dtype=np.float64)
+        self.max_drawdown = max_drawdown
+        self.ruin_level = ruin_level
+        self.compounding = compounding
+
+    @classmethod
+    def from_strategy(cls, strategy, felix: FelixStrategy = None, config=None,
+                      balance: Optional[float] = None, **kwargs) -> 'MonteCarlo':
+        """
+        Build from a strategy's completed trades. Each trade is sized with
+        ``calculate_position_size`` for its market condition's SL.
+        """
+        felix = felix or getattr(strategy, 'felix', None) or FelixStrategy(config=config)
+        if config is not None:
+            balance = balance or config.backtest.get('initial_balance')
+            kwargs.setdefault('max_drawdown', config.targets.get('max_drawdown', 0.10))
+        balance = balance or 10000.0
+        return cls(trade_returns(strategy.trades, felix, balance), **kwargs)
+
+    def _chunk_rows(self, memory_mb: int) -> int:
+        return max(1, (memory_mb << 20) // (8 * 4 * max(len(self.returns), 1)))
+
+    def simulate(self, paths: int = 10000, method: str = 'bootstrap', seed: int = 0,
+                 memory_mb: int = 256) -> MonteCarloResult:
+        """Run ``paths`` resampled sequences ('bootstrap' or 'shuffle')."""
+        if method not in ('bootstrap', 'shuffle'):
+            raise ValueError(f"Unknown method '{method}' (use 'bootstrap' or 'shuffle')")
+        n = len(self.returns)
+        max_dd = np.zeros(paths)
+        final = np.zeros(paths)
+        ruined = np.zeros(paths, dtype=bool)
+        if n == 0:
+            return MonteCarloResult(max_dd, final, ruined, self.max_drawdown, method)
+
+        rng = np.random.default_rng(seed)
+        rows = self._chunk_rows(memory_mb)
+        for lo in range(0, paths, rows):
+            hi = min(lo + rows, paths)
+            if method == 'bootstrap':
+                sample = self.returns[rng.integers(0, n, size=(hi - lo, n))]
+            else:
+                sample = rng.permuted(np.broadcast_to(self.returns, (hi - lo, n)), axis=1)
+
+            if self.compounding:
+                equity = np.cumprod(1.0 + sample, axis=1)
+            else:
+                equity = 1.0 + np.cumsum(sample, axis=1)
+            # The starting balance is the first peak
+            peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+            max_dd[lo:hi] = np.max(1.0 - equity / peak, axis=1)
+            final[lo:hi] = equity[:, -1] - 1.0
+            ruined[lo:hi] = equity.min(axis=1) <= self.ruin_level
+
+        return MonteCarloResult(max_dd, final, ruined, self.max_drawdown, method)
+
+
+def trade_returns(trades: List, felix: FelixStrategy, balance: float) -> np.ndarray:
+    """Account return (fraction of ``balance``) of each completed trade."""
+    returns = []
+    for trade in trades:
+        if result_code(trade.result) == PENDING:
+            continue
+        condition = getattr(trade, 'market_condition', 'unknown').lower()
+        sl_pips = felix.get_sl_for_market_condition(condition, trade.pair)
+        lots = felix.calculate_position_size(balance, sl_pips, trade.pair)
+        returns.append(lots * felix._get_pip_value(trade.pair) * (trade.pips or 0) / balance)
+    return np.array(returns, dtype=np.float64)
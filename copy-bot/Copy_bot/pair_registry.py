@@ -0,0 +1,243 @@
+"""
+Pair Registry Module - Per-pair metadata built once, indexed by pair id.
+
+Pip size, pip value, entry tolerance, spread and best sessions for every
+pair live in arrays indexed by the interned pair id from trade.PAIRS
+(``trade.pair_id``). Built-in defaults (the values FelixStrategy used to
+hard-code) are merged with config.yaml ``pairs`` and ``entry_tolerances``.
+Pairs seen for the first time get a row derived from their name (gold,
+JPY or standard), so the string checks run once per pair instead of on
+every signal.
+
+Usage:
+    registry = PairRegistry.from_config(config)   # or default_registry()
+    registry.pip_size('USDJPY')                   # 0.01
+    registry.pip_factor[trade.pair_id]            # pips per 1.0 of price
+"""
+
+from typing import List, Dict, Optional, Any, Mapping, Tuple
+
+import numpy as np
+
+from trade import PAIRS
+
+
+# $ per pip for 1 standard lot
+DEFAULT_PIP_VALUES = {
+    'EURUSD': 10.0,
+    'GBPUSD': 10.0,
+    'USDJPY': 6.5,
+    'USDCHF': 11.0,
+    'AUDUSD': 10.0,
+    'USDCAD': 7.5,
+    'NZDUSD': 10.0,
+    'XAUUSD': 10.0,  # Gold
+    'EURJPY': 6.5,
+    'GBPJPY': 6.5,
+    'EURGBP': 13.0,
+    'EURAUD': 6.5,
+    'AUDCAD': 7.5,
+    'AUDJPY': 6.5,
+    'GBPCAD': 7.5,
+    'GBPAUD': 6.5,
+    'GBPNZD': 6.5,
+    'EURCAD': 7.5,
+    'EURCHF': 11.0,
+    'CADJPY': 6.5,
+    'CHFJPY': 6.5,
+    'CADCHF': 11.0,
+}
+DEFAULT_PIP_VALUE = 10.0
+
+# Same keys as config.yaml entry_tolerances; a pair name overrides its class
+DEFAULT_TOLERANCES = {
+    'XAUUSD': 5.0,       # 5 pips for gold
+    'JPY_pairs': 0.05,   # 5 pips for JPY pairs
+    'standard': 0.0005,  # 5 pips for standard pairs
+}
+
+# Used for pairs without spread_pips in config.yaml
+DEFAULT_SPREAD_PIPS = 1.0
+
+SESSIONS = ('asia', 'tokyo', 'london', 'ny', 'ny_overlap')
+
+# Main session by UTC hour (one label per hour; the London/NY overlap wins)
+SESSION_BY_HOUR = np.array(
+    [SESSIONS.index('tokyo')] * 7           # 00-06
+    + [SESSIONS.index('london')] * 5        # 07-11
+    + [SESSIONS.index('ny_overlap')] * 4    # 12-15
+    + [SESSIONS.index('ny')] * 5            # 16-20
+    + [SESSIONS.index('asia')] * 3,         # 21-23
+    dtype=np.int64)
+
+
+def pair_class(pair: str) -> str:
+    """'gold', 'jpy' or 'standard'."""
+    if pair == 'XAUUSD':
+        return 'gold'
+    elif 'JPY' in pair:
+        return 'jpy'
+    return 'standard'
+
+
+def session_mask(sessions) -> int:
+    """Bit mask over SESSIONS for a list of session names."""
+    mask = 0
+    for name in sessions or ():
+        if name in SESSIONS:
+            mask |= 1 << SESSIONS.index(name)
+    return mask
+
+
+def session_of(timestamps) -> np.ndarray:
+    """SESSIONS index of each epoch timestamp (len(SESSIONS) when unknown/0)."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    hours = (timestamps // 3600) % 24
+    return np.where(timestamps > 0, SESSION_BY_HOUR[hours], len(SESSIONS))
+
+
+class PairRegistry:
+    """
+    Metadata arrays indexed by pair id. Rows for unseen pairs are added on
+    first lookup; scalar lookups read plain lists, ``pip_size`` etc. as
+    arrays are kept for vectorized code.
+    """
+
+    def __init__(self, pip_values: Optional[Mapping[str, float]] = None,
+                 tolerances: Optional[Mapping[str, float]] = None,
+                 pairs: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        self._pip_values = dict(DEFAULT_PIP_VALUES)
+        self._pip_values.update(pip_values or {})
+        self._tolerances = dict(DEFAULT_TOLERANCES)
+        self._tolerances.update(tolerances or {})
+        self._pairs = dict(pairs or {})
+
+        # Row per pair id; filled up to len(PAIRS.names) on demand
+        self._pip_size: List[float] = []
+        self._pip_factor: List[float] = []
+        self._pip_value: List[float] = []
+        self._tolerance: List[float] = []
+        self._spread: List[float] = []
+        self._sessions: List[int] = []
+        self._volatility: List[str] = []
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+
+        for pair in list(DEFAULT_PIP_VALUES) + list(self._pairs):
+            PAIRS.code(pair)
+        self._fill()
+
+    @classmethod
+    def from_config(cls, config) -> 'PairRegistry':
+        """Registry merging a StrategyConfig's ``pairs`` and ``entry_tolerances``."""
+        return cls(config.pip_values, config.entry_tolerances, config.pairs)
+
+    def _fill(self):
+        """Add rows for pair ids interned since the last fill."""
+        for pair in PAIRS.names[len(self._pip_size):]:
+            kind = pair_class(pair)
+            if kind == 'gold':
+                pip, factor = 1.0, 1
+                tolerance = self._tolerances.get(pair, self._tolerances['XAUUSD'])
+            elif kind == 'jpy':
+                pip, factor = 0.01, 100
+                tolerance = self._tolerances.get(pair, self._tolerances['JPY_pairs'])
+            else:
+                pip, factor = 0.0001, 10000
+                tolerance = self._tolerances.get(pair, self._tolerances['standard'])
+            info = self._pairs.get(pair, {})
+            self._pip_size.append(pip)
+            self._pip_factor.append(factor)
+            self._pip_value.append(float(self._pip_values.get(pair, DEFAULT_PIP_VALUE)))
+            self._tolerance.append(float(tolerance))
+            self._spread.append(float(info.get('spread_pips', DEFAULT_SPREAD_PIPS)))
+            self._sessions.append(session_mask(info.get('session_best')))
+            self._volatility.append(info.get('volatility', 'medium'))
+        self._arrays = None
+
+    def id(self, pair: str) -> int:
+        """Pair id (trade.PAIRS code), adding a row for new pairs."""
+        pid = PAIRS.code(pair)
+        if pid >= len(self._pip_size):
+            self._fill()
+        return pid
+
+    def ids(self, pairs) -> np.ndarray:
+        """Pair ids for an array of pair names."""
+        names, inverse = np.unique(np.asarray(pairs, dtype=str), return_inverse=True)
+        return np.array([self.id(str(name)) for name in names], dtype=np.int64)[inverse]
+
+    # Scalar lookups
+    def pip_size(self, pair: str) -> float:
+        """Price distance of one pip."""
+        return self._pip_size[self.id(pair)]
+
+    def pips_per_unit(self, pair: str) -> float:
+        """Pips in a price distance of 1.0 (1, 100 or 10000)."""
+        return self._pip_factor[self.id(pair)]
+
+    def pip_value(self, pair: str) -> float:
+        """$ per pip for 1 standard lot."""
+        return self._pip_value[self.id(pair)]
+
+    def tolerance(self, pair: str) -> float:
+        """Entry tolerance around a key level (price units)."""
+        return self._tolerance[self.id(pair)]
+
+    def spread(self, pair: str) -> float:
+        """Typical spread in pips."""
+        return self._spread[self.id(pair)]
+
+    def sessions(self, pair: str) -> Tuple[str, ...]:
+        """Best trading sessions."""
+        mask = self._sessions[self.id(pair)]
+        return tuple(name for k, name in enumerate(SESSIONS) if mask & (1 << k))
+
+    def volatility(self, pair: str) -> str:
+        return self._volatility[self.id(pair)]
+
+    # Arrays for vectorized code, indexed by pair id
+    def _array(self, name: str, dtype) -> np.ndarray:
+        if len(self._pip_size) < len(PAIRS.names):
+            self._fill()
+        if self._arrays is None:
+            self._arrays = {}
+        array = self._arrays.get(name)
+        if array is None:
+            array = np.array(getattr(self, '_' + name), dtype=dtype)
+            self._arrays[name] = array
+        return array
+
+    @property
+    def pip_sizes(self) -> np.ndarray:
+        return self._array('pip_size', np.float64)
+
+    @property
+    def pip_factor(self) -> np.ndarray:
+        return self._array('pip_factor', np.float64)
+
+    @property
+    def pip_values(self) -> np.ndarray:
+        return self._array('pip_value', np.float64)
+
+    @property
+    def tolerances(self) -> np.ndarray:
+        return self._array('tolerance', np.float64)
+
+    @property
+    def spreads(self) -> np.ndarray:
+        return self._array('spread', np.float64)
+
+    @property
+    def session_masks(self) -> np.ndarray:
+        return self._array('sessions', np.int64)
+
+
+_default: Optional[PairRegistry] = None
+
+
+def default_registry() -> PairRegistry:
+    """Shared registry with the built-in defaults (no config)."""
+    global _default
+    if _default is None:
+        _default = PairRegistry()
+    return _default
@@ -0,0 +1,280 @@
+"""
+Parameter Sweep Module - Parallel grid/random search over FelixStrategy.
+
+Parameter sets are fanned out over a ProcessPoolExecutor. Price bars are
+copied once into shared memory and every worker maps the same buffers,
+so the price data is never pickled per task. Each run backtests the
+signals with a tuned FelixStrategy and its ``to_dict()`` statistics are
+streamed to a CSV (or Parquet, when pyarrow is installed) file as runs
+finish.
+
+Parameter names are FelixStrategy attributes, with dots for nested keys:
+
+    space = {
+        'default_sl_pips': [60, 80, 100],
+        'confidence_threshold': (0.5, 0.7),         # random: uniform range
+        'tp_targets.trending.tp3': [140, 180],
+        'market_multipliers.mixed.sl_adjustment': [0.75, 0.875],
+        'tp3_hold_pips.trending': [40, 50, 60],
+    }
+    run_sweep(grid(space), signals, bars, 'sweep.csv')
+"""
+
+import copy
+import csv
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from multiprocessing import shared_memory
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from backtester import Backtester
+from felix_strategy import FelixStrategy, FelixStrategyClass
+from price_bars import PriceBars
+
+
+def grid(space: Dict[str, List]) -> Iterator[Dict[str, Any]]:
+    """Every combination of the listed values."""
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_samples(space: Dict[str, Any], count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    ``count`` random parameter sets. A list is sampled by choice, a
+    ``(low, high)`` tuple uniformly (integers when both bounds are ints).
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(values)
+        yield params
+
+
+def _thaw(value):
+    """Plain, mutable copy of (possibly read-only) nested mappings."""
+    if hasattr(value, 'items'):
+        return {k: _thaw(v) for k, v in value.items()}
+    return copy.copy(value)
+
+
+# FelixStrategy attributes that never change pip results (they only
+# describe the config or size positions in lots); sweeping them would give
+# identical runs. Targets are swept through tp_targets, stops through
+# default_sl_pips and market_multipliers.
+UNSWEEPABLE = ('tp1_range', 'tp2_range', 'tp3_range', 'tight_sl_pips', 'manual_cut_pips',
+               'risk_per_trade')
+
+# Only read when an IndicatorCache is attached (FelixStrategy.use_indicators)
+ADAPTIVE_SL_PARAMS = ('adaptive_sl_base', 'adaptive_sl_default')
+
+
+def apply_params(felix: FelixStrategy, params: Dict[str, Any]) -> FelixStrategy:
+    """Set (dotted) attributes on a FelixStrategy (the level index follows key_levels)."""
+    for name, value in params.items():
+        root, *path = name.split('.')
+        if root in UNSWEEPABLE:
+            raise ValueError(f"FelixStrategy parameter '{root}' does not affect trades "
+                             f"and cannot be swept")
+        if root in ADAPTIVE_SL_PARAMS and felix.indicators is None:
+            raise ValueError(f"FelixStrategy parameter '{root}' only affects trades "
+                             f"with indicators attached (use_indicators)")
+        if not hasattr(felix, root):
+            raise AttributeError(f"FelixStrategy has no parameter '{root}'")
+        if not path:
+            setattr(felix, root, value)
+        else:
+            container = _thaw(getattr(felix, root))
+            node = container
+            for key in path[:-1]:
+                node = node[key]
+            node[path[-1]] = value
+            setattr(felix, root, container)
+        if root == 'key_levels':
+            felix.rebuild_level_index()
+    return felix
+
+
+class SharedBars:
+    """
+    Price bars copied into shared memory blocks (one per pair) so worker
+    processes can map them without pickling the arrays.
+    """
+
+    def __init__(self, bars: Dict[str, PriceBars]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.handle: Dict[str, Tuple[str, int]] = {}
+        for pair, series in bars.items():
+            n = len(series)
+            block = shared_memory.SharedMemory(create=True, size=max(5 * n * 8, 1))
+            self._blocks.append(block)
+            view = _views(block.buf, n)
+            view[0][:] = series.timestamp
+            for column, values in zip(view[1:], (series.open, series.high, series.low, series.close)):
+                column[:] = values
+            self.handle[pair] = (block.name, n)
+
+    def close(self):
+        """Release and unlink the shared blocks."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedBars':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _views(buffer, n: int) -> List[np.ndarray]:
+    """timestamp (int64) and OHLC (float64) column views over one block."""
+    columns = [np.ndarray(n, dtype=np.int64, buffer=buffer)]
+    for k in range(1, 5):
+        columns.append(np.ndarray(n, dtype=np.float64, buffer=buffer, offset=k * n * 8))
+    return columns
+
+
+def attach_bars(handle: Dict[str, Tuple[str, int]]) -> Tuple[List, Dict[str, PriceBars]]:
+    """Map shared blocks in a worker; keep the returned blocks alive."""
+    blocks, bars = [], {}
+    for pair, (name, n) in handle.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        bars[pair] = PriceBars(pair, *_views(block.buf, n))
+    return blocks, bars
+
+
+# Worker process state, set once by init_worker
+_worker: Dict[str, Any] = {}
+
+
+def init_worker(handle, signals, config_path):
+    """ProcessPoolExecutor initializer: map shared bars, keep signals/config."""
+    _worker['blocks'], _worker['bars'] = attach_bars(handle)
+    _worker['signals'] = signals
+    _worker['config'] = None
+    if config_path is not None:
+        from config_loader import load_config
+        _worker['config'] = load_config(config_path)
+
+
+def evaluate(params: Dict[str, Any], signals: List, bars: Dict[str, PriceBars],
+             config=None) -> Dict[str, Any]:
+    """Backtest one parameter set and return its statistics."""
+    felix = apply_params(FelixStrategy(config=config), params)
+    strategy = FelixStrategyClass('sweep', config=config)
+    strategy.felix = felix
+    result = Backtester(felix, selector=strategy).run([copy.copy(s) for s in signals], bars)
+    stats = strategy.to_dict()
+    del stats['name'], stats['description']
+    stats['skipped'] = result.skipped
+    return stats
+
+
+def worker_context() -> Dict[str, Any]:
+    """Signals, shared bars and config of the current worker process."""
+    return _worker
+
+
+def _run_one(run: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    stats = evaluate(params, _worker['signals'], _worker['bars'], _worker['config'])
+    return {'run': run, **params, **stats}
+
+
+class _ResultWriter:
+    """Streams result rows to CSV, or Parquet row groups via pyarrow."""
+
+    def __init__(self, path: str, batch_rows: int = 256):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self.batch_rows = batch_rows
+        self._rows: List[Dict[str, Any]] = []
+        self._file = None
+        self._writer = None
+        self.count = 0
+
+    @staticmethod
+    def _cell(value):
+        return json.dumps(value) if isinstance(value, (list, tuple, dict)) else value
+
+    def write(self, row: Dict[str, Any]):
+        row = {k: self._cell(v) for k, v in row.items()}
+        self.count += 1
+        if self.parquet:
+            self._rows.append(row)
+            if len(self._rows) >= self.batch_rows:
+                self._flush_parquet()
+            return
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row))
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def _flush_parquet(self):
+        if not self._rows:
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow); "
+                              "use a .csv path instead") from e
+        table = pa.Table.from_pylist(self._rows)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self):
+        if self.parquet:
+            self._flush_parquet()
+            if self._writer is not None:
+                self._writer.close()
+        elif self._file is not None:
+            self._file.close()
+
+
+def run_sweep(param_sets: Iterable[Dict[str, Any]], signals: List,
+              bars: Dict[str, PriceBars], output_path: str,
+              max_workers: Optional[int] = None, config_path: Optional[str] = None) -> int:
+    """
+    Run every parameter set in parallel and stream results to
+    ``output_path`` (.csv, or .parquet with pyarrow). Returns the number
+    of runs written. At most ``4 * workers`` runs are queued at a time, so
+    parameter generators of any length are fine.
+    """
+    writer = _ResultWriter(output_path)
+    with SharedBars(bars) as shared, ProcessPoolExecutor(
+            max_workers=max_workers, initializer=init_worker,
+            initargs=(shared.handle, signals, config_path)) as pool:
+        limit = 4 * (max_workers or os.cpu_count() or 1)
+        pending = set()
+        try:
+            for run, params in enumerate(param_sets):
+                pending.add(pool.submit(_run_one, run, params))
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        writer.write(future.result())
+            for future in as_completed(pending):
+                writer.write(future.result())
+        finally:
+            writer.close()
+    return writer.count
@@ -0,0 +1,211 @@
+"""
+Performance Cube Module - Trade statistics by pair, condition, session and strategy.
+
+The cube keeps one cell per (pair, market condition, session, strategy)
+with the trade count per result, completed pips and gross profit/loss,
+the same numbers TradeBook summarises. Adding a trade or changing its
+result touches one cell, so the cube stays current as trades stream in;
+any breakdown (``rollup``) or filtered total (``stats``) is a sum over
+the cube and costs O(cells), not O(trades).
+
+Sessions come from the trade's UTC hour (pair_registry.SESSION_BY_HOUR);
+trades without a timestamp fall in 'unknown'. Pairs and conditions use
+the shared trade.PAIRS / trade.CONDITIONS codes, so new values simply
+grow the cube.
+
+Strategies feed a cube automatically when they have one attached:
+
+    cube = PerformanceCube()
+    felix_class.cube = cube            # TradeStatsMixin.add_trade updates it
+    cube.rollup('condition', pair='XAUUSD')
+    cube.rollup(('pair', 'session'), strategy='Felix Classic')
+"""
+
+from typing import List, Dict, Optional, Tuple, Any, Union
+
+import numpy as np
+
+from pair_registry import SESSIONS, session_of
+from trade import PAIRS, CONDITIONS, PENDING, WIN, LOSS, BREAKEVEN, RESULT_NAMES, result_code
+from trade_book import to_epoch
+
+
+DIMENSIONS = ('pair', 'condition', 'session', 'strategy')
+SESSION_NAMES = list(SESSIONS) + ['unknown']
+
+Filter = Union[None, str, List[str]]
+
+
+class PerformanceCube:
+    """Dense per-cell counters over DIMENSIONS plus the trade result."""
+
+    def __init__(self):
+        self.strategies: List[str] = []
+        self._strategy_codes: Dict[str, int] = {}
+        shape = (max(len(PAIRS.names), 1), len(CONDITIONS.names), len(SESSION_NAMES), 1)
+        self._counts = np.zeros(shape + (len(RESULT_NAMES),), dtype=np.int64)
+        self._pips = np.zeros(shape)            # completed trades only
+        self._gross_profit = np.zeros(shape)
+        self._gross_loss = np.zeros(shape)
+
+    def _names(self, dimension: str) -> List[str]:
+        return {
+            'pair': PAIRS.names,
+            'condition': CONDITIONS.names,
+            'session': SESSION_NAMES,
+            'strategy': self.strategies,
+        }[dimension]
+
+    def _strategy(self, name: Optional[str]) -> int:
+        name = name or 'unknown'
+        code = self._strategy_codes.get(name)
+        if code is None:
+            code = len(self.strategies)
+            self.strategies.append(name)
+            self._strategy_codes[name] = code
+        return code
+
+    def _fit(self, cell: Tuple[int, ...], result: int):
+        """Grow the arrays so ``cell`` and ``result`` are in range."""
+        shape = self._pips.shape
+        if all(i < n for i, n in zip(cell, shape)) and result < self._counts.shape[-1]:
+            return
+        new = tuple(max(n, i + 1, 2 * n if i >= n else n) for i, n in zip(cell, shape))
+        pad = [(0, a - b) for a, b in zip(new, shape)]
+        results = max(self._counts.shape[-1], result + 1, len(RESULT_NAMES))
+        self._counts = np.pad(self._counts, pad + [(0, results - self._counts.shape[-1])])
+        self._pips = np.pad(self._pips, pad)
+        self._gross_profit = np.pad(self._gross_profit, pad)
+        self._gross_loss = np.pad(self._gross_loss, pad)
+
+    def cell(self, trade, strategy: Optional[str] = None) -> Tuple[int, int, int, int]:
+        """Cube coordinates of a trade."""
+        timestamp = to_epoch(getattr(trade, 'timestamp', None))
+        pair_id = getattr(trade, 'pair_id', None)
+        return (
+            PAIRS.code(trade.pair) if pair_id is None else pair_id,
+            CONDITIONS.code(getattr(trade, 'market_condition', 'unknown').lower()),
+            int(session_of(timestamp)),
+            self._strategy(strategy or getattr(trade, 'strategy', None)),
+        )
+
+    def _count(self, cell: Tuple[int, ...], code: int, pips: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) one trade, as TradeBook._count."""
+        self._fit(cell, code)
+        self._counts[cell + (code,)] += sign
+        if code != PENDING:
+            self._pips[cell] += sign * pips
+        if pips > 0:
+            self._gross_profit[cell] += sign * pips
+        elif pips < 0:
+            self._gross_loss[cell] += sign * pips
+
+    def add(self, trade, strategy: Optional[str] = None):
+        """Count a trade (strategy defaults to ``trade.strategy``)."""
+        self._count(self.cell(trade, strategy), result_code(trade.result), float(trade.pips or 0), 1)
+
+    def update(self, trade, old_result: str, old_pips: float, strategy: Optional[str] = None):
+        """Move a trade already counted with ``old_result``/``old_pips`` to its current result."""
+        cell = self.cell(trade, strategy)
+        self._count(cell, result_code(old_result), float(old_pips or 0), -1)
+        self._count(cell, result_code(trade.result), float(trade.pips or 0), 1)
+
+    @classmethod
+    def from_trades(cls, trades: List, strategy: Optional[str] = None) -> 'PerformanceCube':
+        """Build a cube from a trade history in one vectorized pass."""
+        cube = cls()
+        if not trades:
+            return cube
+        cells = np.array([cube.cell(t, strategy) for t in trades], dtype=np.int64)
+        codes = np.array([result_code(t.result) for t in trades], dtype=np.int64)
+        pips = np.array([float(t.pips or 0) for t in trades])
+        cube._fit(tuple(cells.max(axis=0)), int(codes.max()))
+        index = tuple(cells.T)
+        np.add.at(cube._counts, index + (codes,), 1)
+        np.add.at(cube._pips, index, np.where(codes != PENDING, pips, 0.0))
+        np.add.at(cube._gross_profit, index, np.maximum(pips, 0.0))
+        np.add.at(cube._gross_loss, index, np.minimum(pips, 0.0))
+        return cube
+
+    # Queries
+
+    def _selection(self, filters: Dict[str, Filter]) -> Tuple[np.ndarray, ...]:
+        """Index arrays per dimension for ``{dimension: name or names}``."""
+        unknown = set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimension(s) {sorted(unknown)} (use {DIMENSIONS})")
+        shape = self._pips.shape
+        selection = []
+        for d, dimension in enumerate(DIMENSIONS):
+            wanted = filters.get(dimension)
+            if wanted is None:
+                selection.append(np.arange(shape[d]))
+                continue
+            names = self._names(dimension)
+            wanted = [wanted] if isinstance(wanted, str) else wanted
+            selection.append(np.array([names.index(w) for w in wanted if w in names
+                                       and names.index(w) < shape[d]], dtype=np.int64))
+        return tuple(selection)
+
+    def _slice(self, filters: Dict[str, Filter]):
+        index = np.ix_(*self._selection(filters))
+        return (self._counts[index], self._pips[index],
+                self._gross_profit[index], self._gross_loss[index])
+
+    def stats(self, **filters: Filter) -> Dict[str, Any]:
+        """Totals over the cells matching the filters, e.g. ``stats(pair='XAUUSD')``."""
+        counts, pips, profit, loss = self._slice(filters)
+        axes = tuple(range(len(DIMENSIONS)))
+        return _summary(counts.sum(axis=axes), pips.sum(), profit.sum(), loss.sum())
+
+    def rollup(self, by: Union[str, Tuple[str, ...]], **filters: Filter) -> Dict[Any, Dict[str, Any]]:
+        """
+        Stats per value of the ``by`` dimension(s) over the matching cells;
+        keys are names (tuples of names for several dimensions). Empty
+        groups are left out. Drill down by adding filters, e.g.
+        ``rollup('session', pair='XAUUSD', condition='trending')``.
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        for dimension in by:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dimension}' (use {DIMENSIONS})")
+        selection = self._selection(filters)
+        counts, pips, profit, loss = self._slice(filters)
+        keep = tuple(DIMENSIONS.index(d) for d in by)
+        other = tuple(d for d in range(len(DIMENSIONS)) if d not in keep)
+        counts, pips = counts.sum(axis=other), pips.sum(axis=other)
+        profit, loss = profit.sum(axis=other), loss.sum(axis=other)
+
+        # Summed arrays keep the remaining dimensions in DIMENSIONS order
+        ordered = sorted(keep)
+        result = {}
+        for position in zip(*np.nonzero(counts.sum(axis=-1))):
+            names = {DIMENSIONS[d]: self._names(DIMENSIONS[d])[selection[d][p]]
+                     for d, p in zip(ordered, position)}
+            key = tuple(names[d] for d in by)
+            result[key[0] if len(by) == 1 else key] = _summary(
+                counts[position], pips[position], profit[position], loss[position])
+        return result
+
+
+def _summary(counts: np.ndarray, pips: float, gross_profit: float, gross_loss: float) -> Dict[str, Any]:
+    """TradeBook.summary numbers from summed cell counters."""
+    n = int(counts.sum())
+    completed = n - int(counts[PENDING])
+    wins = int(counts[WIN])
+    gross_loss = abs(float(gross_loss))
+    gross_profit = float(gross_profit)
+    if gross_loss == 0:
+        profit_factor = gross_profit if gross_profit > 0 else 1.0
+    else:
+        profit_factor = gross_profit / gross_loss
+    return {
+        'total_trades': n,
+        'completed_trades': completed,
+        'wins': wins,
+        'losses': int(counts[LOSS]),
+        'breakevens': int(counts[BREAKEVEN]),
+        'win_rate': (wins / completed) * 100 if completed else 0.0,
+        'total_pips': float(pips),
+        'profit_factor': profit_factor,
+    }
@@ -0,0 +1,128 @@
+"""
+P&L Module - Vectorized pips and account-currency P&L for trade histories.
+
+Converts whole arrays of trades in one NumPy pass using the pair
+registry (pips per price unit, pip value, spread):
+
+    gross pips = (exit - entry) * direction sign * pips per unit
+    net pips   = gross pips - spread pips
+    pnl        = net pips * pip value * lots
+
+Pairs can be given as names or as pair ids (``trade.pair_id``); ids skip
+the name lookup. Spread defaults to config.yaml ``pairs.*.spread_pips``
+and can be overridden per call to re-price a history under a different
+spread assumption.
+
+Usage:
+    result = price_trades(pairs, entry, exit, directions, lots, registry=config.registry)
+    wider = reprice(result.gross_pips, pairs, lots, spread_multiplier=1.5)
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Union
+
+import numpy as np
+
+from pair_registry import PairRegistry, default_registry
+
+
+SpreadLike = Union[None, float, Dict[str, float], np.ndarray]
+
+
+@dataclass
+class PnLResult:
+    """Per-trade pips and P&L arrays."""
+    gross_pips: np.ndarray
+    spread_pips: np.ndarray
+    net_pips: np.ndarray
+    pnl: np.ndarray
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Totals over all trades."""
+        return {
+            'trades': len(self.pnl),
+            'gross_pips': round(float(self.gross_pips.sum()), 2),
+            'spread_pips': round(float(self.spread_pips.sum()), 2),
+            'net_pips': round(float(self.net_pips.sum()), 2),
+            'pnl': round(float(self.pnl.sum()), 2),
+        }
+
+
+def pair_ids(pairs, registry: PairRegistry) -> np.ndarray:
+    """Pair ids from an array of names (ints are passed through)."""
+    pairs = np.asarray(pairs)
+    if pairs.dtype.kind in 'iu':
+        return pairs.astype(np.int64, copy=False)
+    return registry.ids(pairs)
+
+
+def direction_signs(directions) -> np.ndarray:
+    """+1 for 'Buy', -1 for 'Sell' (numeric arrays are used as signs)."""
+    directions = np.asarray(directions)
+    if directions.dtype.kind in 'iuf':
+        return directions.astype(np.float64, copy=False)
+    return np.where(directions == 'Buy', 1.0, -1.0)
+
+
+def spread_pips(ids: np.ndarray, registry: PairRegistry, spread: SpreadLike = None,
+                spread_multiplier: float = 1.0) -> np.ndarray:
+    """
+    Spread in pips per trade: the registry's spread_pips by default, a
+    single number for every pair, a ``{pair: pips}`` dict (other pairs
+    keep the registry value) or a per-pair-id array.
+    """
+    if spread is None:
+        table = registry.spreads
+    elif isinstance(spread, dict):
+        overrides = {registry.id(pair): pips for pair, pips in spread.items()}
+        table = registry.spreads.copy()
+        for pid, pips in overrides.items():
+            table[pid] = pips
+    elif np.isscalar(spread):
+        return np.full(len(ids), float(spread) * spread_multiplier)
+    else:
+        table = np.asarray(spread, dtype=np.float64)
+    return table[ids] * spread_multiplier
+
+
+def price_trades(pairs, entry, exit, directions, lots=1.0,
+                 registry: Optional[PairRegistry] = None, spread: SpreadLike = None,
+                 spread_multiplier: float = 1.0) -> PnLResult:
+    """Pips and P&L for arrays of entry/exit prices."""
+    registry = registry or default_registry()
+    ids = pair_ids(pairs, registry)
+    factor = registry.pip_factor
+    gross = (np.asarray(exit, dtype=np.float64) - np.asarray(entry, dtype=np.float64)) \
+        * direction_signs(directions) * factor[ids]
+    return _apply_costs(gross, ids, lots, registry, spread, spread_multiplier)
+
+
+def reprice(gross_pips, pairs, lots=1.0, registry: Optional[PairRegistry] = None,
+            spread: SpreadLike = None, spread_multiplier: float = 1.0) -> PnLResult:
+    """P&L for known gross pips (e.g. trade.pips) under a spread assumption."""
+    registry = registry or default_registry()
+    ids = pair_ids(pairs, registry)
+    return _apply_costs(np.asarray(gross_pips, dtype=np.float64), ids, lots,
+                        registry, spread, spread_multiplier)
+
+
+def _apply_costs(gross: np.ndarray, ids: np.ndarray, lots, registry: PairRegistry,
+                 spread: SpreadLike, spread_multiplier: float) -> PnLResult:
+    cost = spread_pips(ids, registry, spread, spread_multiplier)
+    net = gross - cost
+    pnl = net * registry.pip_values[ids] * np.asarray(lots, dtype=np.float64)
+    return PnLResult(gross, cost, net, pnl)
+
+
+def trade_columns(trades: List, registry: Optional[PairRegistry] = None) -> Dict[str, np.ndarray]:
+    """pair ids, entry, direction signs and pips of trade objects as arrays."""
+    registry = registry or default_registry()
+    ids = [getattr(t, 'pair_id', None) for t in trades]
+    if any(pid is None for pid in ids):
+        ids = [registry.id(t.pair) for t in trades]
+    return {
+        'pair_id': np.array(ids, dtype=np.int64),
+        'entry': np.array([np.nan if t.entry is None else t.entry for t in trades], dtype=np.float64),
+        'sign': np.array([1.0 if t.direction == 'Buy' else -1.0 for t in trades]),
+        'pips': np.array([t.pips or 0.0 for t in trades], dtype=np.float64),
+    }
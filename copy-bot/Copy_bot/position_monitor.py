@@ -0,0 +1,218 @@
+"""
+Position Monitor Module - Live SL/TP tracking for open trades.
+
+Applies the Backtester's trade rules tick by tick to any number of open
+positions:
+
+1. SL from ``get_sl_for_market_condition``, targets from ``get_tp_targets``
+2. SL before TP1 -> loss
+3. TP1 hit -> stop moves to breakeven; breakeven before TP2 -> breakeven
+4. TP2 hit -> close unless ``should_hold_for_tp3``; when holding, the stop
+   moves to TP1 and the trade runs for TP3
+
+Every open position has exactly two live triggers, its stop and its
+target. Per pair they sit in two heaps: a min-heap of triggers that fire
+when price rises to them (Buy targets, Sell stops) and a max-heap of
+triggers that fire when price falls to them (Buy stops, Sell targets).
+A tick only compares against the two heap tops and pops the triggers it
+crosses, so it costs O(log n) per fired trigger whatever the number of
+open positions. Triggers replaced by a stage change or a manual close
+are deleted lazily (a version number marks them stale) and the heaps are
+compacted when stale entries pile up.
+
+Usage:
+    monitor = PositionMonitor(felix)
+    number = monitor.open(trade)
+    for timestamp, event, number, price in monitor.on_tick('XAUUSD', 4212.5, ts):
+        ...
+"""
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Dict, Optional, Tuple
+
+from felix_strategy import FelixStrategy
+from trade_book import to_epoch
+
+
+Event = Tuple[int, str, int, float]     # (timestamp, event, position number, price)
+
+
+@dataclass
+class Position:
+    """One open trade and its current stop/target."""
+    number: int
+    trade: object
+    sign: float
+    condition: str
+    sl_pips: float
+    targets: Dict[str, int]
+    tp1: float
+    tp2: float
+    tp3: float
+    stop: float
+    target: float
+    stage: int = 0          # 0: SL vs TP1, 1: breakeven vs TP2, 2: TP1 lock vs TP3
+    version: int = 0
+
+
+@dataclass
+class _PairHeaps:
+    rising: List = field(default_factory=list)    # (price, number, version, kind)
+    falling: List = field(default_factory=list)   # (-price, number, version, kind)
+    stale: int = 0
+
+
+class PositionMonitor:
+    """
+    Args:
+        felix: FelixStrategy providing SL/TP sizing and hold rules
+        compact_ratio: rebuild a pair's heaps once stale entries exceed
+            this many times the live ones
+        on_close: callable receiving each finished Position (e.g. to
+            journal it or hand the trade to its strategy)
+        keep_closed: finished positions kept in ``closed`` (most recent)
+    """
+
+    def __init__(self, felix: FelixStrategy = None, compact_ratio: float = 2.0,
+                 on_close: Optional[Callable[[Position], None]] = None, keep_closed: int = 1000):
+        self.felix = felix or FelixStrategy()
+        self.compact_ratio = compact_ratio
+        self.on_close = on_close
+        self.positions: Dict[int, Position] = {}
+        self.closed: Deque[Position] = deque(maxlen=keep_closed)
+        self._heaps: Dict[str, _PairHeaps] = {}
+        self._open_by_pair: Dict[str, int] = {}
+        self._next_number = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def open(self, trade) -> int:
+        """Start tracking a trade at its entry; returns its position number."""
+        felix = self.felix
+        condition = getattr(trade, 'market_condition', 'unknown').lower()
+        sign = 1.0 if trade.direction == 'Buy' else -1.0
+        pip = felix.registry.pip_size(trade.pair)
+        entry = trade.entry
+
+        sl_pips = felix.get_sl_for_market_condition(condition, trade.pair)
+        targets = felix.get_tp_targets(condition)
+        tp1, tp2, tp3 = (entry + sign * targets[k] * pip for k in ('tp1', 'tp2', 'tp3'))
+        number = self._next_number
+        self._next_number += 1
+        position = Position(number, trade, sign, condition, sl_pips, targets,
+                            tp1, tp2, tp3, stop=entry - sign * sl_pips * pip, target=tp1)
+        self.positions[number] = position
+        self._open_by_pair[trade.pair] = self._open_by_pair.get(trade.pair, 0) + 1
+        self._push(position)
+        return number
+
+    def close(self, number: int, price: float, timestamp=None) -> Event:
+        """Close a position by hand (e.g. a manual cut) at ``price``."""
+        position = self.positions[number]
+        pips = (price - position.trade.entry) * position.sign \
+            * self.felix.registry.pips_per_unit(position.trade.pair)
+        outcome = 'win' if pips > 0 else 'loss' if pips < 0 else 'breakeven'
+        self._finish(position, outcome, round(pips, 1))
+        return (to_epoch(timestamp), 'close', number, price)
+
+    def on_tick(self, pair: str, price: float, timestamp=None) -> List[Event]:
+        """Apply a price to ``pair``'s positions; returns the events it fired."""
+        heaps = self._heaps.get(pair)
+        if heaps is None:
+            return []
+        now = to_epoch(timestamp)
+        events: List[Event] = []
+        rising, falling = heaps.rising, heaps.falling
+        while rising and rising[0][0] <= price:
+            _, number, version, kind = heapq.heappop(rising)
+            self._fire(heaps, number, version, kind, now, events)
+        while falling and -falling[0][0] >= price:
+            _, number, version, kind = heapq.heappop(falling)
+            self._fire(heaps, number, version, kind, now, events)
+        if heaps.stale > self.compact_ratio * 2 * self._open_by_pair.get(pair, 0) + 64:
+            self._compact(pair)
+        return events
+
+    def next_triggers(self, pair: str) -> Tuple[Optional[float], Optional[float]]:
+        """Nearest live trigger above and below (None when there is none)."""
+        heaps = self._heaps.get(pair)
+        if heaps is None:
+            return None, None
+        for heap in (heaps.rising, heaps.falling):
+            while heap and self._is_stale(heap[0]):
+                heapq.heappop(heap)
+                heaps.stale -= 1
+        up = heaps.rising[0][0] if heaps.rising else None
+        down = -heaps.falling[0][0] if heaps.falling else None
+        return up, down
+
+    def _push(self, position: Position):
+        """Register the position's current stop and target."""
+        heaps = self._heaps.setdefault(position.trade.pair, _PairHeaps())
+        for kind, price in (('stop', position.stop), ('target', position.target)):
+            # A Buy target / Sell stop fires on the way up, the others on the way down
+            if (kind == 'target') == (position.sign > 0):
+                heapq.heappush(heaps.rising, (price, position.number, position.version, kind))
+            else:
+                heapq.heappush(heaps.falling, (-price, position.number, position.version, kind))
+
+    def _is_stale(self, entry) -> bool:
+        position = self.positions.get(entry[1])
+        return position is None or position.version != entry[2]
+
+    def _fire(self, heaps: _PairHeaps, number: int, version: int, kind: str,
+              now: int, events: List[Event]):
+        position = self.positions.get(number)
+        if position is None or position.version != version:
+            heaps.stale -= 1
+            return
+        # The other trigger of this stage is now stale
+        heaps.stale += 1
+        targets = position.targets
+        if kind == 'stop':
+            event, outcome, pips = [('sl', 'loss', -position.sl_pips),
+                                    ('breakeven', 'breakeven', 0),
+                                    ('lock', 'win', targets['tp1'])][position.stage]
+            events.append((now, event, number, position.stop))
+            self._finish(position, outcome, pips, stale=False)
+        elif position.stage == 0:
+            events.append((now, 'tp1', number, position.tp1))
+            self._advance(position, stop=position.trade.entry, target=position.tp2)
+        elif position.stage == 1 and self.felix.should_hold_for_tp3(position.condition, targets['tp2']):
+            events.append((now, 'tp2', number, position.tp2))
+            self._advance(position, stop=position.tp1, target=position.tp3)
+        else:
+            event = 'tp2' if position.stage == 1 else 'tp3'
+            events.append((now, event, number, position.target))
+            self._finish(position, 'win', targets[event], stale=False)
+
+    def _advance(self, position: Position, stop: float, target: float):
+        position.stage += 1
+        position.version += 1
+        position.stop, position.target = stop, target
+        self._push(position)
+
+    def _finish(self, position: Position, outcome: str, pips: float, stale: bool = True):
+        """Close a position; ``stale`` counts both its heap entries as dead."""
+        trade = position.trade
+        trade.result = outcome
+        trade.pips = pips
+        del self.positions[position.number]
+        self._open_by_pair[trade.pair] -= 1
+        if stale:
+            self._heaps[trade.pair].stale += 2
+        self.closed.append(position)
+        if self.on_close is not None:
+            self.on_close(position)
+
+    def _compact(self, pair: str):
+        """Drop stale heap entries of ``pair``."""
+        heaps = self._heaps[pair]
+        heaps.rising = [e for e in heaps.rising if not self._is_stale(e)]
+        heaps.falling = [e for e in heaps.falling if not self._is_stale(e)]
+        heapq.heapify(heaps.rising)
+        heapq.heapify(heaps.falling)
+        heaps.stale = 0
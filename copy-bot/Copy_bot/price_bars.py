@@ -0,0 +1,44 @@
+"""
+Price Bars Module - Columnar OHLC price series used by the backtester.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class PriceBars:
+    """
+    OHLC bars for one pair. ``timestamp`` is int64 epoch seconds (bar open
+    time, ascending); prices are float64. Arrays may be views or memmaps.
+    """
+    pair: str
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __post_init__(self):
+        self.timestamp = np.asarray(self.timestamp, dtype=np.int64)
+        for name in ('open', 'high', 'low', 'close'):
+            column = np.asarray(getattr(self, name), dtype=np.float64)
+            if len(column) != len(self.timestamp):
+                raise ValueError(f"{self.pair}: column '{name}' has {len(column)} bars, "
+                                 f"expected {len(self.timestamp)}")
+            setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def index_at(self, timestamp: int) -> int:
+        """Index of the first bar at or after ``timestamp``."""
+        return int(np.searchsorted(self.timestamp, timestamp, side='left'))
+
+    def slice(self, start: int = None, end: int = None) -> 'PriceBars':
+        """Bars with ``start <= timestamp < end`` (views, no copy)."""
+        lo = 0 if start is None else self.index_at(start)
+        hi = len(self) if end is None else self.index_at(end)
+        return PriceBars(self.pair, self.timestamp[lo:hi], self.open[lo:hi],
+                         self.high[lo:hi], self.low[lo:hi], self.close[lo:hi])
@@ -0,0 +1,189 @@
+"""
+Price Store Module - Memory-mapped columnar price history for backtests.
+
+Each pair is stored as fixed-width columns in its own directory:
+
+    <root>/<PAIR>/timestamp.npy   int64 epoch seconds (ascending)
+    <root>/<PAIR>/open.npy        float64
+    <root>/<PAIR>/high.npy        float64
+    <root>/<PAIR>/low.npy         float64
+    <root>/<PAIR>/close.npy       float64
+    <root>/<PAIR>/days.npy        int64 (n_days, 2): UTC day number, first row
+
+Columns are opened with ``numpy.memmap`` (via ``np.load(mmap_mode='r')``),
+so loading is instant and a backtest of one week only touches the pages
+holding that week. The day index narrows a time range to its rows before
+the binary search on timestamps.
+
+Usage:
+    store = PriceStore('data/prices')
+    store.convert_csv('EURUSD_M1.csv', 'EURUSD')
+    bars = store.window('EURUSD', '2026-01-05', '2026-01-12')
+"""
+
+import csv
+import os
+from datetime import datetime
+from typing import List, Dict, Optional, Union
+
+import numpy as np
+
+from price_bars import PriceBars
+from trade_book import to_epoch
+
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close')
+SECONDS_PER_DAY = 86400
+
+TimeLike = Union[int, str, datetime, None]
+
+
+def _iso(value: str) -> str:
+    """Accept MT4 style dates ('2025.12.01 00:00') as ISO."""
+    return value[:10].replace('.', '-') + value[10:]
+
+
+def parse_epoch(value: TimeLike) -> Optional[int]:
+    """Epoch seconds from an int, datetime or ISO date/time string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(np.datetime64(_iso(value), 's').astype(np.int64))
+    return to_epoch(value)
+
+
+def _parse_timestamps(values: List[str]) -> np.ndarray:
+    """Parse epoch seconds or ISO / MT4 style date strings."""
+    if values and values[0].lstrip('-').isdigit():
+        return np.array(values, dtype=np.int64)
+    return np.array([_iso(v) for v in values], dtype='datetime64[s]').astype(np.int64)
+
+
+class PriceStore:
+    """Directory of per-pair memory-mapped OHLC columns."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._open: Dict[str, PriceBars] = {}
+        self._days: Dict[str, np.ndarray] = {}
+
+    def _path(self, pair: str, column: str) -> str:
+        return os.path.join(self.root, pair, f'{column}.npy')
+
+    def pairs(self) -> List[str]:
+        """Pairs that have data in the store."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(p for p in os.listdir(self.root)
+                      if os.path.exists(self._path(p, 'timestamp')))
+
+    def write(self, bars: PriceBars):
+        """Write (or replace) a pair's columns and day index."""
+        order = np.argsort(bars.timestamp, kind='stable')
+        if not np.all(order == np.arange(len(order))):
+            bars = PriceBars(bars.pair, *(getattr(bars, c)[order] for c in COLUMNS))
+
+        os.makedirs(os.path.join(self.root, bars.pair), exist_ok=True)
+        days = bars.timestamp // SECONDS_PER_DAY
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]]) if len(days) else np.zeros(0, np.int64)
+        day_index = np.column_stack([days[starts], starts]).astype(np.int64)
+
+        columns = {c: getattr(bars, c) for c in COLUMNS}
+        columns['days'] = day_index
+        for name, data in columns.items():
+            path = self._path(bars.pair, name)
+            tmp = path + '.tmp'
+            out = np.lib.format.open_memmap(tmp, mode='w+', dtype=data.dtype, shape=data.shape)
+            out[...] = data
+            out.flush()
+            del out
+            os.replace(tmp, path)
+
+        self._open.pop(bars.pair, None)
+        self._days.pop(bars.pair, None)
+
+    def convert_csv(self, csv_path: str, pair: str) -> PriceBars:
+        """
+        Convert a CSV price file into the store and return the mapped bars.
+
+        The header must name open/high/low/close and either a
+        timestamp/time/datetime column or separate date and time columns.
+        """
+        with open(csv_path, newline='') as f:
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader)]
+            rows = [row for row in reader if row]
+        if not rows:
+            raise ValueError(f"{csv_path}: no price rows")
+
+        def column(*names):
+            for name in names:
+                if name in header:
+                    i = header.index(name)
+                    return [row[i].strip() for row in rows]
+            return None
+
+        stamps = column('timestamp', 'datetime', 'time')
+        dates = column('date')
+        if dates is not None:
+            times = column('time')
+            stamps = [f'{d} {t}' for d, t in zip(dates, times)] if times else dates
+        if stamps is None:
+            raise ValueError(f"{csv_path}: no timestamp/date column in header {header}")
+
+        prices = {}
+        for name in ('open', 'high', 'low', 'close'):
+            values = column(name)
+            if values is None:
+                raise ValueError(f"{csv_path}: missing '{name}' column")
+            prices[name] = np.array(values, dtype=np.float64)
+
+        self.write(PriceBars(pair, _parse_timestamps(stamps), **prices))
+        return self.open(pair)
+
+    def open(self, pair: str) -> PriceBars:
+        """Memory-map all of a pair's columns (cached per store)."""
+        bars = self._open.get(pair)
+        if bars is None:
+            if not os.path.exists(self._path(pair, 'timestamp')):
+                raise KeyError(f"No price data for {pair} in {self.root}")
+            columns = [np.load(self._path(pair, c), mmap_mode='r') for c in COLUMNS]
+            bars = PriceBars(pair, *columns)
+            self._open[pair] = bars
+            self._days[pair] = np.load(self._path(pair, 'days'))
+        return bars
+
+    def window(self, pair: str, start: TimeLike = None, end: TimeLike = None) -> PriceBars:
+        """
+        Bars with ``start <= timestamp < end`` as views into the mapped
+        files (no copy). Dates are UTC; strings like '2026-01-05' work.
+        """
+        bars = self.open(pair)
+        days = self._days[pair]
+        start, end = parse_epoch(start), parse_epoch(end)
+        lo, hi = 0, len(bars)
+
+        # Narrow to whole days with the small in-memory index first
+        if start is not None and len(days):
+            k = np.searchsorted(days[:, 0], start // SECONDS_PER_DAY, side='right') - 1
+            if k >= 0:
+                lo = int(days[k, 1])
+        if end is not None and len(days):
+            k = np.searchsorted(days[:, 0], end // SECONDS_PER_DAY, side='right')
+            if k < len(days):
+                hi = int(days[k, 1])
+
+        # Then binary search only inside those rows
+        stamps = bars.timestamp[lo:hi]
+        first = lo + (int(np.searchsorted(stamps, start, side='left')) if start is not None else 0)
+        last = lo + (int(np.searchsorted(stamps, end, side='left')) if end is not None else len(stamps))
+        return PriceBars(pair, *(getattr(bars, c)[first:last] for c in COLUMNS))
+
+    def backtest_window(self, config, pairs: List[str] = None) -> Dict[str, PriceBars]:
+        """
+        Bars for the config.yaml ``backtest`` start/end dates (end date
+        inclusive) for the given pairs, or every pair in the store.
+        """
+        start = parse_epoch(config.backtest['start_date'])
+        end = parse_epoch(config.backtest['end_date']) + SECONDS_PER_DAY
+        return {pair: self.window(pair, start, end) for pair in (pairs or self.pairs())}
@@ -0,0 +1,94 @@
+"""
+Ring Buffer Module - Fixed-size windows for incremental indicators.
+
+RingBuffer keeps the last ``capacity`` values of a stream in a NumPy
+array; RollingMax / RollingMin track the extreme of the last ``size``
+values with a monotonic deque. Every update is O(1) (amortised for the
+rolling extremes), so per-bar indicator updates never rescan history.
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Last ``capacity`` values of a stream. ``buf[-1]`` is the newest value,
+    ``buf[-k]`` the value appended k - 1 steps earlier.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._next = 0      # slot for the next append
+        self.count = 0      # values appended in total
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count += 1
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def __getitem__(self, i: int):
+        """Value by position counted from the newest (-1) or oldest (0)."""
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError(f"RingBuffer index {i} out of range (holding {n} values)")
+        if i < 0:
+            i += n
+        return self._data[(self._next - n + i) % self.capacity]
+
+    def get(self, i: int, default=np.nan):
+        """Like ``self[i]`` but returns ``default`` when not yet filled."""
+        n = len(self)
+        if not -n <= i < n:
+            return default
+        return self[i]
+
+    def to_array(self) -> np.ndarray:
+        """Held values, oldest first (a copy)."""
+        n = len(self)
+        start = (self._next - n) % self.capacity
+        return np.roll(self._data, -start)[:n]
+
+
+class RollingMax:
+    """Maximum of the last ``size`` values, amortised O(1) per update."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._window = deque()     # (index, value) with decreasing values
+        self._index = 0
+
+    def _keep(self, old: float, new: float) -> bool:
+        return old > new
+
+    def update(self, value: float) -> float:
+        """Add a value and return the extreme of the current window."""
+        window = self._window
+        while window and not self._keep(window[-1][1], value):
+            window.pop()
+        window.append((self._index, value))
+        if window[0][0] <= self._index - self.size:
+            window.popleft()
+        self._index += 1
+        return window[0][1]
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._window[0][1] if self._window else None
+
+
+class RollingMin(RollingMax):
+    """Minimum of the last ``size`` values, amortised O(1) per update."""
+
+    def _keep(self, old: float, new: float) -> bool:
+        return old < new
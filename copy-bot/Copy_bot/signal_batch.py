@@ -0,0 +1,64 @@
+"""
+Signal Batch Module - Columnar batch of trade signals.
+
+Strategies expose ``should_take_trades(batch)`` which evaluates a whole
+SignalBatch with NumPy and returns a boolean mask, instead of the
+backtester calling ``should_take_trade(trade)`` once per trade.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional
+
+import numpy as np
+
+
+@dataclass
+class SignalBatch:
+    """
+    Columnar signals. Missing ``entry``/``tp3`` values are NaN and market
+    conditions are stored lower-case ('unknown' when not labelled).
+    """
+    pair: np.ndarray
+    entry: np.ndarray
+    direction: np.ndarray
+    tp3: np.ndarray
+    market_condition: np.ndarray
+    _groups: Optional[Dict[str, np.ndarray]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.pair = np.asarray(self.pair, dtype=str)
+        self.entry = np.asarray(self.entry, dtype=np.float64)
+        self.direction = np.asarray(self.direction, dtype=str)
+        self.tp3 = np.asarray(self.tp3, dtype=np.float64)
+        self.market_condition = np.char.lower(np.asarray(self.market_condition, dtype=str))
+        n = len(self.pair)
+        for name in ('entry', 'direction', 'tp3', 'market_condition'):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"SignalBatch column '{name}' has length "
+                                 f"{len(getattr(self, name))}, expected {n}")
+
+    @classmethod
+    def from_trades(cls, trades: List) -> 'SignalBatch':
+        """Build a batch from trade objects."""
+        return cls(
+            pair=[t.pair for t in trades],
+            entry=[np.nan if t.entry is None else t.entry for t in trades],
+            direction=[t.direction for t in trades],
+            tp3=[np.nan if t.tp3 is None else t.tp3 for t in trades],
+            market_condition=[getattr(t, 'market_condition', 'unknown') for t in trades],
+        )
+
+    def __len__(self) -> int:
+        return len(self.pair)
+
+    def pair_groups(self) -> Dict[str, np.ndarray]:
+        """Row indices per pair (computed once and cached)."""
+        if self._groups is None:
+            names, inverse = np.unique(self.pair, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.searchsorted(inverse[order], np.arange(len(names) + 1))
+            self._groups = {
+                str(name): order[bounds[k]:bounds[k + 1]]
+                for k, name in enumerate(names)
+            }
+        return self._groups
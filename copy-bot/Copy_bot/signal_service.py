@@ -0,0 +1,343 @@
+"""
+Signal Service Module - Streaming live-signal evaluation with asyncio.
+
+Signals arrive as JSON lines, one object per signal:
+
+    {"pair": "XAUUSD", "direction": "Buy", "entry": 4247.5, "tp3": 4420,
+     "market_condition": "trending", "timestamp": "2026-01-12T08:30:00"}
+
+Sources (a tailed file or a local TCP socket) put signals on a bounded
+asyncio queue. When the queue is full the sources wait, so a burst slows
+reading instead of growing memory. A single consumer evaluates each
+signal with FelixStrategy.should_take_trade and calculate_position_size
+and emits a Decision. Signals that waited longer than ``max_delay`` are
+rejected as stale instead of being traded late.
+
+Every stage is timed into a log-bucketed LatencyHistogram:
+
+    queue     enqueue -> dequeue
+    evaluate  should_take_trade + confidence
+    size      SL and calculate_position_size
+    emit      decision callback
+    total     receive -> decision emitted
+
+Usage:
+    python signal_service.py --tail signals.jsonl --out decisions.jsonl
+    python signal_service.py --port 9100 --config config.yaml
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Any, Callable
+
+from felix_strategy import FelixStrategy
+from trade import Trade
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced buckets (20 per decade, 1 us to 100 s); recording is
+    O(1) and percentiles are accurate to one bucket (~12%).
+    """
+
+    PER_DECADE = 20
+    MIN_SECONDS = 1e-6
+    DECADES = 8
+
+    def __init__(self):
+        self.bounds = [self.MIN_SECONDS * 10 ** (i / self.PER_DECADE)
+                       for i in range(self.DECADES * self.PER_DECADE + 1)]
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log10(seconds / self.MIN_SECONDS) * self.PER_DECADE)),
+                        len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (seconds) of the bucket holding the p-th percentile."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Count and p50/p90/p99/max in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50) * 1000, 4),
+            'p90_ms': round(self.percentile(90) * 1000, 4),
+            'p99_ms': round(self.percentile(99) * 1000, 4),
+            'max_ms': round(self.max * 1000, 4),
+        }
+
+
+STAGES = ('queue', 'evaluate', 'size', 'emit', 'total')
+
+
+class Signal(Trade):
+    """A Trade read from a live source, stamped with its arrival time."""
+
+    __slots__ = ('received',)       # perf_counter() when read from the source
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = 0.0
+
+    @classmethod
+    def from_json(cls, line: str) -> 'Signal':
+        data = json.loads(line)
+        return cls(
+            pair=data['pair'].upper(),
+            direction=data['direction'].capitalize(),
+            entry=data.get('entry'),
+            sl=data.get('sl'),
+            tp1=data.get('tp1'),
+            tp2=data.get('tp2'),
+            tp3=data.get('tp3'),
+            market_condition=data.get('market_condition') or 'unknown',
+            timestamp=data.get('timestamp'),
+        )
+
+
+@dataclass
+class Decision:
+    """Outcome for one signal."""
+    signal: Signal
+    take: bool
+    reason: str                 # 'accepted', 'rejected', 'stale', 'no_entry'
+    confidence: float = 0.0
+    sl_pips: int = 0
+    position_size: float = 0.0
+    latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pair': self.signal.pair,
+            'direction': self.signal.direction,
+            'entry': self.signal.entry,
+            'timestamp': self.signal.timestamp,
+            'take': self.take,
+            'reason': self.reason,
+            'confidence': round(self.confidence, 4),
+            'sl_pips': self.sl_pips,
+            'position_size': self.position_size,
+            'latency_ms': round(self.latency_ms, 4),
+        }
+
+
+class SignalService:
+    """
+    Bounded-queue signal evaluator.
+
+    Args:
+        felix: strategy used for decisions and sizing
+        balance: account balance for calculate_position_size
+        on_decision: callable (or coroutine function) receiving each Decision
+        queue_size: signals buffered before sources are made to wait
+        max_delay: seconds a signal may wait in the queue before it is stale
+    """
+
+    def __init__(self, felix: FelixStrategy = None, balance: float = 10000.0,
+                 on_decision: Optional[Callable] = None, queue_size: int = 256,
+                 max_delay: float = 1.0):
+        self.felix = felix or FelixStrategy()
+        self.balance = balance
+        self.on_decision = on_decision
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.counts = {'received': 0, 'invalid': 0, 'accepted': 0, 'rejected': 0, 'stale': 0, 'no_entry': 0,
+                       'error': 0}
+
+    async def submit(self, signal: Signal):
+        """Queue a signal, waiting while the queue is full."""
+        signal.received = time.perf_counter()
+        self.counts['received'] += 1
+        await self.queue.put(signal)
+
+    async def submit_line(self, line: str):
+        """Parse a JSON line and queue it; invalid lines are counted and dropped."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            signal = Signal.from_json(line)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.counts['invalid'] += 1
+            return
+        await self.submit(signal)
+
+    def evaluate(self, signal: Signal, dequeued: float) -> Decision:
+        """Decide on one signal (synchronous, microseconds)."""
+        histograms = self.histograms
+        histograms['queue'].record(dequeued - signal.received)
+        if dequeued - signal.received > self.max_delay:
+            return Decision(signal, False, 'stale')
+        if signal.entry is None:
+            return Decision(signal, False, 'no_entry')
+
+        felix = self.felix
+        condition = signal.market_condition.lower()
+        t0 = time.perf_counter()
+        confidence = felix._calculate_confidence(signal.pair, signal.entry, signal.direction, condition)
+        take = confidence >= felix.confidence_threshold
+        t1 = time.perf_counter()
+        histograms['evaluate'].record(t1 - t0)
+        if not take:
+            return Decision(signal, False, 'rejected', confidence)
+
+        sl_pips = felix.get_sl_for_market_condition(condition, signal.pair)
+        size = felix.calculate_position_size(self.balance, sl_pips, signal.pair)
+        histograms['size'].record(time.perf_counter() - t1)
+        return Decision(signal, True, 'accepted', confidence, sl_pips, size)
+
+    async def run(self):
+        """
+        Consume the queue until cancelled. A signal whose evaluation or
+        on_decision callback raises is counted as 'error' and logged; the
+        consumer carries on with the next one.
+        """
+        while True:
+            signal = await self.queue.get()
+            try:
+                decision = self.evaluate(signal, time.perf_counter())
+                self.counts[decision.reason] += 1
+                t0 = time.perf_counter()
+                decision.latency_ms = (t0 - signal.received) * 1000
+                if self.on_decision is not None:
+                    result = self.on_decision(decision)
+                    if asyncio.iscoroutine(result):
+                        await result
+                done = time.perf_counter()
+                self.histograms['emit'].record(done - t0)
+                self.histograms['total'].record(done - signal.received)
+            except Exception:
+                self.counts['error'] += 1
+                logger.exception('Failed to process signal %r', signal)
+            finally:
+                self.queue.task_done()
+
+    async def tail_file(self, path: str, poll: float = 0.05, from_start: bool = False):
+        """Follow a JSON-lines file (like ``tail -f``) and queue new signals."""
+        with open(path) as f:
+            if not from_start:
+                f.seek(0, os.SEEK_END)
+            partial = ''
+            while True:
+                chunk = f.readline()
+                if not chunk:
+                    await asyncio.sleep(poll)
+                    continue
+                partial += chunk
+                if partial.endswith('\n'):
+                    await self.submit_line(partial)
+                    partial = ''
+
+    async def serve_socket(self, host: str = '127.0.0.1', port: int = 9100):
+        """Accept JSON-lines connections; reading pauses while the queue is full."""
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    await self.submit_line(line.decode())
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def stats(self) -> Dict[str, Any]:
+        """Decision counts and per-stage latency percentiles."""
+        return {
+            'counts': dict(self.counts),
+            'queue_depth': self.queue.qsize(),
+            'latency': {stage: h.to_dict() for stage, h in self.histograms.items()},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate live signals with FelixStrategy")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--tail', help="JSON-lines file to follow")
+    source.add_argument('--port', type=int, help="TCP port for JSON-lines connections")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--from-start', action='store_true', help="Read the tailed file from the beginning")
+    parser.add_argument('--out', help="Append decisions to this JSON-lines file (default stdout)")
+    parser.add_argument('--config', help="config.yaml path")
+    parser.add_argument('--balance', type=float, help="Account balance (default config backtest.initial_balance)")
+    parser.add_argument('--stats-every', type=float, default=30.0, help="Seconds between latency reports (to stderr)")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        from config_loader import load_config
+        config = load_config(args.config)
+    balance = args.balance or (config.backtest.get('initial_balance') if config is not None else None) or 10000.0
+
+    async def serve():
+        out = open(args.out, 'a') if args.out else None
+
+        def emit(decision: Decision):
+            line = json.dumps(decision.to_dict())
+            if out is not None:
+                out.write(line + '\n')
+                out.flush()
+            else:
+                print(line, flush=True)
+
+        service = SignalService(FelixStrategy(config=config), balance, on_decision=emit)
+        if args.tail:
+            producer = service.tail_file(args.tail, from_start=args.from_start)
+        else:
+            producer = service.serve_socket(args.host, args.port)
+
+        async def report():
+            while True:
+                await asyncio.sleep(args.stats_every)
+                # stderr, so stdout carries only decision lines
+                print(json.dumps(service.stats()), file=sys.stderr, flush=True)
+
+        try:
+            await asyncio.gather(producer, service.run(), report())
+        finally:
+            if out is not None:
+                out.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
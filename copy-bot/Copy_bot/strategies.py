@@ -6,16 +6,33 @@ These are strategy selector classes that work with the backtester.
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from level_index import LevelIndex
+from pair_registry import default_registry
+from signal_batch import SignalBatch
+from trade_book import TradeBook, TradeStatsMixin
+
 
 @dataclass
-class KeyLevelsStrategy:
+class KeyLevelsStrategy(TradeStatsMixin):
     """Trade predefined support/resistance levels."""
     name: str
     description: str = "Trade predefined S/R levels"
     rules: Dict[str, Any] = field(default_factory=dict)
     trades: List = field(default_factory=list)
+    config: Optional[Any] = field(default=None, repr=False)  # StrategyConfig from config_loader
+    book: TradeBook = field(init=False, repr=False)
     
     def __post_init__(self):
+        self._start_book()
+        if self.config is not None:
+            # Shared, precompiled tables from config.yaml
+            self.registry = self.config.registry
+            self.key_levels = self.config.key_levels
+            self.level_index = self.config.level_index
+            return
+        self.registry = default_registry()
         self.key_levels = {
             'USDJPY': [
                 {'level': 156.025, 'direction': 'Sell', 'confidence': 1.0},
@@ -50,99 +67,56 @@ class KeyLevelsStrategy:
                 {'level': 0.79460, 'direction': 'Sell', 'confidence': 0.8},
             ],
         }
+        self.rebuild_level_index()
+    
+    def rebuild_level_index(self):
+        """Rebuild the sorted level index after changing key_levels."""
+        self.level_index = LevelIndex(self.key_levels, lambda pair, level: self._get_tolerance(pair))
     
     def should_take_trade(self, trade) -> bool:
         pair = trade.pair
         entry = trade.entry
         direction = trade.direction
         
-        if pair not in self.key_levels or entry is None:
+        levels = self.level_index.get(pair)
+        if levels is None or entry is None:
             return False
         
-        for level_info in self.key_levels[pair]:
-            level = level_info['level']
-            tolerance = self._get_tolerance(pair)
-            
-            if abs(entry - level) <= tolerance:
-                if direction == level_info['direction']:
-                    return True
+        for i in levels.within(entry):
+            if direction == levels.directions[i]:
+                return True
         return False
     
-    def _get_tolerance(self, pair: str) -> float:
-        if pair == 'XAUUSD':
-            return 5.0
-        elif 'JPY' in pair:
-            return 0.05
-        return 0.0005
-    
-    def add_trade(self, trade):
-        trade.strategy = self.name
-        self.trades.append(trade)
-    
-    def calculate_winrate(self, exclude_pending: bool = True) -> float:
-        if not self.trades:
-            return 0.0
-        trades_to_count = [t for t in self.trades if t.result != 'pending'] if exclude_pending else self.trades
-        if not trades_to_count:
-            return 0.0
-        winners = len([t for t in trades_to_count if t.result == 'win'])
-        return (winners / len(trades_to_count)) * 100
-    
-    def total_pips(self) -> float:
-        return sum(t.pips for t in self.trades if t.result != 'pending')
-    
-    def total_trades(self) -> int:
-        return len(self.trades)
-    
-    def wins(self) -> int:
-        return len([t for t in self.trades if t.result == 'win'])
-    
-    def losses(self) -> int:
-        return len([t for t in self.trades if t.result == 'loss'])
-    
-    def breakevens(self) -> int:
-        return len([t for t in self.trades if t.result == 'breakeven'])
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        """Vectorized should_take_trade over a SignalBatch."""
+        mask = np.zeros(len(batch), dtype=bool)
+        for pair, rows in batch.pair_groups().items():
+            levels = self.level_index.get(pair)
+            if levels is None:
+                continue
+            entries = batch.entry[rows]
+            directions = batch.direction[rows]
+            taken = np.zeros(len(rows), dtype=bool)
+            for positions, hit in levels.candidates(entries):
+                taken |= hit & (levels.direction_array[positions] == directions)
+            mask[rows] = taken
+        return mask
     
-    def profit_factor(self) -> float:
-        gross_profit = sum(t.pips for t in self.trades if t.pips > 0)
-        gross_loss = abs(sum(t.pips for t in self.trades if t.pips < 0))
-        if gross_loss == 0:
-            return gross_profit if gross_profit > 0 else 1.0
-        return gross_profit / gross_loss
-    
-    def by_pair(self) -> Dict[str, List]:
-        result = {}
-        for trade in self.trades:
-            if trade.pair not in result:
-                result[trade.pair] = []
-            result[trade.pair].append(trade)
-        return result
-    
-    def to_dict(self) -> Dict:
-        completed = [t for t in self.trades if t.result != 'pending']
-        return {
-            'name': self.name,
-            'description': self.description,
-            'total_trades': self.total_trades(),
-            'completed_trades': len(completed),
-            'wins': self.wins(),
-            'losses': self.losses(),
-            'breakevens': self.breakevens(),
-            'win_rate': round(self.calculate_winrate(), 2),
-            'total_pips': round(self.total_pips(), 2),
-            'profit_factor': round(self.profit_factor(), 2),
-        }
+    def _get_tolerance(self, pair: str) -> float:
+        return self.registry.tolerance(pair)
 
 
 @dataclass
-class GoldMeanReversionStrategy:
+class GoldMeanReversionStrategy(TradeStatsMixin):
     """Buy dips and sell rips on XAUUSD."""
     name: str
     description: str = "Buy dips/sell rips on XAUUSD"
     rules: Dict[str, Any] = field(default_factory=dict)
     trades: List = field(default_factory=list)
+    book: TradeBook = field(init=False, repr=False)
     
     def __post_init__(self):
+        self._start_book()
         self.gold_ranges = [
             {'low': 4175, 'high': 4190, 'action': 'Buy'},
             {'low': 4190, 'high': 4205, 'action': 'Buy'},
@@ -170,75 +144,35 @@ class GoldMeanReversionStrategy:
                     return True
         return False
     
-    def add_trade(self, trade):
-        trade.strategy = self.name
-        self.trades.append(trade)
-    
-    def calculate_winrate(self, exclude_pending: bool = True) -> float:
-        if not self.trades:
-            return 0.0
-        trades_to_count = [t for t in self.trades if t.result != 'pending'] if exclude_pending else self.trades
-        if not trades_to_count:
-            return 0.0
-        winners = len([t for t in trades_to_count if t.result == 'win'])
-        return (winners / len(trades_to_count)) * 100
-    
-    def total_pips(self) -> float:
-        return sum(t.pips for t in self.trades if t.result != 'pending')
-    
-    def total_trades(self) -> int:
-        return len(self.trades)
-    
-    def wins(self) -> int:
-        return len([t for t in self.trades if t.result == 'win'])
-    
-    def losses(self) -> int:
-        return len([t for t in self.trades if t.result == 'loss'])
-    
-    def breakevens(self) -> int:
-        return len([t for t in self.trades if t.result == 'breakeven'])
-    
-    def profit_factor(self) -> float:
-        gross_profit = sum(t.pips for t in self.trades if t.pips > 0)
-        gross_loss = abs(sum(t.pips for t in self.trades if t.pips < 0))
-        if gross_loss == 0:
-            return gross_profit if gross_profit > 0 else 1.0
-        return gross_profit / gross_loss
-    
-    def by_pair(self) -> Dict[str, List]:
-        result = {}
-        for trade in self.trades:
-            if trade.pair not in result:
-                result[trade.pair] = []
-            result[trade.pair].append(trade)
-        return result
-    
-    def to_dict(self) -> Dict:
-        completed = [t for t in self.trades if t.result != 'pending']
-        return {
-            'name': self.name,
-            'description': self.description,
-            'total_trades': self.total_trades(),
-            'completed_trades': len(completed),
-            'wins': self.wins(),
-            'losses': self.losses(),
-            'breakevens': self.breakevens(),
-            'win_rate': round(self.calculate_winrate(), 2),
-            'total_pips': round(self.total_pips(), 2),
-            'profit_factor': round(self.profit_factor(), 2),
-        }
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        """Vectorized should_take_trade over a SignalBatch."""
+        entry = batch.entry
+        is_gold = batch.pair == 'XAUUSD'
+        mask = np.zeros(len(batch), dtype=bool)
+        # Ranges share boundaries, so test each interval (a handful) over all rows
+        for range_info in self.gold_ranges:
+            inside = is_gold & (range_info['low'] <= entry) & (entry <= range_info['high'])
+            if range_info['action'] == 'Both':
+                mask |= inside
+            else:
+                mask |= inside & (batch.direction == range_info['action'])
+        return mask
 
 
 @dataclass
-class TrendFollowingStrategy:
+class TrendFollowingStrategy(TradeStatsMixin):
     """Hold for TP3 in trending markets."""
     name: str
     description: str = "Hold for TP3 in trending markets"
     rules: Dict[str, Any] = field(default_factory=dict)
     trades: List = field(default_factory=list)
+    book: TradeBook = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self._start_book()
     
     def should_take_trade(self, trade) -> bool:
-        condition = trade.market_condition.lower() if hasattr(trade, 'market_condition') else 'unknown'
+        condition = getattr(trade, 'market_condition', 'unknown').lower()
         # In trending markets, take all trades
         if condition == 'trending':
             return True
@@ -248,74 +182,24 @@ class TrendFollowingStrategy:
                 return True
         return False
     
-    def add_trade(self, trade):
-        trade.strategy = self.name
-        self.trades.append(trade)
-    
-    def calculate_winrate(self, exclude_pending: bool = True) -> float:
-        if not self.trades:
-            return 0.0
-        trades_to_count = [t for t in self.trades if t.result != 'pending'] if exclude_pending else self.trades
-        if not trades_to_count:
-            return 0.0
-        winners = len([t for t in trades_to_count if t.result == 'win'])
-        return (winners / len(trades_to_count)) * 100
-    
-    def total_pips(self) -> float:
-        return sum(t.pips for t in self.trades if t.result != 'pending')
-    
-    def total_trades(self) -> int:
-        return len(self.trades)
-    
-    def wins(self) -> int:
-        return len([t for t in self.trades if t.result == 'win'])
-    
-    def losses(self) -> int:
-        return len([t for t in self.trades if t.result == 'loss'])
-    
-    def breakevens(self) -> int:
-        return len([t for t in self.trades if t.result == 'breakeven'])
-    
-    def profit_factor(self) -> float:
-        gross_profit = sum(t.pips for t in self.trades if t.pips > 0)
-        gross_loss = abs(sum(t.pips for t in self.trades if t.pips < 0))
-        if gross_loss == 0:
-            return gross_profit if gross_profit > 0 else 1.0
-        return gross_profit / gross_loss
-    
-    def by_pair(self) -> Dict[str, List]:
-        result = {}
-        for trade in self.trades:
-            if trade.pair not in result:
-                result[trade.pair] = []
-            result[trade.pair].append(trade)
-        return result
-    
-    def to_dict(self) -> Dict:
-        completed = [t for t in self.trades if t.result != 'pending']
-        return {
-            'name': self.name,
-            'description': self.description,
-            'total_trades': self.total_trades(),
-            'completed_trades': len(completed),
-            'wins': self.wins(),
-            'losses': self.losses(),
-            'breakevens': self.breakevens(),
-            'win_rate': round(self.calculate_winrate(), 2),
-            'total_pips': round(self.total_pips(), 2),
-            'profit_factor': round(self.profit_factor(), 2),
-        }
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        """Vectorized should_take_trade over a SignalBatch."""
+        condition = batch.market_condition
+        return (condition == 'trending') | ((condition == 'mixed') & ~np.isnan(batch.tp3))
 
 
 @dataclass
-class MultiDayHoldStrategy:
+class MultiDayHoldStrategy(TradeStatsMixin):
     """1-3 day swing trades."""
     name: str
     description: str = "1-3 day swing trades"
     rules: Dict[str, Any] = field(default_factory=dict)
     trades: List = field(default_factory=list)
+    book: TradeBook = field(init=False, repr=False)
     
     def __post_init__(self):
+        self._start_book()
+        self.registry = default_registry()
         self.swing_pairs = ['EURAUD', 'AUDCAD', 'GBPNZD', 'GBPJPY', 'EURNZD']
     
     def should_take_trade(self, trade) -> bool:
@@ -324,70 +208,17 @@ class MultiDayHoldStrategy:
             return True
         # Any trade with TP3 >= 100 pips is a swing candidate
         if trade.tp3 is not None:
-            if trade.pair == 'XAUUSD':
-                pips = abs(trade.tp3 - trade.entry)
-            elif 'JPY' in trade.pair:
-                pips = abs(trade.tp3 - trade.entry) * 100
-            else:
-                pips = abs(trade.tp3 - trade.entry) * 10000
+            pips = abs(trade.tp3 - trade.entry) * self.registry.pips_per_unit(trade.pair)
             if pips >= 80:
                 return True
         return False
     
-    def add_trade(self, trade):
-        trade.strategy = self.name
-        self.trades.append(trade)
-    
-    def calculate_winrate(self, exclude_pending: bool = True) -> float:
-        if not self.trades:
-            return 0.0
-        trades_to_count = [t for t in self.trades if t.result != 'pending'] if exclude_pending else self.trades
-        if not trades_to_count:
-            return 0.0
-        winners = len([t for t in trades_to_count if t.result == 'win'])
-        return (winners / len(trades_to_count)) * 100
-    
-    def total_pips(self) -> float:
-        return sum(t.pips for t in self.trades if t.result != 'pending')
-    
-    def total_trades(self) -> int:
-        return len(self.trades)
-    
-    def wins(self) -> int:
-        return len([t for t in self.trades if t.result == 'win'])
-    
-    def losses(self) -> int:
-        return len([t for t in self.trades if t.result == 'loss'])
-    
-    def breakevens(self) -> int:
-        return len([t for t in self.trades if t.result == 'breakeven'])
-    
-    def profit_factor(self) -> float:
-        gross_profit = sum(t.pips for t in self.trades if t.pips > 0)
-        gross_loss = abs(sum(t.pips for t in self.trades if t.pips < 0))
-        if gross_loss == 0:
-            return gross_profit if gross_profit > 0 else 1.0
-        return gross_profit / gross_loss
-    
-    def by_pair(self) -> Dict[str, List]:
-        result = {}
-        for trade in self.trades:
-            if trade.pair not in result:
-                result[trade.pair] = []
-            result[trade.pair].append(trade)
-        return result
-    
-    def to_dict(self) -> Dict:
-        completed = [t for t in self.trades if t.result != 'pending']
-        return {
-            'name': self.name,
-            'description': self.description,
-            'total_trades': self.total_trades(),
-            'completed_trades': len(completed),
-            'wins': self.wins(),
-            'losses': self.losses(),
-            'breakevens': self.breakevens(),
-            'win_rate': round(self.calculate_winrate(), 2),
-            'total_pips': round(self.total_pips(), 2),
-            'profit_factor': round(self.profit_factor(), 2),
-        }
+    def should_take_trades(self, batch: SignalBatch) -> np.ndarray:
+        """Vectorized should_take_trade over a SignalBatch."""
+        mask = np.isin(batch.pair, self.swing_pairs)
+        distance = np.abs(batch.tp3 - batch.entry)
+        for pair, rows in batch.pair_groups().items():
+            distance[rows] *= self.registry.pips_per_unit(pair)
+        with np.errstate(invalid='ignore'):
+            mask |= distance >= 80
+        return mask
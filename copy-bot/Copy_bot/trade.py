@@ -0,0 +1,194 @@
+"""
+Trade Module - Compact trade record shared by strategies and the backtester.
+
+Pair, direction, result and market condition are interned in
+module-level tables: every Trade holds the shared table string in a
+slot, so ``trade.pair`` and friends are plain attribute reads on the
+``should_take_trade`` hot path, and the matching small integer codes
+(``pair_id`` etc.) are looked up only for vectorized consumers. Trades
+use ``__slots__`` (no per-instance dict).
+"""
+
+import weakref
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Dict, Optional, Any, Tuple, Callable
+
+
+# Result codes
+PENDING = 0
+WIN = 1
+LOSS = 2
+BREAKEVEN = 3
+
+RESULT_NAMES: Tuple[str, ...] = ('pending', 'win', 'loss', 'breakeven')
+_RESULT_CODES: Dict[str, int] = {name: code for code, name in enumerate(RESULT_NAMES)}
+
+
+def result_code(result: str) -> int:
+    """Return the integer code for a result string; unknown results raise ValueError."""
+    try:
+        return _RESULT_CODES[result]
+    except KeyError:
+        raise ValueError(f"Unknown trade result {result!r} "
+                         f"(expected one of {', '.join(RESULT_NAMES)})") from None
+
+
+class _Interned:
+    """Append-only string <-> small int table."""
+
+    def __init__(self, names: List[str] = ()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self.names.append(name)
+            self._codes[name] = code
+        return code
+
+    def intern(self, name: str) -> str:
+        """The table's shared copy of ``name``."""
+        return self.names[self.code(name)]
+
+
+PAIRS = _Interned()
+DIRECTIONS = _Interned(['Buy', 'Sell'])
+CONDITIONS = _Interned(['unknown', 'trending', 'mixed', 'choppy'])
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls) -> Tuple[str, ...]:
+    return tuple(name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ()))
+
+
+class Trade:
+    """
+    One trade or signal.
+
+    Prices are floats (``entry``/``sl``/``tp*`` may be None when the
+    signal did not give them). ``timestamp`` is a datetime or epoch
+    seconds, ``strategy`` the name of the strategy that took it.
+
+    ``result`` and ``pips`` report every change to the callbacks
+    registered with ``watch`` (strategies keep their TradeBook current
+    that way, whoever writes the result).
+    """
+
+    __slots__ = ('pair', 'direction', 'market_condition', '_result', '_pips', '_watchers',
+                 'entry', 'sl', 'tp1', 'tp2', 'tp3', 'timestamp', 'strategy')
+
+    def __init__(self, pair: str, direction: str, entry: Optional[float] = None,
+                 sl: Optional[float] = None, tp1: Optional[float] = None,
+                 tp2: Optional[float] = None, tp3: Optional[float] = None,
+                 result: str = 'pending', pips: float = 0.0,
+                 market_condition: str = 'unknown', timestamp=None,
+                 strategy: Optional[str] = None):
+        self._watchers = None
+        self.pair = PAIRS.intern(pair)
+        self.direction = DIRECTIONS.intern(direction)
+        self.market_condition = CONDITIONS.intern(market_condition)
+        self.result = result
+        self.entry = None if entry is None else float(entry)
+        self.sl = None if sl is None else float(sl)
+        self.tp1 = None if tp1 is None else float(tp1)
+        self.tp2 = None if tp2 is None else float(tp2)
+        self.tp3 = None if tp3 is None else float(tp3)
+        self.pips = float(pips)
+        self.timestamp = timestamp
+        self.strategy = strategy
+
+    def _set_result(self, value: str):
+        old = self._result if self._watchers else None
+        self._result = RESULT_NAMES[result_code(value)]
+        if old is not None:
+            self._notify(old, self._pips)
+
+    def _set_pips(self, value: float):
+        old = self._pips if self._watchers else None
+        self._pips = value
+        if old is not None:
+            self._notify(self._result, old)
+
+    # Read through C getters; the setters reject unknown results and notify watchers
+    result = property(attrgetter('_result'), _set_result)
+    pips = property(attrgetter('_pips'), _set_pips)
+
+    def watch(self, callback: Callable):
+        """
+        Call ``callback(trade, old_result, old_pips)`` after every change of
+        ``result`` or ``pips``. The callback is held weakly, so a discarded
+        strategy stops watching.
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = weakref.ref(callback)
+        self._watchers = (self._watchers or ()) + (ref,)
+
+    def _notify(self, old_result: str, old_pips: float):
+        live = []
+        for ref in self._watchers:
+            callback = ref()
+            if callback is not None:
+                callback(self, old_result, old_pips)
+                live.append(ref)
+        self._watchers = tuple(live) or None
+
+    def __getstate__(self):
+        # Watchers belong to this process's strategies: never copied or pickled
+        state = {name: getattr(self, name) for name in _slot_names(type(self)) if hasattr(self, name)}
+        state['_watchers'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    # Integer codes for columnar consumers
+    @property
+    def pair_id(self) -> int:
+        return PAIRS.code(self.pair)
+
+    @property
+    def direction_id(self) -> int:
+        return DIRECTIONS.code(self.direction)
+
+    @property
+    def result_id(self) -> int:
+        return _RESULT_CODES[self._result]
+
+    @property
+    def condition_id(self) -> int:
+        return CONDITIONS.code(self.market_condition)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Trade':
+        """Build from a dict with Trade field names (unknown keys ignored)."""
+        fields = ('pair', 'direction', 'entry', 'sl', 'tp1', 'tp2', 'tp3', 'result',
+                  'pips', 'market_condition', 'timestamp', 'strategy')
+        return cls(**{k: data[k] for k in fields if k in data and data[k] is not None})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pair': self.pair,
+            'direction': self.direction,
+            'entry': self.entry,
+            'sl': self.sl,
+            'tp1': self.tp1,
+            'tp2': self.tp2,
+            'tp3': self.tp3,
+            'result': self.result,
+            'pips': self.pips,
+            'market_condition': self.market_condition,
+            'timestamp': self.timestamp,
+            'strategy': self.strategy,
+        }
+
+    def __repr__(self) -> str:
+        return (f"Trade({self.pair} {self.direction} @ {self.entry}, "
+                f"{self.result} {self.pips:+g}p, {self.market_condition})")
@@ -0,0 +1,290 @@
+"""
+Trade Book Module - Columnar storage for strategy trade statistics.
+
+Strategies append every trade they take into a TradeBook. The book keeps
+the numbers the statistics need (pips, result, pair, timestamp) in NumPy
+arrays and maintains running counters on every append and result update,
+so summaries are O(1) regardless of how long the book gets. Strategies
+watch their trades (``Trade.watch``), so a result written straight onto
+a trade moves its row as it happens.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any
+
+import numpy as np
+
+from trade import PENDING, WIN, LOSS, BREAKEVEN, RESULT_NAMES, result_code
+
+
+def to_epoch(timestamp) -> int:
+    """Convert a trade timestamp to epoch seconds (0 when unknown)."""
+    if timestamp is None:
+        return 0
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp())
+    return int(timestamp)
+
+
+class TradeBook:
+    """
+    Append-only columnar store of trades.
+
+    Columns grow by doubling so appends are amortised O(1). Pair names are
+    interned to small integer ids held in ``pair_names``.
+    """
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self._pips = np.zeros(capacity, dtype=np.float64)
+        self._results = np.zeros(capacity, dtype=np.int16)
+        self._pair_ids = np.zeros(capacity, dtype=np.int32)
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self.pair_names: List[str] = []
+        self._pair_lookup: Dict[str, int] = {}
+        self._rows: Dict[int, int] = {}  # id(trade) -> row
+
+        # Running statistics
+        self._result_counts: Dict[int, int] = {}
+        self._total_pips = 0.0      # completed trades only
+        self._gross_profit = 0.0    # every trade with pips > 0
+        self._gross_loss = 0.0      # every trade with pips < 0 (negative)
+
+    @classmethod
+    def from_trades(cls, trades: List) -> 'TradeBook':
+        """Build a book from existing trade objects."""
+        book = cls(capacity=len(trades) or 64)
+        for trade in trades:
+            book.append_trade(trade)
+        return book
+
+    def __len__(self) -> int:
+        return self._size
+
+    # Column views (no copies)
+    @property
+    def pips(self) -> np.ndarray:
+        return self._pips[:self._size]
+
+    @property
+    def results(self) -> np.ndarray:
+        return self._results[:self._size]
+
+    @property
+    def pair_ids(self) -> np.ndarray:
+        return self._pair_ids[:self._size]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._size]
+
+    def pair_id(self, pair: str) -> int:
+        """Return the integer id for a pair, interning it on first use."""
+        pid = self._pair_lookup.get(pair)
+        if pid is None:
+            pid = len(self.pair_names)
+            self.pair_names.append(pair)
+            self._pair_lookup[pair] = pid
+        return pid
+
+    def _grow(self):
+        capacity = len(self._pips) * 2
+        self._pips = np.resize(self._pips, capacity)
+        self._results = np.resize(self._results, capacity)
+        self._pair_ids = np.resize(self._pair_ids, capacity)
+        self._timestamps = np.resize(self._timestamps, capacity)
+
+    def _count(self, code: int, pips: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) one row from the running stats."""
+        self._result_counts[code] = self._result_counts.get(code, 0) + sign
+        if code != PENDING:
+            self._total_pips += sign * pips
+        if pips > 0:
+            self._gross_profit += sign * pips
+        elif pips < 0:
+            self._gross_loss += sign * pips
+
+    def append(self, pips: float, result: str, pair: str, timestamp=None) -> int:
+        """Append one trade and return its row index."""
+        if self._size == len(self._pips):
+            self._grow()
+        i = self._size
+        code = result_code(result)
+        self._pips[i] = pips
+        self._results[i] = code
+        self._pair_ids[i] = self.pair_id(pair)
+        self._timestamps[i] = to_epoch(timestamp)
+        self._size += 1
+        self._count(code, float(pips), 1)
+        return i
+
+    def append_trade(self, trade) -> int:
+        """Append a trade object (reads pips, result, pair and timestamp)."""
+        i = self.append(trade.pips, trade.result, trade.pair,
+                        getattr(trade, 'timestamp', None))
+        self._rows[id(trade)] = i
+        return i
+
+    def row_of(self, trade) -> int:
+        """Return the row index of a trade added with append_trade."""
+        try:
+            return self._rows[id(trade)]
+        except KeyError:
+            raise KeyError(f"Trade {trade!r} is not in this book") from None
+
+    def set_result(self, index: int, result: str, pips: float):
+        """Overwrite the result and pips of an existing row."""
+        if not 0 <= index < self._size:
+            raise IndexError(f"Trade index {index} out of range")
+        self._count(int(self._results[index]), float(self._pips[index]), -1)
+        code = result_code(result)
+        self._results[index] = code
+        self._pips[index] = pips
+        self._count(code, float(pips), 1)
+
+    def recompute(self):
+        """
+        Rebuild the running statistics from the columns in one vectorized
+        pass (clears any floating point drift from many updates).
+        """
+        pips = self.pips
+        counts = np.bincount(self.results, minlength=len(RESULT_NAMES))
+        self._result_counts = {code: int(c) for code, c in enumerate(counts) if c}
+        self._total_pips = float(pips[self.results != PENDING].sum())
+        self._gross_profit = float(pips[pips > 0].sum())
+        self._gross_loss = float(pips[pips < 0].sum())
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return all trade statistics from the running counters in O(1).
+
+        Semantics match the original list-based methods: ``total_pips``
+        excludes pending trades, the profit factor looks at every trade.
+        """
+        n = self._size
+        completed = n - self._result_counts.get(PENDING, 0)
+        wins = self._result_counts.get(WIN, 0)
+        gross_profit = self._gross_profit
+        gross_loss = abs(self._gross_loss)
+
+        if gross_loss == 0:
+            profit_factor = gross_profit if gross_profit > 0 else 1.0
+        else:
+            profit_factor = gross_profit / gross_loss
+
+        return {
+            'total_trades': n,
+            'completed_trades': completed,
+            'wins': wins,
+            'losses': self._result_counts.get(LOSS, 0),
+            'breakevens': self._result_counts.get(BREAKEVEN, 0),
+            'win_rate': (wins / completed) * 100 if completed else 0.0,
+            'win_rate_all': (wins / n) * 100 if n else 0.0,
+            'total_pips': self._total_pips,
+            'profit_factor': profit_factor,
+        }
+
+
+class TradeStatsMixin:
+    """
+    Trade bookkeeping shared by the strategy classes.
+
+    Expects ``name``, ``description``, ``trades`` (list of trade objects) and
+    ``book`` (TradeBook) on the instance. The strategy watches every trade
+    it holds, so results and pips changed later (by ``update_trade_result``,
+    the backtester or a position monitor) update the book in O(1).
+    An optional ``cube`` attribute (PerformanceCube) is kept up to date too.
+    """
+
+    def _start_book(self):
+        """Build ``book`` from the initial ``trades`` and watch them."""
+        self.book = TradeBook.from_trades(self.trades)
+        for trade in self.trades:
+            self._watch(trade)
+
+    def _watch(self, trade):
+        watch = getattr(trade, 'watch', None)
+        if watch is not None:
+            watch(self._trade_changed)
+
+    def _trade_changed(self, trade, old_result: str, old_pips: float):
+        """Watcher: move the trade's row from its old result/pips to the new ones."""
+        try:
+            row = self.book.row_of(trade)
+        except KeyError:
+            return
+        self.book.set_result(row, trade.result, trade.pips)
+        cube = getattr(self, 'cube', None)
+        if cube is not None:
+            cube.update(trade, old_result, old_pips, self.name)
+
+    def add_trade(self, trade):
+        trade.strategy = self.name
+        self.trades.append(trade)
+        self.book.append_trade(trade)
+        cube = getattr(self, 'cube', None)
+        if cube is not None:
+            cube.add(trade, self.name)
+        self._watch(trade)
+
+    def update_trade_result(self, trade, result: str, pips: float):
+        """Record a late result (e.g. pending -> win) for a trade already added."""
+        row = self.book.row_of(trade)
+        if getattr(trade, 'watch', None) is not None:
+            # The watcher updates the book and cube
+            trade.result = result
+            trade.pips = pips
+            return
+        self.book.set_result(row, result, pips)
+        old_result, old_pips = trade.result, trade.pips
+        trade.result = result
+        trade.pips = pips
+        cube = getattr(self, 'cube', None)
+        if cube is not None:
+            cube.update(trade, old_result, old_pips, self.name)
+
+    def calculate_winrate(self, exclude_pending: bool = True) -> float:
+        stats = self.book.summary()
+        return stats['win_rate'] if exclude_pending else stats['win_rate_all']
+
+    def total_pips(self) -> float:
+        return self.book.summary()['total_pips']
+
+    def total_trades(self) -> int:
+        return len(self.book)
+
+    def wins(self) -> int:
+        return self.book.summary()['wins']
+
+    def losses(self) -> int:
+        return self.book.summary()['losses']
+
+    def breakevens(self) -> int:
+        return self.book.summary()['breakevens']
+
+    def profit_factor(self) -> float:
+        return self.book.summary()['profit_factor']
+
+    def by_pair(self) -> Dict[str, List]:
+        result = {}
+        for trade in self.trades:
+            if trade.pair not in result:
+                result[trade.pair] = []
+            result[trade.pair].append(trade)
+        return result
+
+    def to_dict(self) -> Dict:
+        stats = self.book.summary()
+        return {
+            'name': self.name,
+            'description': self.description,
+            'total_trades': stats['total_trades'],
+            'completed_trades': stats['completed_trades'],
+            'wins': stats['wins'],
+            'losses': stats['losses'],
+            'breakevens': stats['breakevens'],
+            'win_rate': round(stats['win_rate'], 2),
+            'total_pips': round(stats['total_pips'], 2),
+            'profit_factor': round(stats['profit_factor'], 2),
+        }
@@ -0,0 +1,326 @@
+"""
+Trade Journal Module - Crash-safe trade history with fast warm start.
+
+Trade events are appended to a binary journal as fixed-size records:
+
+    open      a new trade (all Trade fields)
+    partial   part of a position closed (fraction, price, pips)
+    result    a trade's result and pips changed (e.g. pending -> win)
+
+Each record carries a CRC32 of its contents and is flushed as it is
+written. Every ``snapshot_every`` events (or on ``snapshot()``) the full
+state is written as a compressed ``.npz`` of column arrays, atomically
+replaced, and a new journal generation starts; older journals are then
+deleted.
+
+On startup ``TradeJournal(path)`` loads the snapshot and replays only the
+journal written after it, decoding the tail with one ``np.frombuffer``.
+A record cut short by a crash, or one failing its CRC, ends the replay
+and the journal is truncated there, so the next append starts clean.
+Restart time depends on the snapshot size and the short tail, not on the
+number of events ever written.
+
+Usage:
+    journal = TradeJournal('state/journal')
+    number = journal.open(trade)
+    journal.partial(number, 0.5, price, pips=25, timestamp=ts)
+    journal.result(number, 'win', 60, timestamp=ts)
+    journal.trades_by_strategy()     # warm start for the strategies
+"""
+
+import glob
+import math
+import os
+import zlib
+from typing import List, Dict, Optional, Any
+
+import numpy as np
+
+from trade import Trade, result_code
+from trade_book import to_epoch
+
+
+OPEN = 1
+PARTIAL = 2
+RESULT = 3
+
+MAGIC = b'ORNJRNL1'
+
+PRICE_FIELDS = ('entry', 'sl', 'tp1', 'tp2', 'tp3')
+
+# Packed little-endian record; crc covers every byte after it
+RECORD = np.dtype([
+    ('crc', '<u4'),
+    ('kind', 'u1'),
+    ('number', '<i8'),
+    ('timestamp', '<i8'),
+    ('pair', 'S8'),
+    ('direction', 'S4'),
+    ('condition', 'S10'),
+    ('result', 'S10'),
+    ('strategy', 'S32'),
+    ('entry', '<f8'),
+    ('sl', '<f8'),
+    ('tp1', '<f8'),
+    ('tp2', '<f8'),
+    ('tp3', '<f8'),
+    ('pips', '<f8'),
+    ('fraction', '<f8'),
+    ('price', '<f8'),
+])
+
+
+def _text(value: bytes) -> str:
+    return value.decode('utf-8')
+
+
+def _set_text(record: np.ndarray, name: str, value: str):
+    """Store ``value`` UTF-8 encoded in a fixed-width field; raise if it does not fit."""
+    data = value.encode('utf-8')
+    width = RECORD[name].itemsize
+    if len(data) > width:
+        raise ValueError(f"{name} {value!r} does not fit the journal's {width} bytes")
+    record[name] = data
+
+
+def _price(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+class TradeJournal:
+    """
+    Journal and snapshots in directory ``path``.
+
+    Args:
+        path: directory for ``snapshot.npz`` and ``journal.<generation>.bin``
+        snapshot_every: events between automatic snapshots (0 disables)
+        sync: fsync after every append (survives power loss, slower);
+            without it records survive a process crash
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 10000, sync: bool = False):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self.trades: Dict[int, Trade] = {}
+        self.closed_fraction: Dict[int, float] = {}
+        self.realized_pips: Dict[int, float] = {}
+        self.generation = 0
+        self.next_number = 0
+        self.replayed = 0
+        self.truncated = 0
+        self._events = 0
+        os.makedirs(path, exist_ok=True)
+        self._load_snapshot()
+        self._replay()
+        self._file = open(self._journal_path(self.generation), 'ab')
+        if self._file.tell() == 0:
+            self._write(MAGIC)
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.path, f'journal.{generation}.bin')
+
+    # Events
+
+    def open(self, trade) -> int:
+        """
+        Journal a new trade and return its number. Raises ValueError (and
+        uses no number) when a text field does not fit its record width.
+        """
+        number = self.next_number  # taken by _apply once the record is written
+        record = self._record(OPEN, number, getattr(trade, 'timestamp', None))
+        _set_text(record, 'pair', trade.pair)
+        _set_text(record, 'direction', trade.direction)
+        _set_text(record, 'condition', getattr(trade, 'market_condition', 'unknown'))
+        _set_text(record, 'result', trade.result)
+        _set_text(record, 'strategy', getattr(trade, 'strategy', None) or '')
+        for name in PRICE_FIELDS:
+            value = getattr(trade, name)
+            record[name] = np.nan if value is None else value
+        record['pips'] = trade.pips or 0.0
+        self._append(record)
+        return number
+
+    def partial(self, number: int, fraction: float, price: float, pips: float, timestamp=None):
+        """Journal a partial close of ``fraction`` of the position at ``price``."""
+        if number not in self.trades:
+            raise KeyError(f"Trade {number} is not in the journal")
+        record = self._record(PARTIAL, number, timestamp)
+        record['fraction'], record['price'], record['pips'] = fraction, price, pips
+        self._append(record)
+
+    def result(self, number: int, result: str, pips: float, timestamp=None):
+        """Journal a trade's new result and pips."""
+        if number not in self.trades:
+            raise KeyError(f"Trade {number} is not in the journal")
+        result_code(result)  # unknown results raise before anything is written
+        record = self._record(RESULT, number, timestamp)
+        _set_text(record, 'result', result)
+        record['pips'] = pips
+        self._append(record)
+
+    def _record(self, kind: int, number: int, timestamp) -> np.ndarray:
+        record = np.zeros((), dtype=RECORD)
+        record['kind'], record['number'], record['timestamp'] = kind, number, to_epoch(timestamp)
+        for name in PRICE_FIELDS + ('fraction', 'price'):
+            record[name] = np.nan
+        return record
+
+    def _append(self, record: np.ndarray):
+        """Write one event, then apply it, so memory never runs ahead of the journal."""
+        data = record.tobytes()
+        record['crc'] = zlib.crc32(data[4:])
+        self._write(record.tobytes())
+        self._apply(record[()])
+        self._events += 1
+        if self.snapshot_every and self._events >= self.snapshot_every:
+            self.snapshot()
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def _apply(self, record):
+        """Update the in-memory state with one event."""
+        kind, number = int(record['kind']), int(record['number'])
+        if kind == OPEN:
+            timestamp = int(record['timestamp'])
+            self.trades[number] = Trade(
+                _text(record['pair']), _text(record['direction']),
+                *(_price(float(record[name])) for name in PRICE_FIELDS),
+                result=_text(record['result']), pips=float(record['pips']),
+                market_condition=_text(record['condition']),
+                timestamp=timestamp or None, strategy=_text(record['strategy']) or None)
+            self.next_number = max(self.next_number, number + 1)
+        elif kind == PARTIAL:
+            fraction = float(record['fraction'])
+            self.closed_fraction[number] = self.closed_fraction.get(number, 0.0) + fraction
+            self.realized_pips[number] = self.realized_pips.get(number, 0.0) + fraction * float(record['pips'])
+        elif kind == RESULT:
+            trade = self.trades[number]
+            trade.result = _text(record['result'])
+            trade.pips = float(record['pips'])
+
+    # Warm start
+
+    def _replay(self):
+        """Apply the journal written since the snapshot; truncate a torn or corrupt tail."""
+        path = self._journal_path(self.generation)
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            good = 0
+        else:
+            body = data[len(MAGIC):]
+            count = len(body) // RECORD.itemsize
+            records = np.frombuffer(body, dtype=RECORD, count=count)
+            size = RECORD.itemsize
+            valid = 0
+            for k, crc in enumerate(records['crc'].tolist()):
+                if zlib.crc32(body[k * size + 4:(k + 1) * size]) != crc:
+                    break
+                valid += 1
+            for record in records[:valid]:
+                self._apply(record)
+            self.replayed = valid
+            good = len(MAGIC) + valid * size
+        if good < len(data):
+            self.truncated = len(data) - good
+            with open(path, 'r+b') as f:
+                f.truncate(good)
+
+    def _load_snapshot(self):
+        path = os.path.join(self.path, 'snapshot.npz')
+        if not os.path.exists(path):
+            return
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files}
+        self.generation = int(columns['generation'])
+        self.next_number = int(columns['next_number'])
+        # Missing prices (NaN) become None column-wise, not per value
+        prices = [np.where(np.isnan(columns[name]), None, columns[name]).tolist() for name in PRICE_FIELDS]
+        rows = zip(columns['number'].tolist(), columns['pair'].tolist(), columns['direction'].tolist(),
+                   zip(*prices), columns['result'].tolist(), columns['pips'].tolist(),
+                   columns['condition'].tolist(), columns['timestamp'].tolist(),
+                   columns['strategy'].tolist())
+        for number, pair, direction, levels, result, pips, condition, timestamp, strategy in rows:
+            self.trades[number] = Trade(pair, direction, *levels, result=result, pips=pips,
+                                        market_condition=condition, timestamp=timestamp or None,
+                                        strategy=strategy or None)
+        for number, fraction, realized in zip(columns['partial_number'].tolist(),
+                                              columns['closed_fraction'].tolist(),
+                                              columns['realized_pips'].tolist()):
+            self.closed_fraction[number] = fraction
+            self.realized_pips[number] = realized
+
+    def snapshot(self):
+        """Write the full state and start a new journal generation."""
+        numbers = sorted(self.trades)
+        trades = [self.trades[n] for n in numbers]
+        partial = sorted(self.closed_fraction)
+        columns = {
+            'generation': np.array(self.generation + 1),
+            'next_number': np.array(self.next_number),
+            'number': np.array(numbers, dtype=np.int64),
+            'pair': np.array([t.pair for t in trades], dtype=str),
+            'direction': np.array([t.direction for t in trades], dtype=str),
+            'condition': np.array([t.market_condition for t in trades], dtype=str),
+            'result': np.array([t.result for t in trades], dtype=str),
+            'strategy': np.array([t.strategy or '' for t in trades], dtype=str),
+            'pips': np.array([t.pips or 0.0 for t in trades], dtype=np.float64),
+            'timestamp': np.array([to_epoch(t.timestamp) for t in trades], dtype=np.int64),
+            'partial_number': np.array(partial, dtype=np.int64),
+            'closed_fraction': np.array([self.closed_fraction[n] for n in partial], dtype=np.float64),
+            'realized_pips': np.array([self.realized_pips.get(n, 0.0) for n in partial], dtype=np.float64),
+        }
+        for name in PRICE_FIELDS:
+            columns[name] = np.array([np.nan if getattr(t, name) is None else getattr(t, name)
+                                      for t in trades], dtype=np.float64)
+
+        path = os.path.join(self.path, 'snapshot.npz')
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+        # The snapshot now covers the old journal: switch generations
+        self._file.close()
+        self.generation += 1
+        self._file = open(self._journal_path(self.generation), 'wb')
+        self._write(MAGIC)
+        self._events = 0
+        for old in glob.glob(os.path.join(self.path, 'journal.*.bin')):
+            if old != self._journal_path(self.generation):
+                os.remove(old)
+
+    def close(self):
+        self._file.close()
+
+    # Views
+
+    def trades_by_strategy(self) -> Dict[str, List[Trade]]:
+        """Trades in journal order, grouped by strategy name."""
+        result: Dict[str, List[Trade]] = {}
+        for number in sorted(self.trades):
+            trade = self.trades[number]
+            result.setdefault(trade.strategy or 'unknown', []).append(trade)
+        return result
+
+    def open_trades(self) -> Dict[int, Trade]:
+        """Trades still pending, by number."""
+        return {n: t for n, t in self.trades.items() if t.result == 'pending'}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'trades': len(self.trades),
+            'open': len(self.open_trades()),
+            'generation': self.generation,
+            'replayed': self.replayed,
+            'truncated_bytes': self.truncated,
+        }
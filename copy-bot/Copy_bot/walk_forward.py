@@ -0,0 +1,265 @@
+"""
+Walk-Forward Module - Rolling train/test optimisation with a fold cache.
+
+The backtest window is split into rolling folds. On every fold each
+candidate FelixStrategy parameter set is backtested on the train window,
+the best one (by ``objective``) is then scored on the following test
+window. Comparing train and test win rates shows whether the config.yaml
+target win rate holds up out of sample or is overfit.
+
+Every evaluation is memoised on disk under a key of
+(parameter hash, data range, code version): the data range covers the
+window, its signals and the bars up to ``horizon_days`` past its end
+(the longest a trade may take to resolve), so appending new bars only
+invalidates the folds that reach them. The code version hashes the modules
+that decide trade outcomes. Re-running after a small change only
+recomputes the evaluations whose key changed.
+
+Usage:
+    folds = make_folds('2025-12-01', '2026-02-10', train_days=21, test_days=7)
+    wf = WalkForward(list(grid(space)), signals, bars, cache_dir='.wf_cache')
+    report = wf.run(folds)
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+
+from param_sweep import SharedBars, evaluate, init_worker, worker_context
+from price_bars import PriceBars
+from price_store import SECONDS_PER_DAY, TimeLike, parse_epoch
+from trade_book import to_epoch
+
+
+# Modules whose source decides backtest results
+CODE_MODULES = ('felix_strategy.py', 'backtester.py', 'level_index.py', 'pair_registry.py',
+                'trade.py', 'trade_book.py', 'signal_batch.py', 'param_sweep.py')
+
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """Hash of the source of CODE_MODULES (computed once per process)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in CODE_MODULES:
+            with open(os.path.join(here, name), 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def param_hash(params: Dict[str, Any]) -> str:
+    """Stable hash of a parameter set."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Fold:
+    """One train window followed by its test window (epoch seconds, end exclusive)."""
+    number: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def make_folds(start: TimeLike, end: TimeLike, train_days: int, test_days: int,
+               step_days: Optional[int] = None) -> List[Fold]:
+    """
+    Rolling folds over [start, end]; ``end`` is an inclusive date. The
+    train window slides by ``step_days`` (default ``test_days``).
+    """
+    start = parse_epoch(start)
+    end = parse_epoch(end) + SECONDS_PER_DAY
+    step = (step_days or test_days) * SECONDS_PER_DAY
+    train, test = train_days * SECONDS_PER_DAY, test_days * SECONDS_PER_DAY
+    folds = []
+    t = start
+    while t + train + test <= end:
+        folds.append(Fold(len(folds), t, t + train, t + train, t + train + test))
+        t += step
+    return folds
+
+
+class FoldCache:
+    """One JSON file per evaluation key in ``directory``."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+
+@dataclass
+class FoldResult:
+    """Best train parameters of a fold and their out-of-sample score."""
+    fold: Fold
+    params: Dict[str, Any]
+    train: Dict[str, Any]
+    test: Dict[str, Any]
+    evaluated: int = 0      # backtests actually run
+    cached: int = 0         # evaluations served from the cache
+
+
+def _window_signals(signals: List, start: int, end: int) -> List:
+    return [s for s in signals if start <= to_epoch(getattr(s, 'timestamp', None)) < end]
+
+
+def _window_bars(bars: Dict[str, PriceBars], start: int, end: int) -> Dict[str, PriceBars]:
+    # ``end`` already includes the resolution horizon past the window
+    return {pair: series.slice(start, end) for pair, series in bars.items()}
+
+
+def _evaluate_window(params: Dict[str, Any], start: int, end: int, bars_end: int) -> Dict[str, Any]:
+    """Worker task: evaluate params on one window of the shared data."""
+    context = worker_context()
+    return evaluate(params, _window_signals(context['signals'], start, end),
+                    _window_bars(context['bars'], start, bars_end), context['config'])
+
+
+class WalkForward:
+    """
+    Walk-forward optimiser.
+
+    Args:
+        candidates: parameter sets (see param_sweep.grid / random_samples)
+        signals: trade signals with timestamps
+        bars: price bars per pair
+        cache_dir: directory for memoised evaluations
+        objective: to_dict() key to maximise on the train window
+        min_trades: train windows with fewer completed trades score -inf
+        config: optional StrategyConfig (config_path for worker processes)
+        max_workers: evaluate uncached candidates in a process pool
+        horizon_days: longest time a trade may take to resolve; bars are
+            used up to this long after the window and trades still open
+            then stay pending
+    """
+
+    def __init__(self, candidates: List[Dict[str, Any]], signals: List,
+                 bars: Dict[str, PriceBars], cache_dir: str,
+                 objective: str = 'total_pips', min_trades: int = 10,
+                 config=None, max_workers: Optional[int] = None, horizon_days: int = 10):
+        self.candidates = candidates
+        self.signals = sorted(signals, key=lambda s: to_epoch(getattr(s, 'timestamp', None)))
+        self.bars = bars
+        self.cache = FoldCache(cache_dir)
+        self.objective = objective
+        self.min_trades = min_trades
+        self.config = config
+        self.max_workers = max_workers
+        self.horizon = horizon_days * SECONDS_PER_DAY
+        self._data_keys: Dict[Tuple[int, int], str] = {}
+
+    def data_key(self, start: int, end: int) -> str:
+        """Hash of a window: its bounds, the signals in it and the bars used."""
+        key = self._data_keys.get((start, end))
+        if key is None:
+            digest = hashlib.sha256(f'{start}:{end}'.encode())
+            if self.config is not None:
+                digest.update(self.config.digest.encode())
+            for s in _window_signals(self.signals, start, end):
+                digest.update(repr((s.pair, s.entry, s.direction, getattr(s, 'tp3', None),
+                                    getattr(s, 'market_condition', None),
+                                    to_epoch(getattr(s, 'timestamp', None)))).encode())
+            for pair in sorted(self.bars):
+                series = self.bars[pair].slice(start, end + self.horizon)
+                digest.update(pair.encode())
+                for column in (series.timestamp, series.high, series.low):
+                    digest.update(np.ascontiguousarray(column).tobytes())
+            key = digest.hexdigest()[:16]
+            self._data_keys[(start, end)] = key
+        return key
+
+    def _key(self, params: Dict[str, Any], start: int, end: int) -> str:
+        return f'{param_hash(params)}-{self.data_key(start, end)}-{code_version()}'
+
+    def evaluate_many(self, param_sets: List[Dict[str, Any]], start: int, end: int,
+                      pool=None) -> Tuple[List[Dict[str, Any]], int]:
+        """Stats for every parameter set on a window; returns (stats, runs done)."""
+        keys = [self._key(params, start, end) for params in param_sets]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, stats in enumerate(results) if stats is None]
+
+        if pool is not None:
+            futures = {i: pool.submit(_evaluate_window, param_sets[i], start, end,
+                                      end + self.horizon) for i in missing}
+            fresh = {i: future.result() for i, future in futures.items()}
+        else:
+            signals = _window_signals(self.signals, start, end)
+            bars = _window_bars(self.bars, start, end + self.horizon)
+            fresh = {i: evaluate(param_sets[i], signals, bars, self.config) for i in missing}
+
+        for i, stats in fresh.items():
+            self.cache.put(keys[i], stats)
+            results[i] = stats
+        return results, len(missing)
+
+    def _score(self, stats: Dict[str, Any]) -> float:
+        if stats['completed_trades'] < self.min_trades:
+            return float('-inf')
+        return stats[self.objective]
+
+    def run_fold(self, fold: Fold, pool=None) -> FoldResult:
+        train, runs = self.evaluate_many(self.candidates, fold.train_start, fold.train_end, pool)
+        best = max(range(len(train)), key=lambda i: self._score(train[i]))
+        params = self.candidates[best]
+        (test,), test_runs = self.evaluate_many([params], fold.test_start, fold.test_end, pool)
+        runs += test_runs
+        total = len(self.candidates) + 1
+        return FoldResult(fold, params, train[best], test, evaluated=runs, cached=total - runs)
+
+    def run(self, folds: List[Fold]) -> Dict[str, Any]:
+        """Optimise and score every fold; returns per-fold results and a summary."""
+        if self.max_workers:
+            config_path = self.config.path if self.config is not None else None
+            with SharedBars(self.bars) as shared, ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=init_worker,
+                    initargs=(shared.handle, self.signals, config_path)) as pool:
+                results = [self.run_fold(fold, pool) for fold in folds]
+        else:
+            results = [self.run_fold(fold) for fold in folds]
+        return {'folds': results, 'summary': self.summarize(results)}
+
+    def summarize(self, results: List[FoldResult]) -> Dict[str, Any]:
+        """Pooled out-of-sample stats and the train/test win rate gap."""
+        test_completed = sum(r.test['completed_trades'] for r in results)
+        test_wins = sum(r.test['wins'] for r in results)
+        gaps = [r.train['win_rate'] - r.test['win_rate'] for r in results]
+        summary = {
+            'folds': len(results),
+            'test_trades': test_completed,
+            'test_win_rate': round(test_wins / test_completed * 100, 2) if test_completed else 0.0,
+            'test_pips': round(sum(r.test['total_pips'] for r in results), 2),
+            'mean_train_test_gap': round(float(np.mean(gaps)), 2) if gaps else 0.0,
+            'evaluated': sum(r.evaluated for r in results),
+            'cached': sum(r.cached for r in results),
+        }
+        if self.config is not None and 'target_win_rate' in self.config.targets:
+            target = self.config.targets['target_win_rate'] * 100
+            summary['target_win_rate'] = target
+            summary['meets_target'] = summary['test_win_rate'] >= target
+        return summary
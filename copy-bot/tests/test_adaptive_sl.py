@@ -0,0 +1,49 @@
+from felix_strategy import FelixStrategy
+from indicators import IndicatorCache
+from position_monitor import PositionMonitor
+from trade import Trade
+
+
+def feed(cache, pair, ranges):
+    for i, size in enumerate(ranges):
+        cache.update(pair, 'H1', i * 3600, 100.0, 100.0 + size / 2, 100.0 - size / 2, 100.0)
+
+
+def test_fixed_table_without_indicators():
+    felix = FelixStrategy()
+    assert felix.get_sl_for_market_condition('trending', 'XAUUSD') == 80
+    assert felix.get_sl_for_market_condition('choppy', 'XAUUSD') == 60
+
+
+def test_fixed_table_until_atr_is_ready():
+    felix = FelixStrategy()
+    cache = IndicatorCache()
+    feed(cache, 'XAUUSD', [1.0] * 5)
+    felix.use_indicators(cache)
+    assert felix.get_sl_for_market_condition('trending', 'XAUUSD') == 80
+
+
+def test_adaptive_sl_from_indicator_cache():
+    felix = FelixStrategy()
+    cache = IndicatorCache()
+    feed(cache, 'XAUUSD', [1.0] * 14)
+    feed(cache, 'EURUSD', [1.0] * 60 + [8.0] * 10)
+    felix.use_indicators(cache)
+
+    # Steady ATR: pair base, widened x1.2 in choppy markets
+    assert felix.get_sl_for_market_condition('trending', 'XAUUSD') == 80
+    assert felix.get_sl_for_market_condition('choppy', 'XAUUSD') == 96
+    # ATR well above its average: widened x1.5
+    assert felix.get_sl_for_market_condition('trending', 'EURUSD') == round(35 * 1.5)
+    # No indicators for the pair: fixed table
+    assert felix.get_sl_for_market_condition('mixed', 'USDJPY') == 70
+
+
+def test_position_monitor_uses_adaptive_sl():
+    felix = FelixStrategy()
+    cache = IndicatorCache()
+    feed(cache, 'XAUUSD', [1.0] * 14)
+    felix.use_indicators(cache)
+    monitor = PositionMonitor(felix)
+    number = monitor.open(Trade('XAUUSD', 'Buy', 4200.0, market_condition='choppy'))
+    assert monitor.positions[number].sl_pips == 96
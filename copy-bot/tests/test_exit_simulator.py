@@ -0,0 +1,58 @@
+import numpy as np
+
+from exit_simulator import ExitSimulator
+from price_bars import PriceBars
+from trade import Trade
+
+
+def empty_bars(pair):
+    return PriceBars(pair, np.zeros(0, dtype=np.int64), [], [], [], [])
+
+
+def test_empty_bars_leave_trades_pending():
+    trades = [Trade('XAUUSD', 'Buy', 4200.0, timestamp=0),
+              Trade('EURUSD', 'Sell', 1.16, timestamp=0)]
+    bars = {'XAUUSD': empty_bars('XAUUSD'),
+            'EURUSD': PriceBars('EURUSD', [0, 60], [1.16, 1.16], [1.161, 1.161],
+                                [1.10, 1.10], [1.15, 1.15])}
+    result = ExitSimulator(max_bars=10).run(trades, bars)
+    assert result.results == ['pending', 'win']
+    assert result.pips[0] == 0.0
+    assert result.exit_bar[0] == -1
+
+
+def random_bars(pair, start_price, step, count, seed):
+    rng = np.random.default_rng(seed)
+    close = start_price + np.cumsum(rng.normal(0, step, count))
+    open_ = np.r_[start_price, close[:-1]]
+    spread = np.abs(rng.normal(0, step, count))
+    return PriceBars(pair, np.arange(count) * 3600, open_,
+                     np.maximum(open_, close) + spread, np.minimum(open_, close) - spread, close)
+
+
+def test_single_exit_matches_backtester():
+    from backtester import Backtester
+
+    bars = {'XAUUSD': random_bars('XAUUSD', 4200.0, 3.0, 1500, 1),
+            'EURUSD': random_bars('EURUSD', 1.16, 0.0012, 1500, 2)}
+    rng = np.random.default_rng(3)
+    trades = []
+    for pair in bars:
+        series = bars[pair]
+        for i in rng.integers(0, len(series), 150):
+            trades.append(Trade(pair, str(rng.choice(['Buy', 'Sell'])), float(series.open[i]),
+                                market_condition=str(rng.choice(['trending', 'mixed', 'choppy'])),
+                                timestamp=int(series.timestamp[i])))
+
+    # Everything closed at the last exit, stop locked at TP1 after TP2:
+    # the Backtester's single-exit rules
+    simulated = ExitSimulator(fractions=(0.0, 0.0, 1.0), tp2_stop='tp1',
+                              max_bars=1500).run(trades, bars)
+    backtested = [Trade.from_dict(t.to_dict()) for t in trades]
+    Backtester().run(backtested, bars)
+
+    results = [t.result for t in backtested]
+    assert simulated.results == results
+    assert {'win', 'loss', 'breakeven', 'pending'} <= set(results)
+    done = np.array([r != 'pending' for r in results])
+    np.testing.assert_allclose(simulated.pips[done], np.array([t.pips for t in backtested])[done])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from market_classifier import MarketClassifier, IncrementalClassifier
+from price_bars import PriceBars
+
+
+def random_bars(count, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = 1.16 + np.cumsum(rng.normal(drift, 0.001, count))
+    open_ = np.r_[1.16, close[:-1]]
+    spread = np.abs(rng.normal(0, 0.001, count))
+    return PriceBars('EURUSD', np.arange(count) * 3600, open_,
+                     np.maximum(open_, close) + spread, np.minimum(open_, close) - spread, close)
+
+
+@pytest.mark.parametrize('trend_periods', [1, 3])
+@pytest.mark.parametrize('drift', [0.0, 0.0004])
+def test_incremental_matches_batch(trend_periods, drift):
+    bars = random_bars(600, seed=5, drift=drift)
+    batch = MarketClassifier(trend_periods).classify(bars)
+    incremental = IncrementalClassifier(trend_periods)
+    labels = [incremental.update(o, h, l, c)
+              for o, h, l, c in zip(bars.open, bars.high, bars.low, bars.close)]
+    np.testing.assert_array_equal(batch, labels)
+    assert len(set(batch[MarketClassifier(trend_periods).warmup:].tolist())) > 1
+
+
+def test_incremental_matches_batch_with_tp3_rate():
+    bars = random_bars(300, seed=9)
+    rates = np.random.default_rng(1).uniform(0, 1, len(bars))
+    batch = MarketClassifier().classify(bars, tp3_rate=rates)
+    incremental = IncrementalClassifier()
+    labels = [incremental.update(o, h, l, c, tp3_rate=r)
+              for o, h, l, c, r in zip(bars.open, bars.high, bars.low, bars.close, rates)]
+    np.testing.assert_array_equal(batch, labels)
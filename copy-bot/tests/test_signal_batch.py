@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+from ensemble import Ensemble
+from felix_strategy import FelixStrategy, FelixStrategyClass
+from pair_registry import default_registry
+from signal_batch import SignalBatch
+from strategies import (KeyLevelsStrategy, GoldMeanReversionStrategy,
+                        TrendFollowingStrategy, MultiDayHoldStrategy)
+from trade import Trade
+
+
+def random_signals(count=2000, seed=7):
+    """Signals clustered around key/flip levels and gold ranges, with gaps."""
+    rng = random.Random(seed)
+    registry = default_registry()
+    anchors = [(pair, info['level']) for pair, levels in FelixStrategy().key_levels.items()
+               for info in levels]
+    anchors += [(pair, info['level']) for pair, info in FelixStrategy().flip_levels.items()]
+    anchors += [('XAUUSD', float(price)) for price in range(4170, 4510, 5)]
+    anchors += [('GBPUSD', 1.27), ('EURNZD', 1.95)]
+    conditions = ['trending', 'mixed', 'choppy', 'unknown', 'Trending']
+    signals = []
+    for _ in range(count):
+        pair, level = rng.choice(anchors)
+        tolerance = registry.tolerance(pair)
+        entry = level + rng.uniform(-3, 3) * tolerance
+        tp3 = None
+        if rng.random() < 0.6:
+            tp3 = entry + rng.choice([-1, 1]) * rng.uniform(20, 200) / registry.pips_per_unit(pair)
+        if tp3 is None and rng.random() < 0.05:
+            entry = None
+        signals.append(Trade(pair, rng.choice(['Buy', 'Sell']), entry, tp3=tp3,
+                             market_condition=rng.choice(conditions)))
+    return signals
+
+
+@pytest.mark.parametrize('make', [
+    lambda: KeyLevelsStrategy('key_levels'),
+    lambda: GoldMeanReversionStrategy('gold_mean_reversion'),
+    lambda: TrendFollowingStrategy('trend_following'),
+    lambda: MultiDayHoldStrategy('multi_day_hold'),
+    lambda: FelixStrategy(),
+    lambda: FelixStrategyClass('felix'),
+    lambda: Ensemble(),
+], ids=['key_levels', 'gold', 'trend', 'multi_day', 'felix', 'felix_class', 'ensemble'])
+def test_vectorized_matches_scalar(make):
+    strategy = make()
+    signals = random_signals()
+    scalar = np.array([strategy.should_take_trade(s) for s in signals])
+    vectorized = strategy.should_take_trades(SignalBatch.from_trades(signals))
+    assert vectorized.dtype == bool
+    assert scalar.any() and not scalar.all()
+    np.testing.assert_array_equal(vectorized, scalar)
+
+
+def test_felix_confidences_match_scalar():
+    felix = FelixStrategy()
+    signals = [s for s in random_signals(500, seed=11) if s.entry is not None]
+    scalar = [felix._calculate_confidence(s.pair, s.entry, s.direction, s.market_condition.lower())
+              for s in signals]
+    np.testing.assert_allclose(felix.calculate_confidences(SignalBatch.from_trades(signals)), scalar)
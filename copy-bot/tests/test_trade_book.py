@@ -0,0 +1,80 @@
+from strategies import KeyLevelsStrategy
+from trade import Trade
+
+
+def baseline_to_dict(strategy):
+    """The original list-scan statistics of the strategy classes."""
+    trades = strategy.trades
+    completed = [t for t in trades if t.result != 'pending']
+    wins = len([t for t in trades if t.result == 'win'])
+    gross_profit = sum(t.pips for t in trades if t.pips > 0)
+    gross_loss = abs(sum(t.pips for t in trades if t.pips < 0))
+    if gross_loss == 0:
+        profit_factor = gross_profit if gross_profit > 0 else 1.0
+    else:
+        profit_factor = gross_profit / gross_loss
+    return {
+        'name': strategy.name,
+        'description': strategy.description,
+        'total_trades': len(trades),
+        'completed_trades': len(completed),
+        'wins': wins,
+        'losses': len([t for t in trades if t.result == 'loss']),
+        'breakevens': len([t for t in trades if t.result == 'breakeven']),
+        'win_rate': round((wins / len(completed)) * 100 if completed else 0.0, 2),
+        'total_pips': round(sum(t.pips for t in completed), 2),
+        'profit_factor': round(profit_factor, 2),
+    }
+
+
+def test_to_dict_matches_baseline():
+    strategy = KeyLevelsStrategy('levels')
+    for result, pips in [('win', 30), ('loss', -80), ('breakeven', 0), ('pending', 12.5), ('win', 80)]:
+        strategy.add_trade(Trade('XAUUSD', 'Buy', 4200, result=result, pips=pips))
+    assert strategy.to_dict() == baseline_to_dict(strategy)
+
+
+def test_results_changed_after_add_trade():
+    strategy = KeyLevelsStrategy('levels')
+    trade = Trade('XAUUSD', 'Buy', 4200)
+    strategy.add_trade(trade)
+    strategy.add_trade(Trade('EURUSD', 'Sell', 1.16, result='loss', pips=-35))
+
+    # Written directly, as the backtester and position monitor do
+    trade.result = 'win'
+    trade.pips = 50
+    stats = strategy.to_dict()
+    assert stats['wins'] == 1
+    assert stats['total_pips'] == 15.0
+    assert stats == baseline_to_dict(strategy)
+
+    strategy.update_trade_result(trade, 'breakeven', 0)
+    assert strategy.to_dict() == baseline_to_dict(strategy)
+    assert strategy.wins() == 0
+
+
+def test_position_monitor_close_reaches_strategy_stats():
+    from position_monitor import PositionMonitor
+
+    strategy = KeyLevelsStrategy('levels')
+    trade = Trade('XAUUSD', 'Buy', 4200.0, market_condition='trending')
+    strategy.add_trade(trade)
+    monitor = PositionMonitor()
+    monitor.open(trade)
+    monitor.on_tick('XAUUSD', 4100.0, 0)
+    assert strategy.losses() == 1
+    assert strategy.to_dict() == baseline_to_dict(strategy)
+
+
+def test_copies_do_not_update_the_original_strategy():
+    import copy
+    import pickle
+
+    strategy = KeyLevelsStrategy('levels')
+    trade = Trade('XAUUSD', 'Buy', 4200.0)
+    strategy.add_trade(trade)
+    for clone in (copy.copy(trade), pickle.loads(pickle.dumps(trade))):
+        clone.result = 'win'
+        clone.pips = 30
+        assert clone.pair == 'XAUUSD' and clone.entry == 4200.0
+    assert strategy.to_dict()['wins'] == 0